@@ -0,0 +1,87 @@
+# coding: utf-8
+
+"""
+Матрицы вида для анимации камеры: по одной на кадр и стопкой
+
+Для траектории облета из K кадров сравниваются:
+
+- scalar: матрица каждого кадра строится отдельно в замкнутом виде
+  (ViewTransform.matrix без кэша) - так было при движении ползунков;
+- stack: все K матриц строятся одной стопкой (ViewTransform.preload).
+
+Затем измеряется пересчет сцены без окна на всей траектории
+(set_c + пересчет аксонометрического и комплексного чертежей)
+без заранее построенных матриц и с ними.
+
+Запуск: python -m benchmarks.bench_animation
+"""
+
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+
+from core.camera_path import orbit
+from gui.scene import Scene, SelectProjection
+
+FRAMES = (60, 240, 1000)
+REPEAT = 5
+SIZE = (402, 251)
+
+
+def measure(func: Callable[[], None]) -> float:
+    """ Лучшее время одного вызова (мс) """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    width, height = SIZE
+    scene = Scene()
+    scene.set_size(width, height)
+    scene.selected_projection = SelectProjection.CEN
+    view = scene.view_transform
+
+    for count in FRAMES:
+        cameras = orbit((100, 100, 100), count)
+        positions = [tuple(camera) for camera in cameras.tolist()]
+
+        def scalar() -> None:
+            view.cache_clear()
+            for camera in positions:
+                view.matrix(camera, True, width, height)
+
+        def stack() -> None:
+            view.clear_preloaded()
+            view.preload(cameras, True, width, height)
+
+        def play() -> None:
+            view.cache_clear()
+            for camera in positions:
+                scene.set_c(*camera)
+                scene.recalculate_ax_coordinates()
+                scene.recalculate_ep_coordinates()
+
+        matrices = f"scalar {measure(scalar):7.2f} ms  " \
+                   f"stack {measure(stack):7.2f} ms"
+
+        view.clear_preloaded()
+        direct = measure(play)
+        view.preload(cameras, True, width, height)
+        preloaded = measure(play)
+        view.clear_preloaded()
+
+        assert np.isfinite(scene.points_2d_ax["T"].x())
+        print(
+            f"K={count:>5}  matrices: {matrices}  |  "
+            f"scene: {direct / count * 1e3:6.1f} us/frame, "
+            f"preloaded {preloaded / count * 1e3:6.1f} us/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# coding: utf-8
+
+"""
+Проецирование облака точек из файла порциями (core.point_cloud)
+
+Облако из N точек float32 записывается во временный .npy и
+открывается через np.memmap. Для нескольких размеров порции
+измеряются время проецирования в изображение плотности и пик
+выделенной памяти (tracemalloc). Пик растет с размером порции и не
+зависит от N; для сравнения - память массива всех однородных
+координат N×4, которую занял бы PointArray.transform.
+
+Страницы файла, прочитанные через np.memmap, находятся в файловом
+кэше ОС и в пик не входят: система может вытеснить их в любой момент.
+
+Запуск: python -m benchmarks.bench_cloud [N]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from core.point_cloud import PointCloud
+from core.view_transform import ViewTransform
+
+COUNT = 20_000_000
+CHUNKS = (1 << 16, 1 << 18, 1 << 20, 1 << 22)
+SIZE = (402, 251)
+CAMERA = (100, 100, 100)
+
+# Точек, записываемых во временный файл за раз
+WRITE_CHUNK = 1 << 22
+
+
+def write_cloud(path: str, count: int) -> None:
+    """ Записывает облако из count случайных точек, не держа его в памяти """
+    rng = np.random.default_rng(0)
+    points = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float32, shape=(count, 3)
+    )
+    for start in range(0, count, WRITE_CHUNK):
+        stop = min(start + WRITE_CHUNK, count)
+        points[start:stop] = rng.normal(0, 30, (stop - start, 3))
+    points.flush()
+    del points
+
+
+def main() -> None:
+    count = int(float(sys.argv[1])) if len(sys.argv) > 1 else COUNT
+    width, height = SIZE
+    matrix = ViewTransform().matrix(CAMERA, True, width, height)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cloud.npy")
+        write_cloud(path, count)
+        print(f"N={count}  file {os.path.getsize(path) / 2 ** 20:.1f} MiB, "
+              f"N×4 float64 {count * 32 / 2 ** 20:.1f} MiB")
+
+        total = None
+        for chunk in CHUNKS:
+            cloud = PointCloud.open(path, chunk=chunk)
+            product = cloud.fit_matrix(100) * matrix
+
+            tracemalloc.start()
+            start = perf_counter()
+            counts = cloud.project(product, width, height)
+            seconds = perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            # Разбиение на порции не меняет результат
+            if total is None:
+                total = counts
+            assert np.array_equal(counts, total)
+
+            print(
+                f"chunk={chunk:>8}  {seconds * 1e3:8.1f} ms "
+                f"({count / seconds / 1e6:6.1f} Mpts/s)  "
+                f"peak {peak / 2 ** 20:7.1f} MiB  "
+                f"on screen {int(counts.sum())}"
+            )
+            del cloud
+
+
+if __name__ == "__main__":
+    main()
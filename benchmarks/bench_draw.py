@@ -0,0 +1,188 @@
+# coding: utf-8
+
+"""
+Поэлементная и пакетная передача примитивов в QPainter
+
+Для N отрезков и N точек сравниваются:
+
+- per-call: drawLine/drawEllipse на каждый элемент (N вызовов);
+- list: список QLineF из массива, затем один drawLines;
+- buffer: массив копируется в память sip.array (to_line_array,
+  to_point_array), затем один drawLines/drawPoints.
+
+Затем измеряется полная перерисовка аксонометрического чертежа
+с моделью из N ребер (set_mesh_lines + update_pixmap).
+
+Для массива из N точек на аксонометрическом чертеже (set_point_array)
+сравниваются drawPoints (lod_threshold=None) и изображение плотности
+точек по пикселям (уровень детализации, lod_threshold=0).
+
+Для надписей сравниваются drawText (раскладка текста при каждой
+отрисовке) и кэш надписей LabelCache (QStaticText) - N надписей
+из LABELS различных текстов.
+
+Запуск: python -m benchmarks.bench_draw
+"""
+
+from time import perf_counter
+from typing import Callable, Tuple
+
+import numpy as np
+
+from PyQt5 import QtCore, QtGui
+
+from gui.base.label_cache import LabelCache
+from gui.base.qt_arrays import to_line_array, to_point_array
+from gui.offscreen import PLANE_AX, OffscreenRenderer, RenderConfig
+
+SIZES = (10_000, 50_000, 200_000)
+REPEAT = 3
+
+# Длина отрезков (in px): время растеризации не должно заслонять
+# время передачи примитивов
+SEGMENT = 8
+
+# Число различных текстов надписей
+LABELS = 200
+
+
+def measure(func: Callable[[], None]) -> float:
+    """ Лучшее время одного вызова (мс) """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best * 1e3
+
+
+def make_lines(count: int, size: QtCore.QSize) -> np.ndarray:
+    """ Случайные короткие отрезки внутри "полотна": массив N×4 """
+    rng = np.random.default_rng(0)
+    start = rng.random((count, 2)) * (size.width(), size.height())
+    end = start + rng.uniform(-SEGMENT, SEGMENT, (count, 2))
+    return np.hstack([start, end])
+
+
+def bench_primitives(count: int, image: QtGui.QImage) -> None:
+    lines = make_lines(count, image.size())
+    points = lines[:, :2]
+
+    def painted(draw: Callable[[QtGui.QPainter], None]) -> Callable[[], None]:
+        def run() -> None:
+            painter = QtGui.QPainter(image)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            draw(painter)
+            painter.end()
+        return run
+
+    def lines_per_call(painter: QtGui.QPainter) -> None:
+        for x1, y1, x2, y2 in lines.tolist():
+            painter.drawLine(QtCore.QLineF(x1, y1, x2, y2))
+
+    def lines_list(painter: QtGui.QPainter) -> None:
+        painter.drawLines([QtCore.QLineF(*line) for line in lines.tolist()])
+
+    def lines_buffer(painter: QtGui.QPainter) -> None:
+        painter.drawLines(to_line_array(lines))
+
+    def points_per_call(painter: QtGui.QPainter) -> None:
+        for x, y in points.tolist():
+            painter.drawEllipse(QtCore.QPointF(x, y), 1, 1)
+
+    def points_buffer(painter: QtGui.QPainter) -> None:
+        painter.drawPoints(to_point_array(points))
+
+    rows: Tuple[Tuple[str, int, Callable], ...] = (
+        ("lines per-call", count, lines_per_call),
+        ("lines list", 1, lines_list),
+        ("lines buffer", 1, lines_buffer),
+        ("points per-call", count, points_per_call),
+        ("points buffer", 1, points_buffer),
+    )
+    for name, calls, draw in rows:
+        print(
+            f"N={count:>7}  {name:<16} calls {calls:>7}  "
+            f"{measure(painted(draw)):9.2f} ms"
+        )
+
+
+def bench_labels(count: int, image: QtGui.QImage) -> None:
+    points = make_lines(count, image.size())[:, :2].tolist()
+    texts = [f"P{i % LABELS}" for i in range(count)]
+    cache = LabelCache()
+
+    def painted(draw: Callable[[QtGui.QPainter], None]) -> Callable[[], None]:
+        def run() -> None:
+            painter = QtGui.QPainter(image)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            draw(painter)
+            painter.end()
+        return run
+
+    def labels_text(painter: QtGui.QPainter) -> None:
+        for (x, y), text in zip(points, texts):
+            painter.drawText(QtCore.QPointF(x, y), text)
+
+    def labels_cached(painter: QtGui.QPainter) -> None:
+        cache.draw_all(painter, (
+            (x, y, text) for (x, y), text in zip(points, texts)
+        ))
+
+    for name, draw in (
+            ("labels drawText", labels_text),
+            ("labels cached", labels_cached),
+    ):
+        print(
+            f"N={count:>7}  {name:<16} calls {count:>7}  "
+            f"{measure(painted(draw)):9.2f} ms"
+        )
+
+
+def bench_plane(count: int, renderer: OffscreenRenderer) -> None:
+    aps = renderer.aps
+    lines = make_lines(count, aps.size)
+
+    def paint() -> None:
+        aps.set_mesh_lines(lines)
+        aps.update_pixmap()
+
+    print(f"N={count:>7}  {'ax plane paint':<16} {measure(paint):23.2f} ms")
+
+
+def bench_lod(count: int, renderer: OffscreenRenderer) -> None:
+    aps = renderer.aps
+    points = make_lines(count, aps.size)[:, :2]
+    saved_threshold = aps.lod_threshold
+    aps.set_mesh_lines(None)
+
+    for name, threshold in (("points array", None), ("points density", 0)):
+        aps.lod_threshold = threshold
+
+        def paint() -> None:
+            aps.set_point_array(points)
+            aps.update_pixmap()
+
+        print(f"N={count:>7}  {name:<16} {measure(paint):23.2f} ms")
+
+    aps.set_point_array(None)
+    aps.lod_threshold = saved_threshold
+
+
+def main() -> None:
+    renderer = OffscreenRenderer()
+    renderer.draw(RenderConfig((50, 50, 50), (100, 100, 100)), PLANE_AX)
+    image = QtGui.QImage(
+        renderer.aps.size, QtGui.QImage.Format_ARGB32_Premultiplied
+    )
+
+    for count in SIZES:
+        bench_primitives(count, image)
+        bench_labels(count, image)
+        bench_plane(count, renderer)
+        bench_lod(count, renderer)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# coding: utf-8
+
+"""
+Количество выделений памяти в цепочке преобразований:
+операторы (новая матрица на каждом шаге) и умножение на месте.
+Обращение Transform4 в замкнутом виде и через np.linalg.inv
+
+Запуск: python -m benchmarks.bench_matrix
+"""
+
+from functools import reduce
+from operator import mul
+from timeit import repeat
+from typing import List, Tuple
+import tracemalloc
+
+import numpy as np
+
+from core.matrix import Matrix, Transform4
+from core.mx_utils import *
+
+NUMBER = 20000
+
+
+def get_ops() -> List[Matrix]:
+    """ Матрицы кадра (центральное проецирование) """
+    return [
+        get_matrix_rz(0.6, 0.8),
+        get_matrix_rx(0.6, 0.8),
+        get_matrix_mx(),
+        get_matrix_p(100.0),
+        get_matrix_pz(),
+        get_matrix_t(200, 150, 0)
+    ]
+
+
+OPS: List[Matrix] = get_ops()
+OUT: Matrix = Matrix()
+
+
+def chain_operators() -> Matrix:
+    return reduce(mul, OPS)
+
+
+def chain_inplace() -> Matrix:
+    np.copyto(OUT.values, OPS[0].values)
+    for op in OPS[1:]:
+        OUT.multiply(op, out=OUT)
+    return OUT
+
+
+def count_allocations(func) -> Tuple[int, int]:
+    """
+    Количество созданных объектов Matrix и пиковый объем временной
+    памяти (байт) за один вызов func
+    """
+    created = 0
+    init = Matrix.__init__
+
+    def counting_init(self, *args, **kwargs):
+        nonlocal created
+        created += 1
+        init(self, *args, **kwargs)
+
+    Matrix.__init__ = counting_init
+    try:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        Matrix.__init__ = init
+
+    return created, peak
+
+
+def measure(func) -> float:
+    """ Лучшее время одного вызова (мкс) """
+    return min(repeat(func, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def main() -> None:
+    assert np.allclose(chain_operators().values, chain_inplace().values)
+
+    for name, func in (
+            ("operators", chain_operators), ("in-place", chain_inplace)
+    ):
+        created, peak = count_allocations(func)
+        print(
+            f"{name:10}: {measure(func):7.2f} us/chain, "
+            f"{created} Matrix allocations/chain, "
+            f"peak {peak} bytes/chain"
+        )
+
+    bench_inverse()
+
+
+def bench_inverse() -> None:
+    rigid = Transform4.from_matrix(reduce(mul, OPS[:3] + OPS[-1:]))
+    affine = Transform4.from_matrix(rigid * get_matrix_d(2, 3, 0.5))
+    projective = Transform4.from_matrix(reduce(mul, OPS[:4]))
+
+    for transform in (rigid, affine, projective):
+        values = transform.values
+        print(
+            f"inverse {transform.kind.name:10}: "
+            f"{measure(transform.inverted):6.2f} us "
+            f"(np.linalg.inv {measure(lambda: np.linalg.inv(values)):6.2f} us)"
+        )
+
+
+if __name__ == "__main__":
+    main()
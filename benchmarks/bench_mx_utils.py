@@ -0,0 +1,60 @@
+# coding: utf-8
+
+"""
+Сравнение построения матриц преобразований:
+создание новой матрицы на каждый вызов и запись в заранее выделенный буфер
+
+Запуск: python -m benchmarks.bench_mx_utils
+"""
+
+from timeit import repeat
+
+from core.matrix import Matrix
+from core.mx_utils import *
+
+NUMBER = 20000
+
+
+def frame_allocating() -> None:
+    """ Матрицы кадра, как они строились раньше (новая матрица на вызов) """
+    get_matrix_rz(0.6, 0.8)
+    get_matrix_rx(0.6, 0.8)
+    Matrix(input_values=[
+        [-1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]
+    ])
+    get_matrix_p(100.0)
+    Matrix(input_values=[
+        [1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 1]
+    ])
+    get_matrix_t(200, 150, 0)
+
+
+RZ, RX, PR, T = Matrix(), Matrix(), Matrix(), Matrix()
+
+
+def frame_buffered() -> None:
+    """ Те же матрицы: постоянные + запись в буферы """
+    get_matrix_rz(0.6, 0.8, out=RZ)
+    get_matrix_rx(0.6, 0.8, out=RX)
+    get_matrix_mx()
+    get_matrix_p(100.0, out=PR)
+    get_matrix_pz()
+    get_matrix_t(200, 150, 0, out=T)
+
+
+def measure(func) -> float:
+    """ Лучшее время одного вызова (мкс) """
+    return min(repeat(func, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def main() -> None:
+    allocating = measure(frame_allocating)
+    buffered = measure(frame_buffered)
+
+    print(f"allocating: {allocating:8.2f} us/frame")
+    print(f"buffered:   {buffered:8.2f} us/frame")
+    print(f"speedup:    {allocating / buffered:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# coding: utf-8
+
+"""
+Время отрисовки чертежей со слоем фона и без него
+
+- full: фон и чертеж рисуются заново (как до кэширования слоев)
+- layered: фон берется из кэша, рисуется только чертеж
+- blit: перерисовка без изменений - копирование готового "полотна"
+
+Для изображения RGBA, созданного в NumPy, сравниваются:
+
+- copy: новый массив и копия в QImage (QImage(...).copy()) на кадр;
+- framebuffer: запись в память Framebuffer и drawImage без копий.
+
+Затем проверяется повторное использование памяти Framebuffer
+при изменении размера (число выделений на RESIZES шагов).
+
+Запуск: python -m benchmarks.bench_paint
+"""
+
+from timeit import repeat
+
+import numpy as np
+
+from PyQt5 import QtGui
+
+from gui.base.framebuffer import Framebuffer
+from gui.offscreen import (
+    PLANE_AX, PLANE_CX, OffscreenRenderer, RenderConfig
+)
+
+NUMBER = 200
+
+# Размеры при изменении размера окна: растет, затем колеблется
+RESIZES = [(400 + 4 * i, 250 + 3 * i) for i in range(100)] + [
+    (800 - 4 * (i % 20), 550 - 3 * (i % 20)) for i in range(100)
+]
+
+
+def measure(func) -> float:
+    """ Лучшее время одного вызова (мкс) """
+    return min(repeat(func, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def main() -> None:
+    renderer = OffscreenRenderer()
+    config = RenderConfig((50, 50, 50), (100, 100, 100))
+    renderer.draw(config, PLANE_AX)
+    renderer.draw(config, PLANE_CX)
+
+    for name, plane_system in (
+            (PLANE_AX, renderer.aps), (PLANE_CX, renderer.cps)
+    ):
+        target = QtGui.QImage(
+            plane_system.size, QtGui.QImage.Format_ARGB32_Premultiplied
+        )
+
+        def blit() -> None:
+            painter = QtGui.QPainter(target)
+            plane_system.draw_layer(painter, plane_system.pixmap)
+            painter.end()
+
+        def full() -> None:
+            plane_system.update_pixmap()
+            blit()
+
+        plane_system.layer_cache = False
+        full_time = measure(full)
+
+        plane_system.layer_cache = True
+        layered_time = measure(full)
+
+        print(
+            f"{name}: full {full_time:8.1f} us, "
+            f"layered {layered_time:8.1f} us, "
+            f"blit {measure(blit):8.1f} us"
+        )
+
+    bench_framebuffer(renderer.aps.size)
+
+
+def bench_framebuffer(size) -> None:
+    width, height = size.width(), size.height()
+    target = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+    framebuffer = Framebuffer(width, height)
+
+    def draw(image: QtGui.QImage) -> None:
+        painter = QtGui.QPainter(target)
+        painter.drawImage(0, 0, image)
+        painter.end()
+
+    def copy() -> None:
+        pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        pixels[::2, ::2] = 255
+        draw(QtGui.QImage(
+            pixels.data, width, height, width * 4,
+            QtGui.QImage.Format_RGBA8888
+        ).copy())
+
+    def shared() -> None:
+        framebuffer.clear()
+        framebuffer.array[::2, ::2] = 255
+        draw(framebuffer.image)
+
+    print(
+        f"rgba {width}x{height}: copy {measure(copy):8.1f} us, "
+        f"framebuffer {measure(shared):8.1f} us"
+    )
+
+    resized = Framebuffer()
+    for width, height in RESIZES:
+        resized.resize(width, height)
+    print(
+        f"resize x{len(RESIZES)}: {resized.allocations} allocations, "
+        f"{len(resized.memory) / 2 ** 20:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+"""
+Проецирование облака точек в float64 и float32
+
+Для N = 10⁶ ... 10⁷ точек (в кубе осей, центральная проекция):
+
+- память: размер буфера точек PointArray и пик выделенной памяти
+  на создание набора и преобразование (tracemalloc);
+- скорость: PointArray.transform (умножение N×4 на 4×4 и деление
+  на w), миллионов точек в секунду;
+- точность: отличие экранных координат float32 от float64.
+
+Погрешность float32 проверяется для каждой точки по оценке
+ошибки округления (core.points.float32_error_bound). Нарушение оценки
+завершает тест ошибкой. Дополнительно выводится наибольшая ошибка
+для точек внутри экрана (в пикселях).
+
+Запуск: python -m benchmarks.bench_precision
+"""
+
+from time import perf_counter
+from typing import Callable, Tuple
+import tracemalloc
+
+import numpy as np
+
+from core.clipping import inside_rect
+from core.points import PointArray, float32_error_bound
+from core.view_transform import ViewTransform
+
+SIZES = (1_000_000, 3_000_000, 10_000_000)
+REPEAT = 3
+SIZE = (402, 251)
+CAMERA = (100, 100, 100)
+
+def measure(func: Callable[[], object]) -> float:
+    """ Лучшее время одного вызова (с) """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def peak_memory(func: Callable[[], object]) -> Tuple[object, int]:
+    """ Результат func и пик выделенной за вызов памяти (байт) """
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def check_error(xyz: np.ndarray, matrix) -> float:
+    """
+    Проверяет оценку погрешности float32 для каждой точки и
+    возвращает наибольшую ошибку внутри экрана (px)
+    """
+    exact = PointArray.from_array(xyz).transform(matrix)
+    single = PointArray.from_array(xyz, dtype=np.float32).transform(matrix)
+
+    error = np.abs(single.xy().astype(np.float64) - exact.xy())
+    bound = float32_error_bound(
+        PointArray.from_array(xyz).values, matrix.values, exact.values
+    )
+    if not np.all(error <= bound):
+        worst = np.argmax(error - bound) // 2
+        raise AssertionError(
+            f"float32 error {error.ravel()[worst]:.3g} exceeds bound "
+            f"{bound.ravel()[worst]:.3g} at point {xyz[worst]}"
+        )
+
+    visible = inside_rect(exact.xy(), (0, 0) + SIZE)
+    return float(error[visible].max())
+
+
+def main() -> None:
+    width, height = SIZE
+    matrix = ViewTransform().matrix(CAMERA, True, width, height)
+    rng = np.random.default_rng(0)
+
+    for count in SIZES:
+        xyz = rng.uniform(-100, 100, (count, 3))
+
+        for dtype in (np.float64, np.float32):
+            # Значения связываются аргументами по умолчанию: xyz и points
+            # удаляются в конце итерации
+            points, build_peak = peak_memory(
+                lambda xyz=xyz, dtype=dtype:
+                PointArray.from_array(xyz, dtype=dtype)
+            )
+
+            def transform(points=points) -> PointArray:
+                return points.transform(matrix)
+
+            _, transform_peak = peak_memory(transform)
+            seconds = measure(transform)
+
+            print(
+                f"N={count:>9}  {np.dtype(dtype).name:<8} "
+                f"buffer {points.values.nbytes / 2 ** 20:7.1f} MiB  "
+                f"peak build {build_peak / 2 ** 20:7.1f} MiB, "
+                f"transform {transform_peak / 2 ** 20:7.1f} MiB  "
+                f"{seconds * 1e3:8.1f} ms "
+                f"({count / seconds / 1e6:6.1f} Mpts/s)"
+            )
+            del points, transform
+
+        print(f"N={count:>9}  float32 max error on screen "
+              f"{check_error(xyz, matrix):.2e} px (bound holds)")
+        del xyz
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# coding: utf-8
+
+"""
+Удаление невидимых линий через z-буфер (core.raster)
+
+Сфера из ~100k треугольников (сетка широта × долгота) вписывается
+в оси и рисуется при ортогональном и центральном проецировании:
+время закраски граней в z-буфер и полного построения изображения
+видимых ребер (в одно и то же изображение, как в программе).
+
+Запуск: python -m benchmarks.bench_raster
+"""
+
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+
+from core.mesh import Mesh
+from core.points import PointArray
+from core.raster import Rasterizer, render_hidden_lines
+from core.view_transform import ViewTransform
+
+# Сетка сферы: STACKS × SLICES четырехугольников (по 2 треугольника)
+STACKS = 224
+SLICES = 224
+
+SIZE = (402, 251)
+REPEAT = 5
+
+
+def measure(func: Callable[[], None]) -> float:
+    """ Лучшее время одного вызова (мс) """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best * 1e3
+
+
+def make_sphere(stacks: int, slices: int) -> Mesh:
+    theta = np.linspace(0, np.pi, stacks + 1)[:, np.newaxis]
+    phi = np.linspace(0, 2 * np.pi, slices + 1)[np.newaxis, :]
+    vertices = np.stack([
+        np.sin(theta) * np.cos(phi),
+        np.sin(theta) * np.sin(phi),
+        np.cos(theta) * np.ones_like(phi),
+    ], axis=-1).reshape(-1, 3)
+
+    index = np.arange((stacks + 1) * (slices + 1)).reshape(stacks + 1, -1)
+    quads = np.stack([
+        index[:-1, :-1], index[:-1, 1:], index[1:, 1:], index[1:, :-1]
+    ], axis=-1).reshape(-1, 4)
+    return Mesh.from_polygons(vertices, quads).fitted(100)
+
+
+def main() -> None:
+    mesh = make_sphere(STACKS, SLICES)
+    print(mesh)
+
+    width, height = SIZE
+    world = PointArray.from_array(mesh.vertices)
+    rasterizer = Rasterizer(width, height)
+    image = np.zeros((height, width, 4), dtype=np.uint8)
+
+    for central in (False, True):
+        matrix = ViewTransform().matrix(
+            (100, 100, 100), central, width, height, depth=True
+        )
+        points = world.transform(matrix, divide=False).values
+        triangles = points[:, :3][mesh.faces] / points[:, 3:][mesh.faces]
+
+        def faces() -> None:
+            rasterizer.clear()
+            rasterizer.draw_triangles(triangles)
+
+        def hidden_lines() -> None:
+            render_hidden_lines(
+                points, mesh.edges, mesh.faces, width, height, rasterizer,
+                out=image
+            )
+
+        name = "central" if central else "orthogonal"
+        print(
+            f"{name:<10}  faces {measure(faces):8.1f} ms  "
+            f"hidden lines {measure(hidden_lines):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# coding: utf-8
+
+"""
+Время запуска программы: от старта процесса до первой отрисовки
+
+Программа запускается в отдельном процессе (платформа Qt "offscreen")
+через gui.main.create_window. Этапы замеряются часами одного процесса:
+
+- interpreter: запуск и завершение пустого интерпретатора
+  (python -c pass), замер родительского процесса;
+- window: импорт PyQt5, NumPy, модулей программы и создание окна;
+- first paint: show() и первая отрисовка чертежей;
+- to first paint: window + first paint, от первой строки кода
+  дочернего процесса до окончания первой отрисовки.
+
+window и first paint дочерний процесс замеряет сам и выводит
+длительности: значения perf_counter разных процессов сравнивать нельзя.
+
+Кроме времени выводится, сколько раз пересчитывались чертежи
+за запуск (узлы ax_pixmap и cx_pixmap графа) и сколько кадров
+выполнил планировщик перерисовки: первый кадр должен строиться
+ровно один раз.
+
+Запуск: python -m benchmarks.bench_startup
+"""
+
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+from typing import Dict, List
+
+REPEAT = 7
+
+# Код дочернего процесса: выводит длительности этапов (с)
+CHILD = """
+import json, sys
+from time import perf_counter
+
+start = perf_counter()
+
+from gui.main import create_window
+
+app, window = create_window(sys.argv[:1])
+created = perf_counter()
+
+from PyQt5 import QtCore
+
+
+class FirstPaint(QtCore.QObject):
+    ''' Ждет первой отрисовки обоих чертежей '''
+
+    def __init__(self, widgets):
+        super().__init__()
+        self.waiting = set(widgets)
+        for widget in widgets:
+            widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint and obj in self.waiting:
+            self.waiting.discard(obj)
+            if not self.waiting:
+                # Срабатывает после окончания текущей отрисовки
+                QtCore.QTimer.singleShot(0, painted)
+        return False
+
+
+times = {}
+
+
+def painted():
+    times["painted"] = perf_counter()
+    # Даем выполниться отложенным пересчетам, если они есть
+    QtCore.QTimer.singleShot(100, app.quit)
+
+
+first_paint = FirstPaint([window.awidget, window.cwidget])
+window.show()
+app.exec()
+
+stats = window.graph_stats()
+print(json.dumps({
+    "window": created - start,
+    "first paint": times["painted"] - created,
+    "to first paint": times["painted"] - start,
+    "recomputes": {
+        name: stats[name]["hits"] + stats[name]["misses"]
+        for name in ("ax_pixmap", "cx_pixmap")
+    },
+    "scheduled_frames": window.redraw_scheduler.frames,
+}))
+"""
+
+
+def run_interpreter() -> float:
+    """ Время запуска и завершения пустого интерпретатора (с) """
+    start = perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return perf_counter() - start
+
+
+def run_once() -> Dict:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    result["interpreter"] = run_interpreter()
+    return result
+
+
+def main() -> None:
+    runs: List[Dict] = [run_once() for _ in range(REPEAT)]
+
+    for phase in ("interpreter", "window", "first paint", "to first paint"):
+        times = [run[phase] * 1e3 for run in runs]
+        print(
+            f"{phase:<14} median {median(times):7.1f} ms  "
+            f"min {min(times):7.1f} ms"
+        )
+
+    last = runs[-1]
+    print(f"recomputes: {last['recomputes']}")
+    print(f"scheduled frames: {last['scheduled_frames']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+# coding: utf-8
+
+"""
+Набор тестов производительности с выводом в JSON
+
+Измеряются операции ядра без окна и без Qt-отрисовки:
+
+- matrix.*: операторы Matrix (4×4) и обращение Transform4;
+- mx_utils.*: построение матриц (одной и стопки из N матриц);
+- frame.*: матрицы кадра и их произведение (узел графа сцены
+  view_matrix, а также варианты из bench_mx_utils и bench_matrix);
+- point3d.mul: Point3D.__mul__ в цикле по N точкам;
+- points.transform: PointArray.transform для N точек
+  (и points.transform_f32 - для точек float32);
+- scene.*: пересчет аксонометрического чертежа без окна
+  (recalculate_ax_coordinates и узел графа ax_points при той же
+  матрице вида) для N точек;
+- trace.*: цена интервала трассировки (выключенной и включенной).
+
+N перебирается от 14 (точки чертежа) до 10⁶. Данные создаются
+генератором с постоянным seed, поэтому результаты разных запусков
+сравнимы. Результат - JSON (в файл -o или в stdout; ход измерений
+печатается в stderr): окружение (версии Python, NumPy, PyQt)
+и для каждого теста лучшее и среднее время вызова, время на элемент.
+
+С --baseline результаты сравниваются с сохраненными ранее: тест,
+замедлившийся больше чем на --threshold (доля), считается регрессией,
+и процесс завершается с кодом 1.
+
+Запуск:
+    python -m benchmarks.suite -o results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.2
+    python -m benchmarks.suite --max-n 10000 --filter matrix
+"""
+
+import argparse
+import json
+import platform
+import sys
+from fnmatch import fnmatch
+from functools import reduce
+from operator import mul
+from timeit import Timer
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from PyQt5 import QtCore
+
+from core.matrix import Matrix, Transform4
+from core.mx_utils import *
+from core.points import Point3D, PointArray
+from core.tracing import Tracer
+from gui.scene import Scene, SelectProjection
+from benchmarks import bench_matrix, bench_mx_utils
+
+SCHEMA = 1
+SEED = 0
+
+# Количество точек
+SIZES = (14, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Повторы измерения и бюджет времени на один тест (с)
+REPEAT = 5
+BUDGET = 2.0
+
+THRESHOLD = 0.2
+
+# Размер аксонометрического чертежа
+WIDTH, HEIGHT = 402, 251
+
+# Положения камеры, между которыми переключаются тесты кадра
+CAMERAS = [(200, 150, 100), (150, 200, 120)]
+
+
+class Case(NamedTuple):
+    """
+    Тест: setup() готовит данные и возвращает измеряемую функцию
+    без аргументов; n - количество обрабатываемых элементов
+    """
+    name: str
+    n: int
+    setup: Callable[[], Callable[[], object]]
+
+
+def measure(func: Callable[[], object]) -> Dict[str, float]:
+    """
+    Время одного вызова func (с): лучшее и среднее по повторам.
+    Количество вызовов в повторе подбирается так, чтобы повтор
+    длился не меньше 0.2 с; число повторов ограничено бюджетом BUDGET
+    """
+    timer = Timer(func)
+    number, elapsed = timer.autorange()
+    repeat = int(max(1, min(REPEAT, BUDGET // max(elapsed, 1e-9))))
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "best": min(times),
+        "mean": sum(times) / len(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def random_points(count: int) -> np.ndarray:
+    """ Точки N×3 в кубе [-100, 100]³ (seed постоянный) """
+    return np.random.default_rng(SEED).uniform(-100, 100, (count, 3))
+
+
+def random_cameras(count: int) -> np.ndarray:
+    """ Положения камеры K×3 снаружи куба осей """
+    rng = np.random.default_rng(SEED)
+    return rng.uniform(150, 300, (count, 3)) * rng.choice((-1, 1), (count, 3))
+
+
+def frame_ops() -> List[Matrix]:
+    return bench_matrix.get_ops()
+
+
+# Матрицы Matrix (4×4)
+
+def matrix_cases() -> Iterator[Case]:
+    a, b = (Matrix(input_values=m.values) for m in frame_ops()[:2])
+    out = Matrix()
+    projective = Transform4.from_matrix(reduce(mul, frame_ops()[:4]))
+    rigid = Transform4.from_matrix(reduce(mul, frame_ops()[:3]))
+
+    def inplace() -> None:
+        out.values = a.values
+        out.multiply(b, out=out)
+
+    operators = {
+        "matrix.add": lambda: a + b,
+        "matrix.sub": lambda: a - b,
+        "matrix.mul": lambda: a * b,
+        "matrix.mul_out": lambda: a.multiply(b, out=out),
+        "matrix.imul": inplace,
+        "matrix.transposed": lambda: a.transposed(out=out),
+        "matrix.inverted": lambda: a.inverted(out=out),
+        "transform4.inverted_rigid": rigid.inverted,
+        "transform4.inverted_projective": projective.inverted,
+    }
+    for name, func in operators.items():
+        yield Case(name, 1, lambda func=func: func)
+
+
+# Построение матриц mx_utils
+
+def mx_utils_cases(sizes) -> Iterator[Case]:
+    out = Matrix()
+    builders = {
+        "mx_utils.rx": lambda c, s: get_matrix_rx(c, s),
+        "mx_utils.rz": lambda c, s: get_matrix_rz(c, s),
+        "mx_utils.t": lambda c, s: get_matrix_t(c, s, 0),
+        "mx_utils.p": lambda c, s: get_matrix_p(c),
+    }
+    for name, build in builders.items():
+        yield Case(name, 1, lambda build=build: lambda: build(0.6, 0.8))
+    yield Case(
+        "mx_utils.rz_out", 1,
+        lambda: lambda: get_matrix_rz(0.6, 0.8, out=out)
+    )
+
+    # Стопки матриц: аргументы - массивы длины N
+    for count in sizes:
+        def setup(count=count) -> Callable[[], object]:
+            angles = np.random.default_rng(SEED).uniform(0, np.pi, count)
+            c, s = np.cos(angles), np.sin(angles)
+            return lambda: get_matrix_rz(c, s) * get_matrix_rx(c, s)
+
+        yield Case("mx_utils.stack_rz_rx", count, setup)
+
+
+# Матрицы кадра
+
+def frame_cases(sizes) -> Iterator[Case]:
+    ops = frame_ops()
+
+    def setup_view_matrix() -> Callable[[], object]:
+        scene = make_scene(0)
+        frames = iter(range(sys.maxsize))
+
+        def view_matrix() -> None:
+            # Кэш матриц сбрасывается: матрица вида строится каждый раз
+            scene.view_transform.cache_clear()
+            scene.set_c(*CAMERAS[next(frames) % 2])
+            scene.sync()
+            scene.graph.get("view_matrix")
+
+        return view_matrix
+
+    yield Case("frame.view_matrix", len(ops), setup_view_matrix)
+    yield Case(
+        "frame.chain_operators", len(ops),
+        lambda: bench_matrix.chain_operators
+    )
+    yield Case(
+        "frame.chain_inplace", len(ops),
+        lambda: bench_matrix.chain_inplace
+    )
+    yield Case(
+        "frame.build_allocating", 6,
+        lambda: bench_mx_utils.frame_allocating
+    )
+    yield Case(
+        "frame.build_buffered", 6,
+        lambda: bench_mx_utils.frame_buffered
+    )
+
+    # Матрицы вида сразу для K положений камеры
+    for count in sizes:
+        def setup(count=count) -> Callable[[], object]:
+            cameras = random_cameras(count)
+            view = Scene().view_transform
+            return lambda: view.stack(cameras, True, WIDTH, HEIGHT)
+
+        yield Case("frame.view_stack", count, setup)
+
+
+# Преобразование точек
+
+def point_cases(sizes) -> Iterator[Case]:
+    product = reduce(mul, frame_ops())
+
+    for count in sizes:
+        def setup_mul(count=count) -> Callable[[], object]:
+            points = [Point3D(*p) for p in random_points(count).tolist()]
+            return lambda: [point * product for point in points]
+
+        def setup_transform(
+                count=count, dtype=np.float64
+        ) -> Callable[[], object]:
+            points = PointArray.from_array(random_points(count), dtype=dtype)
+            return lambda: points.transform(product)
+
+        yield Case("point3d.mul", count, setup_mul)
+        yield Case("points.transform", count, setup_transform)
+        yield Case(
+            "points.transform_f32", count,
+            lambda count=count: setup_transform(count, np.float32)
+        )
+
+
+# Аксонометрический чертеж без окна
+
+def make_scene(count: int) -> Scene:
+    """
+    Сцена с N именованными точками (кроме точек чертежа) и с
+    центральным проецированием
+    """
+    scene = Scene()
+    scene.set_size(WIDTH, HEIGHT)
+    scene.selected_projection = SelectProjection.CEN
+    scene.points_3d = PointArray.from_array(
+        random_points(count), [f"P{i}" for i in range(count)]
+    )
+    scene.recalculate_ax_coordinates()
+    return scene
+
+
+def scene_cases(sizes) -> Iterator[Case]:
+    for count in sizes:
+        def setup_recalculate(count=count) -> Callable[[], object]:
+            scene = make_scene(count)
+            frames = iter(range(sys.maxsize))
+
+            def recalculate() -> None:
+                # Камера меняется на каждом вызове: граф пересчитывает
+                # матрицу вида и все точки чертежа
+                scene.set_c(*CAMERAS[next(frames) % 2])
+                scene.recalculate_ax_coordinates()
+
+            return recalculate
+
+        def setup_points(count=count) -> Callable[[], object]:
+            scene = make_scene(count)
+            graph = scene.graph
+
+            def points() -> None:
+                # Матрица вида та же: пересчитываются только точки
+                graph.invalidate("ax_homogeneous")
+                graph.get("ax_points")
+
+            return points
+
+        yield Case("scene.recalculate_ax", count, setup_recalculate)
+        yield Case("scene.ax_points", count, setup_points)
+
+
+# Трассировка
+
+def trace_cases() -> Iterator[Case]:
+    def setup(enabled: bool) -> Callable[[], object]:
+        tracer = Tracer()
+        tracer.enabled = enabled
+
+        def span() -> None:
+            with tracer.span("stage"):
+                pass
+
+        return span
+
+    yield Case("trace.span_disabled", 1, lambda: setup(False))
+    yield Case("trace.span_enabled", 1, lambda: setup(True))
+
+
+def collect_cases(sizes) -> List[Case]:
+    return [
+        *matrix_cases(),
+        *mx_utils_cases(sizes),
+        *frame_cases(sizes),
+        *point_cases(sizes),
+        *scene_cases(sizes),
+        *trace_cases(),
+    ]
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "pyqt": QtCore.PYQT_VERSION_STR,
+        "qt": QtCore.QT_VERSION_STR,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def run(cases: List[Case], verbose: bool = True) -> List[Dict]:
+    results = []
+    for case in cases:
+        timing = measure(case.setup())
+        result = {
+            "name": case.name,
+            "n": case.n,
+            **timing,
+            "per_item": timing["best"] / case.n,
+        }
+        results.append(result)
+        if verbose:
+            print(
+                f"{case.name:<32} N={case.n:>8}  "
+                f"{timing['best'] * 1e6:12.2f} us  "
+                f"{result['per_item'] * 1e9:10.1f} ns/item",
+                file=sys.stderr
+            )
+    return results
+
+
+def compare(
+        results: List[Dict], baseline: List[Dict], threshold: float
+) -> List[Dict]:
+    """
+    Тесты, лучшее время которых выросло больше чем в (1 + threshold)
+    раз относительно baseline. Тесты, которых нет в baseline,
+    не сравниваются
+    """
+    previous = {(r["name"], r["n"]): r["best"] for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["name"], result["n"]))
+        if before is None:
+            continue
+        ratio = result["best"] / before
+        if ratio > 1 + threshold:
+            regressions.append({
+                "name": result["name"],
+                "n": result["n"],
+                "baseline": before,
+                "best": result["best"],
+                "ratio": ratio,
+            })
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite",
+        description="Тесты производительности ядра (результат в JSON)"
+    )
+    parser.add_argument(
+        "-o", "--output", help="файл результатов JSON (по умолчанию stdout)"
+    )
+    parser.add_argument(
+        "--baseline", help="JSON предыдущего запуска для сравнения"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=THRESHOLD,
+        help="допустимое замедление (доля, по умолчанию %(default)s)"
+    )
+    parser.add_argument(
+        "--max-n", type=int, default=SIZES[-1],
+        help="наибольшее количество точек (по умолчанию %(default)s)"
+    )
+    parser.add_argument(
+        "--filter", default="*",
+        help="шаблон имен тестов, например 'scene.*'"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="не печатать ход измерений"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    sizes = [n for n in SIZES if n <= args.max_n]
+    cases = [
+        case for case in collect_cases(sizes)
+        if fnmatch(case.name, args.filter)
+    ]
+    results = run(cases, verbose=not args.quiet)
+
+    report = {
+        "schema": SCHEMA,
+        "seed": SEED,
+        "environment": environment(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+    for r in regressions:
+        print(
+            f"REGRESSION {r['name']} N={r['n']}: "
+            f"{r['baseline'] * 1e6:.2f} -> {r['best'] * 1e6:.2f} us "
+            f"(x{r['ratio']:.2f})",
+            file=sys.stderr
+        )
+    if regressions:
+        return 1
+    print(f"no regressions (threshold {args.threshold:.0%})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+# coding: utf-8
+
+"""
+Настройка pytest: корень репозитория в sys.path (пакеты core, gui,
+benchmarks импортируются из тестов так же, как при запуске программы)
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """
+    Приложение Qt на платформе "offscreen" (дисплей не нужен), общее
+    для всех тестов: второе приложение в процессе Qt создать не дает
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5 import QtWidgets
+
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication(["pytest"])
+    return app
@@ -0,0 +1,68 @@
+# coding: utf-8
+
+"""
+Траектории камеры для анимации
+
+Траектория - массив K×3 положений камеры, по одному на кадр.
+Строится заранее целиком, чтобы матрицы вида всех кадров можно было
+получить одной стопкой (ViewTransform.preload).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def orbit(
+        camera: Tuple[float, float, float],
+        frames: int,
+        turns: float = 1.0
+) -> np.ndarray:
+    """
+    Облет вокруг оси Z: камера движется по окружности на высоте
+    camera z, начиная с положения camera
+
+    :param frames: количество кадров на всю траекторию
+    :param turns: количество оборотов
+    :return: массив K×3
+    """
+    x, y, z = camera
+    radius = np.hypot(x, y)
+    if radius == 0:
+        raise ValueError("Камера на оси Z: облет невозможен")
+
+    start = np.arctan2(y, x)
+    angles = start + np.linspace(0, 2 * np.pi * turns, frames, endpoint=False)
+
+    cameras = np.empty((frames, 3))
+    cameras[:, 0] = radius * np.cos(angles)
+    cameras[:, 1] = radius * np.sin(angles)
+    cameras[:, 2] = z
+    return cameras
+
+
+def flythrough(waypoints: np.ndarray, frames: int) -> np.ndarray:
+    """
+    Пролет через точки waypoints (M×3) по ломаной с постоянной
+    скоростью: кадры равномерно распределены по длине пути
+
+    :return: массив K×3 (первый кадр - первая точка, последний -
+        последняя)
+    """
+    waypoints = np.asarray(waypoints, dtype=np.float64)
+    if len(waypoints) < 2:
+        raise ValueError("Для пролета нужно не меньше двух точек")
+
+    lengths = np.linalg.norm(np.diff(waypoints, axis=0), axis=1)
+    distance = np.concatenate([[0], np.cumsum(lengths)])
+    samples = np.linspace(0, distance[-1], frames)
+
+    return np.stack([
+        np.interp(samples, distance, waypoints[:, axis])
+        for axis in range(3)
+    ], axis=1)
+
+
+def passes_origin(cameras: np.ndarray, eps: float = 1e-9) -> bool:
+    """ Одно из положений камеры в начале координат """
+    return bool(np.any(np.linalg.norm(cameras, axis=1) < eps))
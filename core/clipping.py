@@ -0,0 +1,156 @@
+# coding: utf-8
+
+"""
+Отсечение отрезков
+
+1. Ближней плоскостью - в однородных координатах, до деления на w
+   (project_edges). После матрицы вида с центральной проекцией
+   w = 1 - (глубина точки) / (расстояние до камеры): w > 0 перед
+   камерой, w <= 0 - на уровне камеры и позади нее. Деление на такое w
+   переворачивает точку или уводит ее в бесконечность, поэтому
+   ребро обрезается по плоскости w = near. При параллельной проекции
+   w = 1 у всех точек, и отсечение ничего не делает.
+
+2. Прямоугольником экрана (алгоритм Лианга - Барски, clip_lines).
+
+В обоих случаях все отрезки обрабатываются вместе операциями NumPy,
+без цикла Python по отрезкам. Отрезок
+P(t) = P1 + t * (P2 - P1), 0 <= t <= 1, лежит внутри прямоугольника,
+пока для каждой из четырех границ p_k * t <= q_k, где
+
+    p = (-dx, dx, -dy, dy)
+    q = (x1 - xmin, xmax - x1, y1 - ymin, ymax - y1)
+
+Границы с p_k < 0 поднимают начало видимой части t0, с p_k > 0 -
+опускают конец t1. Отрезок видим, если t0 <= t1 (и он не параллелен
+границе, оставаясь снаружи нее: p_k = 0, q_k < 0).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Ближняя плоскость: наименьшее w, до которого доходит ребро
+NEAR_W = 1e-3
+
+
+def project_edges(
+        points: np.ndarray,
+        edges: np.ndarray,
+        near: float = NEAR_W,
+        dims: int = 2
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Отсекает ребра (пары индексов E×2 в массиве однородных точек N×4)
+    ближней плоскостью w = near и делит концы на w
+
+    Возвращает отрезки на экране E×4 (x1, y1, x2, y2) и маску ребер,
+    хотя бы частично лежащих перед плоскостью; остальные строки
+    отрезков не имеют смысла. При dims=3 отрезки E×6 содержат
+    и глубину концов (x1, y1, z1, x2, y2, z2)
+    """
+    start = points[edges[:, 0]]
+    end = points[edges[:, 1]]
+    w1 = start[:, 3]
+    w2 = end[:, 3]
+
+    cut_start = w1 < near
+    cut_end = w2 < near
+    visible = ~(cut_start & cut_end)
+
+    # Ребра, пересекающие плоскость, обрезаются по точке w = near
+    cut = visible & (cut_start | cut_end)
+    if cut.any():
+        a = start[cut]
+        b = end[cut]
+        t = (near - a[:, 3]) / (b[:, 3] - a[:, 3])
+        crossing = a + t[:, np.newaxis] * (b - a)
+
+        start[cut & cut_start] = crossing[cut_start[cut]]
+        end[cut & cut_end] = crossing[cut_end[cut]]
+
+    lines = np.empty((len(edges), 2 * dims))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(start[:, :dims], start[:, 3:], out=lines[:, :dims])
+        np.divide(end[:, :dims], end[:, 3:], out=lines[:, dims:])
+    return lines, visible
+
+
+def clip_parameters(
+        lines: np.ndarray, rect: Tuple[float, float, float, float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Параметры видимой части отрезков E×4 (x1, y1, x2, y2)
+    в прямоугольнике rect = (xmin, ymin, xmax, ymax): t0, t1 и маска
+    видимых отрезков
+    """
+    xmin, ymin, xmax, ymax = rect
+    x1, y1, x2, y2 = np.ascontiguousarray(lines.T)
+    dx = x2 - x1
+    dy = y2 - y1
+
+    t0 = np.zeros(len(lines))
+    t1 = np.ones(len(lines))
+    visible = np.ones(len(lines), dtype=bool)
+
+    # Четыре границы: по одному проходу по всем отрезкам на каждую
+    for p, q in (
+            (-dx, x1 - xmin), (dx, xmax - x1),
+            (-dy, y1 - ymin), (dy, ymax - y1)
+    ):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = q / p
+        np.maximum(t0, r, out=t0, where=p < 0)
+        np.minimum(t1, r, out=t1, where=p > 0)
+        visible &= (p != 0) | (q >= 0)
+
+    visible &= t0 <= t1
+    return t0, t1, visible
+
+
+def clip_lines(
+        lines: np.ndarray, rect: Tuple[float, float, float, float]
+) -> np.ndarray:
+    """
+    Видимые части отрезков E×4 (x1, y1, x2, y2) в прямоугольнике
+    rect = (xmin, ymin, xmax, ymax). Невидимые отрезки отбрасываются
+    """
+    lines = np.asarray(lines, dtype=np.float64).reshape(-1, 4)
+    t0, t1, visible = clip_parameters(lines, rect)
+
+    # Все отрезки целиком внутри - отсекать нечего
+    if visible.all() and not t0.any() and (t1 == 1).all():
+        return lines
+
+    lines = lines[visible]
+    t0 = t0[visible, np.newaxis]
+    t1 = t1[visible, np.newaxis]
+
+    start = lines[:, :2]
+    delta = lines[:, 2:] - start
+    return np.hstack([start + t0 * delta, start + t1 * delta])
+
+
+def inside_rect(
+        xy: np.ndarray, rect: Tuple[float, float, float, float]
+) -> np.ndarray:
+    """ Маска точек N×2, лежащих в прямоугольнике rect """
+    xmin, ymin, xmax, ymax = rect
+    return (
+        (xmin <= xy[:, 0]) & (xy[:, 0] <= xmax)
+        & (ymin <= xy[:, 1]) & (xy[:, 1] <= ymax)
+    )
+
+
+if __name__ == "__main__":
+    demo = np.array([
+        [10, 10, 20, 20],       # внутри
+        [-10, 50, 110, 50],     # пересекает обе вертикальные границы
+        [-10, -10, -5, 200],    # снаружи
+        [50, -50, 50, 50],      # начинается над прямоугольником
+    ], dtype=np.float64)
+    print(clip_lines(demo, (0, 0, 100, 100)))
+
+    # Второй конец ребра позади камеры (w < 0)
+    homogeneous = np.array([[10, 10, 0, 1], [-10, 30, 0, -1]], dtype=float)
+    print(project_edges(homogeneous, np.array([[0, 1]])))
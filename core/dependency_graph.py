@@ -0,0 +1,141 @@
+# coding: utf-8
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from core.tracing import TRACER
+
+
+class _Node(object):
+    """ Узел графа: входное значение или вычисляемое по зависимостям """
+
+    __slots__ = (
+        "name", "compute", "deps", "dependents", "value", "stale",
+        "hits", "misses", "span", "span_args"
+    )
+
+    def __init__(
+            self,
+            name: str,
+            compute: Callable[..., Any] = None,
+            deps: Sequence[str] = (),
+            span: Optional[str] = None
+    ) -> None:
+        self.name: str = name
+        self.compute: Callable[..., Any] = compute
+        self.deps: Sequence[str] = tuple(deps)
+        self.dependents: List["_Node"] = []
+        self.value: Any = None
+        self.stale: bool = compute is not None
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # Этап, к которому относится пересчет узла (см. core.tracing)
+        self.span: str = span or name
+        self.span_args: Dict[str, str] = {"node": name}
+
+
+class DependencyGraph(object):
+    """
+    Граф зависимостей для инкрементального пересчета
+
+    Входы задаются через set_input. Вычисляемый узел пересчитывается
+    при запросе (get), только если изменился какой-либо вход,
+    от которого он зависит (прямо или через другие узлы).
+    Для каждого узла считаются попадания (значение взято готовым)
+    и промахи (значение пересчитано).
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[str, _Node] = {}
+
+    def add_input(self, name: str, value: Any = None) -> None:
+        node = self._add(_Node(name))
+        node.value = value
+
+    def add_node(
+            self,
+            name: str,
+            compute: Callable[..., Any],
+            deps: Sequence[str],
+            span: Optional[str] = None
+    ) -> None:
+        """
+        Добавляет вычисляемый узел
+
+        compute вызывается со значениями зависимостей deps
+        (в том же порядке). Зависимости должны быть уже добавлены.
+        При включенной трассировке пересчет узла записывается
+        в интервал span (по умолчанию - имя узла).
+        """
+        node = self._add(_Node(name, compute, deps, span))
+        for dep in node.deps:
+            self._nodes[dep].dependents.append(node)
+
+    def _add(self, node: _Node) -> _Node:
+        if node.name in self._nodes:
+            raise ValueError(f"Node {node.name!r} already exists")
+        self._nodes[node.name] = node
+        return node
+
+    def set_input(self, name: str, value: Any) -> bool:
+        """
+        Задает значение входа
+
+        :return: True, если значение изменилось (зависимые узлы
+            помечены устаревшими)
+        """
+        node = self._nodes[name]
+        if node.compute is not None:
+            raise ValueError(f"Node {name!r} is not an input")
+
+        if node.value == value:
+            return False
+
+        node.value = value
+        self._invalidate_dependents(node)
+        return True
+
+    def invalidate(self, name: str) -> None:
+        """ Помечает узел (и все зависящие от него) устаревшим """
+        node = self._nodes[name]
+        if node.compute is not None:
+            node.stale = True
+        self._invalidate_dependents(node)
+
+    @staticmethod
+    def _invalidate_dependents(node: _Node) -> None:
+        stack = list(node.dependents)
+        while stack:
+            node = stack.pop()
+            if not node.stale:
+                node.stale = True
+                stack.extend(node.dependents)
+
+    def is_stale(self, name: str) -> bool:
+        return self._nodes[name].stale
+
+    def get(self, name: str) -> Any:
+        """ Значение узла (пересчитывается, если устарело) """
+        node = self._nodes[name]
+
+        if node.compute is None:
+            return node.value
+
+        if not node.stale:
+            node.hits += 1
+            return node.value
+
+        node.misses += 1
+        args = [self.get(dep) for dep in node.deps]
+        with TRACER.span(node.span, "graph", node.span_args):
+            node.value = node.compute(*args)
+        node.stale = False
+        return node.value
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """ Попадания и промахи по вычисляемым узлам """
+        return {
+            name: {"hits": node.hits, "misses": node.misses}
+            for name, node in self._nodes.items()
+            if node.compute is not None
+        }
@@ -1,26 +1,55 @@
 # coding: utf-8
 
+import enum
+from typing import List, Optional, Union
+
 import numpy as np
 
 
 class Matrix(object):
-    """ Работа с матрицей """
+    """
+    Работа с матрицей
 
-    def __init__(
-            self, width: int = 4, height: int = 4, input_values=None
-    ) -> None:
+    Значения хранятся в массиве dtype (float64 по умолчанию, для
+    одинарной точности - float32). Если input_values уже является
+    массивом numpy и copy=False, матрица использует его без копирования
+    (тип приводится, только если dtype задан явно и отличается);
+    списки и прочие значения всегда приводятся к dtype.
 
-        # Столбцов в матрице
-        self._width: int = width
+    Матрица над массивом только для чтения (writeable = False)
+    не изменяется: ни операторами с присваиванием, ни через values.
 
-        # Строк в матрице
-        self._height: int = height
+    Операторы `+`, `-`, `*` возвращают новую матрицу, `+=`, `-=`, `*=`
+    (и `@=`) изменяют текущую. Методы add/subtract/multiply/transposed/
+    inverted принимают необязательную матрицу out, в которую
+    записывается результат.
+    """
 
-        self._values: np.ndarray = np.zeros((width, height), dtype=np.float64)
+    def __init__(
+            self,
+            width: int = 4,
+            height: int = 4,
+            input_values=None,
+            copy: bool = True,
+            dtype: Optional[np.dtype] = None
+    ) -> None:
+        # Без копирования массив сохраняет свой тип, иначе - float64
+        if dtype is None and (
+                copy or not isinstance(input_values, np.ndarray)
+        ):
+            dtype = np.float64
+
+        if input_values is None:
+            self._values: np.ndarray = np.zeros((width, height), dtype=dtype)
+        elif copy:
+            self._values = np.array(input_values, dtype=dtype)
+        else:
+            self._values = np.asarray(input_values, dtype=dtype)
 
-        if input_values is not None:
-            self._values = np.array(input_values)
-            self._width, self._height = self._values.shape
+        # Столбцов и строк в матрице
+        self._width: int
+        self._height: int
+        self._width, self._height = self._values.shape
 
     def __str__(self) -> str:
         return f"{self._values}"
@@ -45,48 +74,416 @@ class Matrix(object):
 
     @values.setter
     def values(self, values):
-        self._values = np.array(values)
+        # Общие постоянные матрицы (core.mx_utils, кэш ViewTransform)
+        # хранят массив только для чтения: замена значений испортила бы
+        # все последующие кадры
+        if not self._values.flags.writeable:
+            raise ValueError("Matrix is read-only")
+        self._values = np.array(values, dtype=self._values.dtype)
         self._width, self._height = self._values.shape
 
+    @property
+    def dtype(self) -> np.dtype:
+        return self._values.dtype
+
+    def astype(self, dtype: np.dtype) -> "Matrix":
+        """ Матрица с элементами типа dtype (без копии, если тип тот же) """
+        if self._values.dtype == dtype:
+            return self
+        return Matrix(input_values=self._values.astype(dtype), copy=False)
+
     def set_value(self, x: int, y: int, value):
         self._values[x, y] = value
 
+    def copy(self) -> "Matrix":
+        return Matrix(input_values=self._values.copy(), copy=False)
+
     # ---
     # Операторы
 
     # Сложение
     def __add__(self, other: "Matrix") -> "Matrix":
-        matrix = Matrix()
-        matrix.values = np.add(self.values, other.values)
-        return matrix
+        return self.add(other)
+
+    def __iadd__(self, other: "Matrix") -> "Matrix":
+        return self.add(other, out=self)
+
+    def add(self, other: "Matrix", out: "Matrix" = None) -> "Matrix":
+        if out is None:
+            return Matrix(
+                input_values=np.add(self._values, other.values), copy=False
+            )
+        np.add(self._values, other.values, out=out.values)
+        return out
 
     # Вычитание
     def __sub__(self, other: "Matrix") -> "Matrix":
-        matrix = Matrix()
-        matrix.values = np.subtract(self.values, other.values)
-        return matrix
+        return self.subtract(other)
+
+    def __isub__(self, other: "Matrix") -> "Matrix":
+        return self.subtract(other, out=self)
+
+    def subtract(self, other: "Matrix", out: "Matrix" = None) -> "Matrix":
+        if out is None:
+            return Matrix(
+                input_values=np.subtract(self._values, other.values),
+                copy=False
+            )
+        np.subtract(self._values, other.values, out=out.values)
+        return out
 
     # Умножение
     def __mul__(self, other: "Matrix") -> "Matrix":
-        matrix = Matrix()
-        matrix.values = np.dot(self.values, other.values)
-        return matrix
+        return self.multiply(other)
+
+    def __imul__(self, other: "Matrix") -> "Matrix":
+        return self.multiply(other, out=self)
+
+    __matmul__ = __mul__
+    __imatmul__ = __imul__
+
+    def multiply(self, other: "Matrix", out: "Matrix" = None) -> "Matrix":
+        if out is None:
+            return Matrix(
+                input_values=np.dot(self._values, other.values), copy=False
+            )
+        # dot сам разбирается с пересечением out и аргументов, но
+        # требует, чтобы тип out совпадал с типом результата: сомножители
+        # другого типа приводятся к типу out (как при += и -=)
+        _dot_into(self._values, other.values, out.values)
+        return out
 
     # Транспонирование
-    def transposed(self) -> "Matrix":
-        matrix = Matrix()
-        matrix.values = np.transpose(self.values)
-        return matrix
+    def transposed(self, out: "Matrix" = None) -> "Matrix":
+        if out is None:
+            return Matrix(
+                input_values=np.transpose(self._values),
+                dtype=self._values.dtype
+            )
+        np.copyto(out.values, np.transpose(self._values))
+        return out
 
     # Обратная матрица
-    def inverted(self) -> "Matrix":
-        matrix = Matrix()
-        matrix.values = np.linalg.inv(self.values)
-        return matrix
+    def inverted(self, out: "Matrix" = None) -> "Matrix":
+        if out is None:
+            return Matrix(
+                input_values=np.linalg.inv(self._values),
+                copy=False,
+                dtype=self._values.dtype
+            )
+        np.copyto(out.values, np.linalg.inv(self._values))
+        return out
 
     # ---
 
 
+def _dot_into(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> None:
+    """ Произведение a и b в out, сомножители приводятся к типу out """
+    np.dot(
+        a.astype(out.dtype, copy=False),
+        b.astype(out.dtype, copy=False),
+        out=out
+    )
+
+
+class TransformKind(enum.IntEnum):
+    """
+    Вид однородного преобразования 4×4 (по возрастанию общности):
+
+    - `RIGID` - ортогональная часть 3×3 и перенос
+      (повороты, отражения, сдвиги)
+    - `AFFINE` - произвольная невырожденная часть 3×3 и перенос
+    - `PROJECTIVE` - последний столбец отличен от (0, 0, 0, 1)
+    """
+
+    RIGID = 1
+    AFFINE = 2
+    PROJECTIVE = 3
+
+
+def _rigid_inverse(values: np.ndarray) -> List[List[float]]:
+    """ Обратная к жесткому преобразованию: R^T и -t * R^T """
+    (a, b, c, _), (d, e, f, _), (g, h, i, _), (x, y, z, _) = values.tolist()
+
+    return [
+        [a, d, g, 0],
+        [b, e, h, 0],
+        [c, f, i, 0],
+        [
+            -(x * a + y * b + z * c),
+            -(x * d + y * e + z * f),
+            -(x * g + y * h + z * i),
+            1
+        ]
+    ]
+
+
+def _affine_inverse(values: np.ndarray) -> List[List[float]]:
+    """ Обратная к аффинному преобразованию: A^-1 через присоединенную """
+    (a, b, c, _), (d, e, f, _), (g, h, i, _), (x, y, z, _) = values.tolist()
+
+    # Алгебраические дополнения
+    ca, cb, cc = e * i - f * h, f * g - d * i, d * h - e * g
+    det = a * ca + b * cb + c * cc
+    if det == 0:
+        raise np.linalg.LinAlgError("Singular matrix")
+
+    k = 1 / det
+    m00, m01, m02 = ca * k, (c * h - b * i) * k, (b * f - c * e) * k
+    m10, m11, m12 = cb * k, (a * i - c * g) * k, (c * d - a * f) * k
+    m20, m21, m22 = cc * k, (b * g - a * h) * k, (a * e - b * d) * k
+
+    return [
+        [m00, m01, m02, 0],
+        [m10, m11, m12, 0],
+        [m20, m21, m22, 0],
+        [
+            -(x * m00 + y * m10 + z * m20),
+            -(x * m01 + y * m11 + z * m21),
+            -(x * m02 + y * m12 + z * m22),
+            1
+        ]
+    ]
+
+
+class Transform4(Matrix):
+    """
+    Однородное преобразование 4×4 (точка-строка умножается справа)
+
+    Хранит вид преобразования (TransformKind). Вид произведения
+    определяется по видам сомножителей без повторного анализа, обратная
+    матрица для жестких и аффинных преобразований строится в замкнутом
+    виде, и только проективные обращаются через LU (np.linalg.inv).
+    Тип элементов (dtype, как в Matrix) сохраняется при умножении
+    и обращении.
+    """
+
+    # Допуск при определении вида преобразования
+    tolerance: float = 1e-9
+
+    def __init__(
+            self,
+            input_values=None,
+            kind: TransformKind = None,
+            copy: bool = True,
+            dtype: Optional[np.dtype] = None
+    ) -> None:
+        if input_values is None:
+            input_values = np.eye(
+                4, dtype=np.float64 if dtype is None else dtype
+            )
+            kind = TransformKind.RIGID
+            copy = False
+
+        super().__init__(input_values=input_values, copy=copy, dtype=dtype)
+
+        if self._values.shape != (4, 4):
+            raise ValueError(
+                f"Transform4 requires a 4x4 matrix, got {self._values.shape}"
+            )
+
+        if kind is None:
+            kind = self.classify(self._values)
+        self._kind: TransformKind = kind
+
+    @classmethod
+    def from_matrix(cls, matrix: Matrix) -> "Transform4":
+        if isinstance(matrix, Transform4):
+            return cls(matrix.values, matrix.kind, dtype=matrix.dtype)
+        return cls(matrix.values, dtype=matrix.dtype)
+
+    @classmethod
+    def classify(cls, values: np.ndarray) -> TransformKind:
+        """ Определяет вид преобразования по значениям матрицы """
+        tol = cls.tolerance
+
+        if not np.allclose(values[:, 3], (0, 0, 0, 1), rtol=0, atol=tol):
+            return TransformKind.PROJECTIVE
+
+        a = values[:3, :3]
+        if np.allclose(np.dot(a, a.T), np.eye(3), rtol=0, atol=tol):
+            return TransformKind.RIGID
+
+        return TransformKind.AFFINE
+
+    @property
+    def kind(self) -> TransformKind:
+        return self._kind
+
+    def is_rigid(self) -> bool:
+        return self._kind == TransformKind.RIGID
+
+    def is_affine(self) -> bool:
+        """ Аффинное (в том числе жесткое) преобразование """
+        return self._kind <= TransformKind.AFFINE
+
+    def copy(self) -> "Transform4":
+        return Transform4(self._values.copy(), self._kind, copy=False)
+
+    # ---
+    # Композиция
+
+    def multiply(self, other: Matrix, out: Matrix = None) -> Matrix:
+        if not isinstance(other, Transform4):
+            return super().multiply(other, out)
+
+        kind = max(self._kind, other.kind)
+        if out is None:
+            return Transform4(
+                np.dot(self._values, other.values), kind, copy=False
+            )
+
+        _dot_into(self._values, other.values, out.values)
+        if isinstance(out, Transform4):
+            out._kind = kind
+        return out
+
+    def __mul__(self, other: Matrix) -> Matrix:
+        return self.multiply(other)
+
+    def __imul__(self, other: Matrix) -> "Transform4":
+        self.multiply(other, out=self)
+        if not isinstance(other, Transform4):
+            self._kind = self.classify(self._values)
+        return self
+
+    __matmul__ = __mul__
+    __imatmul__ = __imul__
+
+    # ---
+    # Обращение
+
+    def inverted(self, out: Matrix = None) -> "Transform4":
+        if self._kind == TransformKind.RIGID:
+            values = _rigid_inverse(self._values)
+        elif self._kind == TransformKind.AFFINE:
+            values = _affine_inverse(self._values)
+        else:
+            values = np.linalg.inv(self._values)
+
+        if out is None:
+            return Transform4(
+                np.asarray(values, dtype=self._values.dtype),
+                self._kind,
+                copy=False
+            )
+
+        out.values[...] = values
+        if isinstance(out, Transform4):
+            out._kind = self._kind
+        return out
+
+
+class MatrixStack(object):
+    """
+    Стопка из K матриц 4×4 (массив K×4×4)
+
+    Позволяет строить, перемножать и обращать матрицы сразу для многих
+    положений камеры. Умножение на обычную матрицу применяет ее
+    ко всем матрицам стопки (стопка должна быть левым сомножителем).
+    """
+
+    def __init__(
+            self,
+            input_values,
+            copy: bool = True,
+            dtype: Optional[np.dtype] = None
+    ) -> None:
+        # Как в Matrix: без копирования массив сохраняет свой тип
+        if dtype is None and (
+                copy or not isinstance(input_values, np.ndarray)
+        ):
+            dtype = np.float64
+
+        if copy:
+            self._values: np.ndarray = np.array(input_values, dtype=dtype)
+        else:
+            self._values = np.asarray(input_values, dtype=dtype)
+
+        if self._values.ndim != 3 or self._values.shape[1:] != (4, 4):
+            raise ValueError(
+                f"MatrixStack requires a Kx4x4 array, "
+                f"got {self._values.shape}"
+            )
+
+    @classmethod
+    def identity(
+            cls, count: int, dtype: np.dtype = np.float64
+    ) -> "MatrixStack":
+        values = np.zeros((count, 4, 4), dtype=dtype)
+        values[:, (0, 1, 2, 3), (0, 1, 2, 3)] = 1
+        return cls(values, copy=False)
+
+    def __str__(self) -> str:
+        return f"{self._values}"
+
+    def __len__(self) -> int:
+        return self._values.shape[0]
+
+    def __getitem__(self, i: int) -> Matrix:
+        """ Матрица номер i (без копирования) """
+        return Matrix(input_values=self._values[i], copy=False)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    # ---
+    # Операторы
+
+    def multiply(
+            self,
+            other: Union["MatrixStack", Matrix],
+            out: "MatrixStack" = None
+    ) -> "MatrixStack":
+        if out is None:
+            return MatrixStack(
+                np.matmul(self._values, other.values), copy=False
+            )
+        np.matmul(self._values, other.values, out=out.values)
+        return out
+
+    def __mul__(self, other: Union["MatrixStack", Matrix]) -> "MatrixStack":
+        return self.multiply(other)
+
+    def __imul__(self, other: Union["MatrixStack", Matrix]) -> "MatrixStack":
+        return self.multiply(other, out=self)
+
+    __matmul__ = __mul__
+    __imatmul__ = __imul__
+
+    def inverted(self) -> "MatrixStack":
+        return MatrixStack(np.linalg.inv(self._values), copy=False)
+
+    def transform_points(self, points) -> np.ndarray:
+        return transform_points(self, points)
+
+
+def transform_points(stack: MatrixStack, points) -> np.ndarray:
+    """
+    Экранные координаты точек для каждой матрицы стопки
+
+    :param stack: стопка из K матриц
+    :param points: точки N×3, N×4 (однородные) или объект со свойством
+        values (например, PointArray)
+    :return: массив K×N×2 (x, y после деления на w); точки float32
+        преобразуются в float32, остальные - в float64
+    """
+    points = np.asarray(getattr(points, "values", points))
+    if points.dtype != np.float32:
+        points = points.astype(np.float64, copy=False)
+    values = stack.values.astype(points.dtype, copy=False)
+
+    if points.shape[1] == 3:
+        # Однородная координата w = 1: переносится строкой 3 матриц
+        result = np.matmul(points, values[:, :3, :])
+        result += values[:, 3:, :]
+    else:
+        result = np.matmul(points, values)
+
+    return result[..., :2] / result[..., 3:]
+
+
 if __name__ == "__main__":
     m1 = Matrix()
     m1.values = [[1, 2], [3, 4]]
@@ -105,3 +502,8 @@ if __name__ == "__main__":
 
     m3 = Matrix(2, 2, [[1, 2], [3, 4]])
     print(m3)
+
+    m4 = m3.copy()
+    m4 *= m2
+    m4 += m1
+    print(m4)
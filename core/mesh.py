@@ -0,0 +1,410 @@
+# coding: utf-8
+
+"""
+Каркасные модели: загрузка из OBJ и PLY
+
+Вершины модели хранятся в массиве N×3 без повторов, ребра - в массиве
+индексов E×2 (каждое ребро один раз), грани, разбитые на треугольники, -
+в массиве F×3.
+"""
+
+import os
+from typing import BinaryIO, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+class Mesh(object):
+    """ Каркасная модель """
+
+    def __init__(
+            self,
+            vertices: np.ndarray,
+            edges: np.ndarray,
+            faces: np.ndarray = None
+    ) -> None:
+        # Вершины (N×3)
+        self.vertices: np.ndarray = np.asarray(vertices, dtype=np.float64)
+
+        # Ребра - пары индексов вершин (E×2)
+        self.edges: np.ndarray = np.asarray(edges, dtype=np.int64)
+
+        # Треугольники - тройки индексов вершин (F×3)
+        if faces is None:
+            faces = np.empty((0, 3), dtype=np.int64)
+        self.faces: np.ndarray = np.asarray(faces, dtype=np.int64)
+
+    def __str__(self) -> str:
+        return (
+            f"Mesh ({len(self.vertices)} vertices, {len(self.edges)} edges, "
+            f"{len(self.faces)} faces)"
+        )
+
+    @classmethod
+    def from_polygons(
+            cls,
+            vertices: np.ndarray,
+            polygons: Sequence[Sequence[int]] = (),
+            lines: Sequence[Sequence[int]] = ()
+    ) -> "Mesh":
+        """
+        Строит модель по вершинам, многоугольникам (граням) и ломаным
+
+        Совпадающие вершины объединяются, ребра строятся по сторонам
+        многоугольников и звеньям ломаных без повторов.
+        """
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+
+        # Объединяем совпадающие вершины
+        vertices, remap = np.unique(vertices, axis=0, return_inverse=True)
+        remap = remap.reshape(-1)
+
+        edges: List[np.ndarray] = []
+        faces: List[np.ndarray] = []
+
+        for size, group in _group_by_size(polygons).items():
+            if size < 2:
+                continue
+            group = remap[group]
+
+            # Стороны многоугольника (замкнутая ломаная)
+            edges.append(
+                np.stack((group, np.roll(group, -1, axis=1)), axis=2)
+                .reshape(-1, 2)
+            )
+
+            # Веер треугольников
+            if size >= 3:
+                fan = np.empty((len(group), size - 2, 3), dtype=np.int64)
+                fan[:, :, 0] = group[:, :1]
+                fan[:, :, 1] = group[:, 1:-1]
+                fan[:, :, 2] = group[:, 2:]
+                faces.append(fan.reshape(-1, 3))
+
+        for size, group in _group_by_size(lines).items():
+            if size < 2:
+                continue
+            group = remap[group]
+            edges.append(
+                np.stack((group[:, :-1], group[:, 1:]), axis=2)
+                .reshape(-1, 2)
+            )
+
+        return cls(vertices, unique_edges(edges), _concat(faces, 3))
+
+    def fitted(self, size: float) -> "Mesh":
+        """
+        Модель, перенесенная в начало координат и масштабированная так,
+        что наибольший размер равен size (ребра и грани общие)
+        """
+        if not len(self.vertices):
+            return self
+
+        low = self.vertices.min(axis=0)
+        extent = float((self.vertices.max(axis=0) - low).max())
+        scale = size / extent if extent else 1
+
+        return Mesh((self.vertices - low) * scale, self.edges, self.faces)
+
+
+def unique_edges(edges: List[np.ndarray]) -> np.ndarray:
+    """ Ребра без повторов и вырожденных (из вершины в нее же) """
+    edges = _concat(edges, 2)
+    edges = np.sort(edges, axis=1)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    return np.unique(edges, axis=0)
+
+
+def _concat(arrays: List[np.ndarray], width: int) -> np.ndarray:
+    if not arrays:
+        return np.empty((0, width), dtype=np.int64)
+    return np.concatenate(arrays)
+
+
+def _group_by_size(
+        polygons: Sequence[Sequence[int]]
+) -> Dict[int, np.ndarray]:
+    """
+    Группирует многоугольники по числу вершин (в массивы K×size).
+    Массив K×size (все многоугольники одного размера, например из
+    быстрого чтения PLY) возвращается как есть, без обхода по строкам
+    """
+    if isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+        return {polygons.shape[1]: polygons.astype(np.int64, copy=False)}
+
+    groups: Dict[int, List[Sequence[int]]] = {}
+    for polygon in polygons:
+        groups.setdefault(len(polygon), []).append(polygon)
+    return {
+        size: np.array(group, dtype=np.int64).reshape(-1, size)
+        for size, group in groups.items()
+    }
+
+
+# ---
+# Загрузка
+
+def load_mesh(path: str) -> Mesh:
+    """ Загружает модель, формат определяется по расширению файла """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".obj":
+        return load_obj(path)
+    if ext == ".ply":
+        return load_ply(path)
+    raise ValueError(f"Unsupported mesh format: {ext!r}")
+
+
+def load_obj(path: str) -> Mesh:
+    """ Загружает модель из файла Wavefront OBJ (v, f, l) """
+    vertices: List[Tuple[float, float, float]] = []
+    polygons: List[List[int]] = []
+    lines: List[List[int]] = []
+
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        for line in file:
+            parts = line.split()
+            if not parts:
+                continue
+
+            tag = parts[0]
+            if tag == "v":
+                x, y, z = parts[1:4]
+                vertices.append((float(x), float(y), float(z)))
+            elif tag == "f" or tag == "l":
+                count = len(vertices)
+                indices = [
+                    _obj_index(part, count) for part in parts[1:]
+                ]
+                (polygons if tag == "f" else lines).append(indices)
+
+    return Mesh.from_polygons(
+        np.array(vertices, dtype=np.float64).reshape(-1, 3), polygons, lines
+    )
+
+
+def _obj_index(part: str, count: int) -> int:
+    """ Индекс вершины из записи "v/vt/vn" (с 1, отрицательный - с конца) """
+    index = int(part.split("/", 1)[0])
+    return index - 1 if index > 0 else count + index
+
+
+# Типы свойств PLY
+_PLY_TYPES: Dict[str, str] = {
+    "char": "i1", "int8": "i1",
+    "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2",
+    "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4",
+    "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4",
+    "double": "f8", "float64": "f8",
+}
+
+
+def _ply_type(name: str, byte_order: str = "") -> np.dtype:
+    """ Тип numpy для типа свойства PLY """
+    try:
+        return np.dtype(byte_order + _PLY_TYPES[name])
+    except KeyError:
+        raise ValueError(f"Unknown PLY property type: {name!r}") from None
+
+
+class _PlyElement(object):
+    def __init__(self, name: str, count: int) -> None:
+        self.name: str = name
+        self.count: int = count
+
+        # (имя, тип) или (имя, тип длины, тип элементов) для списков
+        self.properties: List[Tuple[str, ...]] = []
+
+    def is_scalar(self) -> bool:
+        return all(len(prop) == 2 for prop in self.properties)
+
+    def dtype(self, byte_order: str) -> np.dtype:
+        return np.dtype([
+            (name, _ply_type(kind, byte_order))
+            for name, kind in self.properties
+        ])
+
+
+def load_ply(path: str) -> Mesh:
+    """
+    Загружает модель из файла PLY (ascii, binary_little_endian,
+    binary_big_endian): элементы vertex, face и edge
+
+    Ошибки в содержимом файла (неизвестный тип, нет нужного свойства,
+    файл оборван) приводят к ValueError
+    """
+    try:
+        return _load_ply(path)
+    except (KeyError, IndexError, StopIteration) as error:
+        raise ValueError(
+            f"Malformed PLY file: {type(error).__name__} {error}"
+        ) from error
+
+
+def _load_ply(path: str) -> Mesh:
+    with open(path, "rb") as file:
+        fmt, elements = _read_ply_header(file)
+
+        if fmt == "ascii":
+            tokens = iter(file.read().split())
+            data = {
+                element.name: _read_ply_ascii(tokens, element)
+                for element in elements
+            }
+        else:
+            byte_order = "<" if fmt == "binary_little_endian" else ">"
+            data = {
+                element.name: _read_ply_binary(file, element, byte_order)
+                for element in elements
+            }
+
+    if "vertex" not in data:
+        raise ValueError("PLY file has no vertex element")
+
+    vertex = data["vertex"]
+    vertices = np.stack(
+        [vertex[name].astype(np.float64) for name in ("x", "y", "z")], axis=1
+    )
+
+    polygons: List[Sequence[int]] = []
+    if "face" in data:
+        face = data["face"]
+        key = "vertex_indices" if "vertex_indices" in face \
+            else "vertex_index"
+        polygons = face[key]
+
+    lines: List[Sequence[int]] = []
+    if "edge" in data:
+        edge = data["edge"]
+        lines = np.stack((edge["vertex1"], edge["vertex2"]), axis=1)
+
+    return Mesh.from_polygons(vertices, polygons, lines)
+
+
+def _read_ply_header(file: BinaryIO) -> Tuple[str, List[_PlyElement]]:
+    if file.readline().strip() != b"ply":
+        raise ValueError("Not a PLY file")
+
+    fmt = ""
+    elements: List[_PlyElement] = []
+
+    for raw in file:
+        parts = raw.decode("ascii", errors="replace").split()
+        if not parts:
+            continue
+
+        tag = parts[0]
+        if tag == "format":
+            fmt = parts[1]
+        elif tag == "element":
+            elements.append(_PlyElement(parts[1], int(parts[2])))
+        elif tag == "property":
+            if parts[1] == "list":
+                prop = (parts[4], parts[2], parts[3])
+            else:
+                prop = (parts[2], parts[1])
+            # Неизвестный тип - ошибка уже при чтении заголовка
+            for kind in prop[1:]:
+                _ply_type(kind)
+            elements[-1].properties.append(prop)
+        elif tag == "end_header":
+            break
+
+    if fmt not in ("ascii", "binary_little_endian", "binary_big_endian"):
+        raise ValueError(f"Unsupported PLY format: {fmt!r}")
+
+    return fmt, elements
+
+
+def _read_ply_ascii(tokens, element: _PlyElement) -> Dict[str, object]:
+    if element.is_scalar():
+        count = element.count * len(element.properties)
+        values = np.array(
+            [float(next(tokens)) for _ in range(count)], dtype=np.float64
+        ).reshape(element.count, len(element.properties))
+        return {
+            prop[0]: values[:, i] for i, prop in enumerate(element.properties)
+        }
+
+    result: Dict[str, list] = {prop[0]: [] for prop in element.properties}
+    for _ in range(element.count):
+        for prop in element.properties:
+            if len(prop) == 2:
+                result[prop[0]].append(float(next(tokens)))
+            else:
+                size = int(next(tokens))
+                result[prop[0]].append(
+                    [int(next(tokens)) for _ in range(size)]
+                )
+    return result
+
+
+def _read_ply_binary(
+        file: BinaryIO, element: _PlyElement, byte_order: str
+) -> Dict[str, object]:
+    if element.is_scalar():
+        dtype = element.dtype(byte_order)
+        values = np.frombuffer(
+            file.read(dtype.itemsize * element.count), dtype=dtype
+        )
+        return {name: values[name] for name in dtype.names}
+
+    if len(element.properties) == 1:
+        lists = _read_ply_uniform_lists(file, element, byte_order)
+        if lists is not None:
+            return {element.properties[0][0]: lists}
+
+    result: Dict[str, list] = {prop[0]: [] for prop in element.properties}
+    for _ in range(element.count):
+        for prop in element.properties:
+            if len(prop) == 2:
+                kind = _ply_type(prop[1], byte_order)
+                result[prop[0]].append(
+                    np.frombuffer(file.read(kind.itemsize), dtype=kind)[0]
+                )
+            else:
+                size_kind = _ply_type(prop[1], byte_order)
+                item_kind = _ply_type(prop[2], byte_order)
+                size = int(np.frombuffer(
+                    file.read(size_kind.itemsize), dtype=size_kind
+                )[0])
+                result[prop[0]].append(
+                    np.frombuffer(
+                        file.read(item_kind.itemsize * size), dtype=item_kind
+                    )
+                )
+    return result
+
+
+def _read_ply_uniform_lists(
+        file: BinaryIO, element: _PlyElement, byte_order: str
+):
+    """
+    Быстрое чтение списков одинаковой длины (например, только
+    треугольников) одним вызовом frombuffer. Если длины разные,
+    возвращает None и оставляет позицию в файле прежней.
+    """
+    _, size_type, item_type = element.properties[0]
+    size_kind = _ply_type(size_type, byte_order)
+    item_kind = _ply_type(item_type, byte_order)
+
+    start = file.tell()
+    head = file.read(size_kind.itemsize)
+    if not element.count or len(head) < size_kind.itemsize:
+        file.seek(start)
+        return None
+
+    size = int(np.frombuffer(head, dtype=size_kind)[0])
+    dtype = np.dtype([("size", size_kind), ("items", item_kind, (size,))])
+
+    file.seek(start)
+    raw = file.read(dtype.itemsize * element.count)
+    if len(raw) == dtype.itemsize * element.count:
+        values = np.frombuffer(raw, dtype=dtype)
+        if np.all(values["size"] == size):
+            return values["items"].reshape(element.count, size)
+
+    file.seek(start)
+    return None
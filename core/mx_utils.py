@@ -1,6 +1,96 @@
 # coding: utf-8
 
-from core.matrix import Matrix
+"""
+Матрицы преобразований
+
+Функции get_matrix_* с параметрами принимают необязательную матрицу out,
+в которую записывается результат (без выделения памяти). Если параметры -
+массивы numpy из K значений, возвращается стопка из K матриц (MatrixStack).
+"""
+
+import numpy as np
+
+from core.matrix import Matrix, MatrixStack
+
+
+def _constant(values) -> Matrix:
+    """
+    Создает неизменяемую (только для чтения) матрицу: значения нельзя
+    ни изменить на месте, ни заменить через values
+    """
+    matrix = Matrix(input_values=values)
+    matrix.values.flags.writeable = False
+    return matrix
+
+
+# ---
+# Постоянные матрицы (создаются один раз при импорте модуля)
+
+# Единичная матрица
+EYE: Matrix = _constant([
+    [1, 0, 0, 0],
+    [0, 1, 0, 0],
+    [0, 0, 1, 0],
+    [0, 0, 0, 1]
+])
+
+# Отражение относительно оси yOz
+MATRIX_MX: Matrix = _constant([
+    [-1, 0, 0, 0],
+    [0, 1, 0, 0],
+    [0, 0, 1, 0],
+    [0, 0, 0, 1]
+])
+
+# Отражение относительно оси zOx
+MATRIX_MY: Matrix = _constant([
+    [1, 0, 0, 0],
+    [0, -1, 0, 0],
+    [0, 0, 1, 0],
+    [0, 0, 0, 1]
+])
+
+# Отражение относительно оси xOy
+MATRIX_MZ: Matrix = _constant([
+    [1, 0, 0, 0],
+    [0, 1, 0, 0],
+    [0, 0, -1, 0],
+    [0, 0, 0, 1]
+])
+
+# Проецирование на плоскость xOy
+MATRIX_PZ: Matrix = _constant([
+    [1, 0, 0, 0],
+    [0, 1, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 1]
+])
+
+
+def _eye_buffer(out, *params):
+    """
+    Подготавливает буфер для матрицы преобразования
+
+    Если out не задан, создается новая единичная матрица, а если среди
+    params есть массивы (K значений, скаляры повторяются), то стопка
+    из K единичных матриц. Если out задан, в него записывается
+    единичная матрица (без создания новых массивов).
+
+    :return: (out, значения out)
+    """
+    if out is None:
+        shape = np.broadcast(*params).shape
+        if not shape:
+            out = Matrix(input_values=EYE.values)
+        elif len(shape) == 1:
+            out = MatrixStack.identity(shape[0])
+        else:
+            raise ValueError(
+                f"Parameters must be scalars or 1-D arrays, got shape {shape}"
+            )
+    else:
+        np.copyto(out.values, EYE.values)
+    return out, out.values
 
 
 def get_eye() -> Matrix:
@@ -8,125 +98,87 @@ def get_eye() -> Matrix:
     Возвращает единичную матрицу
     :return:
     """
-    return Matrix(input_values=[
-        [1, 0, 0, 0],
-        [0, 1, 0, 0],
-        [0, 0, 1, 0],
-        [0, 0, 0, 1]
-    ])
+    return EYE
 
 
-def get_matrix_rx(c: float, s: float) -> Matrix:
+def get_matrix_rx(c: float, s: float, out: Matrix = None) -> Matrix:
     """ Поворот вокруг оси X """
 
-    rx_values = [
-        [1, 0, 0, 0],
-        [0, c, s, 0],
-        [0, -s, c, 0],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=rx_values)
+    out, values = _eye_buffer(out, c, s)
+    values[..., 1, 1] = c
+    values[..., 1, 2] = s
+    values[..., 2, 1] = -s
+    values[..., 2, 2] = c
+    return out
 
 
-def get_matrix_ry(c: float, s: float) -> Matrix:
+def get_matrix_ry(c: float, s: float, out: Matrix = None) -> Matrix:
     """ Поворот вокруг оси Y """
 
-    ry_values = [
-        [c, 0, -s, 0],
-        [0, 1, 0, 0],
-        [s, 0, c, 0],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=ry_values)
+    out, values = _eye_buffer(out, c, s)
+    values[..., 0, 0] = c
+    values[..., 0, 2] = -s
+    values[..., 2, 0] = s
+    values[..., 2, 2] = c
+    return out
 
 
-def get_matrix_rz(c: float, s: float) -> Matrix:
+def get_matrix_rz(c: float, s: float, out: Matrix = None) -> Matrix:
     """ Поворот вокруг Z """
 
-    rz_values = [
-        [c, s, 0, 0],
-        [-s, c, 0, 0],
-        [0, 0, 1, 0],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=rz_values)
+    out, values = _eye_buffer(out, c, s)
+    values[..., 0, 0] = c
+    values[..., 0, 1] = s
+    values[..., 1, 0] = -s
+    values[..., 1, 1] = c
+    return out
 
 
-def get_matrix_d(alpha: float, beta: float, gamma: float) -> Matrix:
+def get_matrix_d(
+        alpha: float, beta: float, gamma: float, out: Matrix = None
+) -> Matrix:
     """ Матрица растяжения (сжатия) """
 
-    d_values = [
-        [alpha, 0, 0, 0],
-        [0, beta, 0, 0],
-        [0, 0, gamma, 0],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=d_values)
+    out, values = _eye_buffer(out, alpha, beta, gamma)
+    values[..., 0, 0] = alpha
+    values[..., 1, 1] = beta
+    values[..., 2, 2] = gamma
+    return out
 
 
 def get_matrix_mx() -> Matrix:
     """ Отражение относительно оси yOz """
-
-    values = [
-        [-1, 0, 0, 0],
-        [0, 1, 0, 0],
-        [0, 0, 1, 0],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=values)
+    return MATRIX_MX
 
 
 def get_matrix_my() -> Matrix:
     """ Отражение относительно оси zOx """
-
-    values = [
-        [1, 0, 0, 0],
-        [0, -1, 0, 0],
-        [0, 0, 1, 0],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=values)
+    return MATRIX_MY
 
 
 def get_matrix_mz() -> Matrix:
     """ Отражение относительно оси xOy """
+    return MATRIX_MZ
 
-    values = [
-        [1, 0, 0, 0],
-        [0, 1, 0, 0],
-        [0, 0, -1, 0],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=values)
 
-
-def get_matrix_t(lam, mu, nu) -> Matrix:
+def get_matrix_t(lam, mu, nu, out: Matrix = None) -> Matrix:
     """ Перенос (сдвиг, смещение) на вектор (lam, mu, nu) """
 
-    values = [
-        [1, 0, 0, 0],
-        [0, 1, 0, 0],
-        [0, 0, 1, 0],
-        [lam, mu, nu, 1]
-    ]
-    return Matrix(input_values=values)
+    out, values = _eye_buffer(out, lam, mu, nu)
+    values[..., 3, 0] = lam
+    values[..., 3, 1] = mu
+    values[..., 3, 2] = nu
+    return out
 
 
 def get_matrix_pz() -> Matrix:
-    values = [
-        [1, 0, 0, 0],
-        [0, 1, 0, 0],
-        [0, 0, 0, 0],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=values)
-
-
-def get_matrix_p(c: float) -> Matrix:
-    values = [
-        [1, 0, 0, 0],
-        [0, 1, 0, 0],
-        [0, 0, 1, -1/c],
-        [0, 0, 0, 1]
-    ]
-    return Matrix(input_values=values)
+    """ Проецирование на плоскость xOy """
+    return MATRIX_PZ
+
+
+def get_matrix_p(c: float, out: Matrix = None) -> Matrix:
+    """ Центральное проецирование (c - расстояние до центра проекции) """
+
+    out, values = _eye_buffer(out, c)
+    values[..., 2, 3] = -1 / c
+    return out
@@ -0,0 +1,215 @@
+# coding: utf-8
+
+"""
+Облака точек, которые не обязаны помещаться в память
+
+Файл вершин открывается через np.memmap: .npy (np.load с mmap_mode)
+или "сырой" двоичный файл - координаты x, y, z подряд, одного типа
+(по умолчанию float32). Данные читаются с диска только по мере
+обращения к ним.
+
+Проецирование идет порциями по chunk точек: порция умножается на
+матрицу вида, точки перед камерой переводятся в пиксели, и количество
+точек в каждом пикселе добавляется в изображение-накопитель
+(np.bincount). Выделяемая память ограничена размером порции
+и изображения и не зависит от количества точек в файле.
+"""
+
+import os
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from core.clipping import NEAR_W
+from core.matrix import Matrix
+
+# Точек в порции
+CHUNK = 1 << 18
+
+# Расширения "сырых" двоичных файлов
+RAW_EXTENSIONS = (".bin", ".raw")
+
+# Цвет точек облака на изображении (RGB)
+CLOUD_COLOR = (0, 0, 0)
+
+
+def open_points(
+        path: str, dtype: np.dtype = np.float32, columns: int = 3
+) -> np.ndarray:
+    """
+    Открывает файл вершин без чтения в память
+
+    :param dtype: тип координат "сырого" файла (в .npy записан в файле)
+    :param columns: значений на точку в "сыром" файле (первые три -
+        x, y, z)
+    :return: массив N×columns (np.memmap)
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".npy":
+        points = np.load(path, mmap_mode="r")
+    elif extension in RAW_EXTENSIONS:
+        points = np.memmap(path, dtype=dtype, mode="r")
+        if points.size % columns:
+            raise ValueError(
+                f"Размер файла не кратен {columns} значениям {dtype}"
+            )
+        points = points.reshape(-1, columns)
+    else:
+        raise ValueError(f"Неизвестный формат облака точек: {extension}")
+
+    if points.ndim != 2 or points.shape[1] < 3:
+        raise ValueError(
+            f"Ожидается массив N×3 координат, получен {points.shape}"
+        )
+    return points
+
+
+def bin_points(
+        x: np.ndarray, y: np.ndarray, counts: np.ndarray
+) -> None:
+    """
+    Добавляет точки (x, y) в изображение-накопитель counts (H×W):
+    каждый пиксель считает попавшие в него точки. Точки за пределами
+    изображения (и NaN) отбрасываются
+    """
+    height, width = counts.shape
+    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+
+    index = y[inside].astype(np.int64)
+    index *= width
+    index += x[inside].astype(np.int64)
+
+    counts.reshape(-1)[:] += np.bincount(
+        index, minlength=width * height
+    ).astype(counts.dtype, copy=False)
+
+
+def density_image(
+        counts: np.ndarray,
+        color: Tuple[int, int, int] = CLOUD_COLOR,
+        out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Изображение плотности точек H×W×4 (RGBA): цвет color, прозрачность
+    растет с логарифмом количества точек в пикселе (один пиксель
+    с единственной точкой уже заметен)
+    """
+    height, width = counts.shape
+    if out is None:
+        out = np.empty((height, width, 4), dtype=np.uint8)
+    out[..., :3] = color
+
+    peak = counts.max() if counts.size else 0
+    if peak == 0:
+        out[..., 3] = 0
+        return out
+
+    # 1 точка -> 64, наибольшая плотность -> 255
+    alpha = np.log1p(counts, dtype=np.float32)
+    alpha *= 191 / np.log1p(np.float32(peak))
+    alpha += 64
+    alpha[counts == 0] = 0
+    out[..., 3] = alpha
+    return out
+
+
+class PointCloud(object):
+    """
+    Облако точек (массив N×3, обычно np.memmap), обрабатываемое
+    порциями по chunk точек
+    """
+
+    def __init__(self, points: np.ndarray, chunk: int = CHUNK) -> None:
+        self.points: np.ndarray = points
+        self.chunk: int = chunk
+
+    @classmethod
+    def open(
+            cls,
+            path: str,
+            dtype: np.dtype = np.float32,
+            columns: int = 3,
+            chunk: int = CHUNK
+    ) -> "PointCloud":
+        return cls(open_points(path, dtype, columns), chunk)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __str__(self) -> str:
+        return f"PointCloud ({len(self)} points, {self.points.dtype})"
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """ Порции координат x, y, z (представления, без копирования) """
+        for start in range(0, len(self.points), self.chunk):
+            yield self.points[start:start + self.chunk, :3]
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """ Наименьшие и наибольшие координаты (один проход по файлу) """
+        low = np.full(3, np.inf)
+        high = np.full(3, -np.inf)
+        for chunk in self.chunks():
+            np.minimum(low, chunk.min(axis=0), out=low)
+            np.maximum(high, chunk.max(axis=0), out=high)
+        return low, high
+
+    def fit_matrix(self, size: float) -> Matrix:
+        """
+        Матрица, переносящая облако в начало координат и
+        масштабирующая его так, что наибольший размер равен size
+        (как Mesh.fitted, но без изменения данных)
+        """
+        if not len(self):
+            return Matrix(input_values=np.eye(4))
+
+        low, high = self.bounds()
+        extent = float((high - low).max())
+        scale = size / extent if extent else 1
+
+        values = np.eye(4) * scale
+        values[3] = (*(-low * scale), 1)
+        return Matrix(input_values=values, copy=False)
+
+    def project(
+            self,
+            matrix: Matrix,
+            width: int,
+            height: int,
+            counts: Optional[np.ndarray] = None,
+            dtype: np.dtype = np.float32
+    ) -> np.ndarray:
+        """
+        Проецирует облако порциями и накапливает количество точек
+        в пикселях
+
+        :param matrix: матрица вида (точка-строка умножается справа)
+        :param counts: накопитель H×W (uint32), по умолчанию новый
+        :param dtype: тип вычислений над порцией
+        :return: накопитель counts
+        """
+        if counts is None:
+            counts = np.zeros((height, width), dtype=np.uint32)
+
+        values = matrix.values.astype(dtype, copy=False)
+        rotation = values[:3]
+        translation = values[3]
+
+        for chunk in self.chunks():
+            # Однородная координата точек равна 1: строка переноса
+            # прибавляется без расширения порции до N×4
+            homogeneous = np.asarray(chunk, dtype=dtype) @ rotation
+            homogeneous += translation
+
+            w = homogeneous[:, 3]
+            in_front = w >= NEAR_W
+            if not in_front.all():
+                homogeneous = homogeneous[in_front]
+                w = homogeneous[:, 3]
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x = homogeneous[:, 0] / w
+                y = homogeneous[:, 1] / w
+            bin_points(x, y, counts)
+
+        return counts
@@ -2,78 +2,114 @@
 
 import numpy as np
 from math import sqrt
+from typing import Dict, Iterator, List, Tuple
 
 from core.matrix import Matrix
 
 
 class Point2D(object):
-    def __init__(self, x: float = 0, y: float = 0):
-        self._x = x
-        self._y = y
+    """
+    Неизменяемая точка на плоскости
 
-    @property
-    def x(self) -> float:
-        return self._x
+    Координаты хранятся в слотах (без __dict__): экземпляр занимает
+    48 байт (CPython 3.11, 64 бит), прежний вариант со словарем
+    атрибутов занимал около 350 байт.
+    Точки можно использовать как ключи словарей и кэшей.
+    """
 
-    @x.setter
-    def x(self, value) -> None:
-        self._x = value
+    __slots__ = ("x", "y")
 
-    @property
-    def y(self) -> float:
-        return self._y
+    def __init__(self, x: float = 0, y: float = 0) -> None:
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
-    @y.setter
-    def y(self, value) -> None:
-        self._y = value
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), (self.x, self.y)
 
     def __str__(self) -> str:
-        return f"Point2D ({self._x}, {self._y})"
+        return f"Point2D ({self.x}, {self.y})"
+
+    def __repr__(self) -> str:
+        return f"Point2D({self.x!r}, {self.y!r})"
+
+    def __eq__(self, point) -> bool:
+        if type(point) is not type(self):
+            return NotImplemented
+        return self.x == point.x and self.y == point.y
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
 
     def __add__(self, point) -> "Point2D":
-        return Point2D(self._x + point.x, self._y + point.y)
+        return Point2D(self.x + point.x, self.y + point.y)
 
     def __sub__(self, point) -> "Point2D":
-        return Point2D(self._x - point.x, self._y - point.y)
+        return Point2D(self.x - point.x, self.y - point.y)
 
 
 class Point3D(Point2D):
-    def __init__(self, x: float = 0, y: float = 0, z: float = 0) -> None:
-        super().__init__(x, y)
+    """
+    Неизменяемая точка в пространстве
 
-        self._z: float = z
+    Экземпляр занимает 56 байт (три слота, без __dict__).
+    """
 
-    @property
-    def z(self) -> float:
-        return self._z
+    __slots__ = ("z",)
 
-    @z.setter
-    def z(self, value) -> None:
-        self._z = value
+    def __init__(self, x: float = 0, y: float = 0, z: float = 0) -> None:
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "z", z)
+
+    def __reduce__(self):
+        return type(self), (self.x, self.y, self.z)
 
     def __str__(self) -> str:
-        return f"Point3D ({self._x}; {self._y}; {self._z})"
+        return f"Point3D ({self.x}; {self.y}; {self.z})"
+
+    def __repr__(self) -> str:
+        return f"Point3D({self.x!r}, {self.y!r}, {self.z!r})"
 
     def to_2d_xy(self) -> Point2D:
-        return Point2D(self._x, self._y)
+        return Point2D(self.x, self.y)
 
     def get_prod(self, point) -> float:
         """ Скалярное произведение точек """
-        return self._x * point.x + self._y * point.y + self._z * point.z
+        return self.x * point.x + self.y * point.y + self.z * point.z
 
     def __mul__(self, matrix: Matrix) -> "Point3D":
-        v = np.array([self.x, self.y, self.z, 1])
-        result_matrix = np.dot(v, matrix.values)
+        x, y, z = self.x, self.y, self.z
+        (a0, a1, _, a3), (b0, b1, _, b3), (c0, c1, _, c3), \
+            (d0, d1, _, d3) = matrix.values.tolist()
+
+        w = x * a3 + y * b3 + z * c3 + d3
+        px = x * a0 + y * b0 + z * c0 + d0
+        py = x * a1 + y * b1 + z * c1 + d1
+        if w == 0:
+            # Точка в бесконечности: как и при вычислении в numpy,
+            # координаты inf/nan, а не ZeroDivisionError
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return Point3D(px / np.float64(w), py / np.float64(w), 1)
 
-        x, y, z, w = result_matrix
-        return Point3D(x, y, z).normalized(w)
+        return Point3D(px / w, py / w, 1)
 
     def __bool__(self) -> bool:
         return any((self.x, self.y, self.z))
 
-    def __eq__(self, point: "Point3D"):
+    def __eq__(self, point) -> bool:
+        if type(point) is not type(self):
+            return NotImplemented
         return self.x == point.x and self.y == point.y and self.z == point.z
 
+    def __hash__(self) -> int:
+        return hash((self.x, self.y, self.z))
+
     def __sub__(self, point: "Point3D") -> "Point3D":
         return Point3D(self.x - point.x, self.y - point.y, self.z - point.z)
 
@@ -95,7 +131,7 @@ class Point3D(Point2D):
 
     def module(self) -> float:
         """ Модуль вектора """
-        return sqrt(self._x * self._x + self._y * self._y + self._z * self._z)
+        return sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
 
     def cos_between(self, point: "Point3D") -> float:
         """
@@ -106,3 +142,218 @@ class Point3D(Point2D):
         #     return 0
         # return self.get_prod(point) / mul_modules
         return self.get_prod(point)
+
+
+class PointArray(object):
+    """
+    Набор именованных точек в однородных координатах
+
+    Координаты хранятся в одном массиве N×4 (x, y, z, w),
+    имя точки отображается в номер строки через `index`.
+    Преобразование всего набора выполняется одним матричным умножением.
+
+    Тип координат dtype - float64 или float32: для больших наборов
+    (модели, облака точек) float32 вдвое уменьшает память и объем
+    данных, проходящих через умножение. Матрица преобразования
+    приводится к типу набора (см. transform).
+    """
+
+    def __init__(
+            self, capacity: int = 16, dtype: np.dtype = np.float64
+    ) -> None:
+        # Однородные координаты (заполнены первые self._size строк)
+        self._values: np.ndarray = np.zeros((capacity, 4), dtype=dtype)
+
+        # Имя точки -> номер строки
+        self._index: Dict[str, int] = {}
+
+        # Количество занятых строк
+        self._size: int = 0
+
+        # Словарь имен разделяется с исходным набором (после transform)
+        self._shared_index: bool = False
+
+    @classmethod
+    def from_points(
+            cls,
+            points: Dict[str, Point3D],
+            dtype: np.dtype = np.float64
+    ) -> "PointArray":
+        """ Создает набор из словаря точек """
+        array = cls(capacity=max(len(points), 1), dtype=dtype)
+        for name, point in points.items():
+            array[name] = point
+        return array
+
+    @classmethod
+    def from_array(
+            cls,
+            xyz: np.ndarray,
+            names: List[str] = None,
+            dtype: np.dtype = np.float64
+    ) -> "PointArray":
+        """
+        Создает набор из массива координат N×3 (или N×4)
+
+        Если имена не заданы, точки остаются безымянными (например,
+        вершины модели): доступны только через values.
+        """
+        xyz = np.asarray(xyz)
+        size = xyz.shape[0]
+
+        array = cls(capacity=max(size, 1), dtype=dtype)
+        array._values[:size, :xyz.shape[1]] = xyz
+        if xyz.shape[1] == 3:
+            array._values[:size, 3] = 1
+        if names is not None:
+            array._index = {name: i for i, name in enumerate(names)}
+        array._size = size
+        return array
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __getitem__(self, name: str) -> Point3D:
+        x, y, z, _ = self._values[self._index[name]]
+        return Point3D(x, y, z)
+
+    def __setitem__(self, name: str, point: Point3D) -> None:
+        i = self._index.get(name)
+        if i is None:
+            i = self._append_row(name)
+        self._values[i] = (point.x, point.y, point.z, 1)
+
+    def _append_row(self, name: str) -> int:
+        if len(self._index) != self._size:
+            raise ValueError("Cannot add named points to an unnamed set")
+
+        if self._shared_index:
+            self._index = dict(self._index)
+            self._shared_index = False
+
+        if self._size == self._values.shape[0]:
+            # Увеличиваем буфер вдвое
+            values = np.zeros((2 * self._size, 4), dtype=self._values.dtype)
+            values[:self._size] = self._values[:self._size]
+            self._values = values
+
+        i = self._size
+        self._index[name] = i
+        self._size += 1
+        return i
+
+    @property
+    def values(self) -> np.ndarray:
+        """ Однородные координаты всех точек (N×4) """
+        return self._values[:self._size]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._values.dtype
+
+    @property
+    def index(self) -> Dict[str, int]:
+        return self._index
+
+    def names(self) -> List[str]:
+        return list(self._index)
+
+    def items(self) -> Iterator[Tuple[str, Point3D]]:
+        for name in self._index:
+            yield name, self[name]
+
+    def transform(self, matrix: Matrix, divide: bool = True) -> "PointArray":
+        """
+        Применяет матрицу преобразования ко всем точкам
+
+        Выполняется одно умножение N×4 на 4×4 и деление на w
+        для всех точек сразу. Результат - новый набор с теми же именами.
+        При divide=False деления нет: точки остаются в однородных
+        координатах (нужно, например, для отсечения до деления на w).
+        Результат имеет тип набора: матрица другого типа приводится
+        к нему (4×4 - дешевле, чем приводить точки).
+        """
+        result = PointArray(capacity=max(self._size, 1), dtype=self.dtype)
+        values = result._values[:self._size]
+
+        np.dot(
+            self.values,
+            matrix.values.astype(self.dtype, copy=False),
+            out=values
+        )
+        if divide:
+            _divide_by_w(values)
+        return self._with_values(result)
+
+    def divided(self) -> "PointArray":
+        """
+        Новый набор, поделенный на w (для набора в однородных
+        координатах после transform(..., divide=False) - без повторного
+        умножения на матрицу)
+        """
+        result = PointArray(capacity=max(self._size, 1), dtype=self.dtype)
+        values = result._values[:self._size]
+        np.copyto(values, self.values)
+        _divide_by_w(values)
+        return self._with_values(result)
+
+    def _with_values(self, result: "PointArray") -> "PointArray":
+        """ Набор result (новые координаты) с теми же именами точек """
+        # Имена не копируются: словарь общий до первого добавления точки
+        result._index = self._index
+        result._shared_index = self._shared_index = True
+        result._size = self._size
+        return result
+
+    def xy(self) -> np.ndarray:
+        """ Координаты x, y всех точек (N×2) """
+        return self.values[:, :2]
+
+
+def _divide_by_w(values: np.ndarray) -> None:
+    """ Делит однородные координаты N×4 на w (на месте) """
+    # Делитель копируется (N×1): иначе NumPy, видя пересечение
+    # аргумента с результатом, копирует весь массив N×4
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values /= values[:, 3:].copy()
+
+
+# Единица округления float32
+FLOAT32_UNIT = 2.0 ** -24
+
+
+def float32_error_bound(
+        points: np.ndarray, values: np.ndarray, exact: np.ndarray
+) -> np.ndarray:
+    """
+    Оценка погрешности экранных координат x, y, вычисленных
+    PointArray.transform в float32 (N×2)
+
+    Скалярное произведение четырех слагаемых (с учетом округления
+    исходных координат) ошибается не больше чем на
+    6u * sum |p_i * M_ij|, u = 2^-24, а деление на w добавляет
+    относительную ошибку w и еще одно округление. С запасом:
+
+        |x32 - x64| <= 8u * (Sx + |x| * Sw) / |w| + u * |x|
+
+    где Sx = sum |p_i * M_i0|, Sw = sum |p_i * M_i3|.
+
+    :param points: однородные координаты точек N×4 (float64)
+    :param values: матрица преобразования 4×4 (float64)
+    :param exact: экранные координаты N×4 или N×2 в float64
+        (после деления на w)
+    """
+    magnitude = np.abs(points) @ np.abs(values)
+    w = np.abs(points @ values[:, 3])
+    xy = np.abs(exact[:, :2])
+    return (
+        8 * FLOAT32_UNIT * (magnitude[:, :2] + xy * magnitude[:, 3:])
+        / w[:, None]
+        + FLOAT32_UNIT * xy
+    )
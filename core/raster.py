@@ -0,0 +1,363 @@
+# coding: utf-8
+
+"""
+Программная растеризация с z-буфером: удаление невидимых линий
+
+Точки переводятся на экран матрицей вида с глубиной
+(ViewTransform.matrix(..., depth=True)): x, y - пиксели, z / w -
+глубина (больше - ближе к камере), линейная вдоль экрана.
+
+1. Треугольники граней закрашиваются в z-буфер: в каждом пикселе
+   остается глубина ближайшей грани.
+2. Ребра проходятся с шагом в пиксель; точка ребра видима, если
+   она не дальше глубины в z-буфере (с допуском bias).
+3. Видимые точки ребер дают изображение RGBA (H×W×4, uint8).
+
+Все шаги векторные: кандидаты-пиксели всех треугольников (их
+ограничивающих прямоугольников) и точки всех ребер обрабатываются
+массивами NumPy, порциями не больше chunk элементов.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.clipping import NEAR_W, clip_parameters, project_edges
+
+# Цвет видимых линий (RGBA)
+LINE_COLOR: Tuple[int, int, int, int] = (128, 128, 128, 255)
+
+
+class Rasterizer(object):
+    """ Z-буфер размера width×height и растеризация в него """
+
+    def __init__(
+            self, width: int, height: int, chunk: int = 1 << 21
+    ) -> None:
+        # Наибольшее число пикселей-кандидатов, обрабатываемых за раз
+        self.chunk: int = chunk
+
+        self.width: int = 0
+        self.height: int = 0
+        self.depth: np.ndarray = np.empty(0)
+        self.resize(width, height)
+
+    def resize(self, width: int, height: int) -> None:
+        if (width, height) != (self.width, self.height):
+            self.width, self.height = width, height
+            self.depth = np.empty(width * height)
+        self.clear()
+
+    def clear(self) -> None:
+        """ Пустой z-буфер: все пиксели бесконечно далеко """
+        self.depth.fill(-np.inf)
+
+    def depth_image(self) -> np.ndarray:
+        """ Z-буфер в виде массива H×W """
+        return self.depth.reshape(self.height, self.width)
+
+    def draw_triangles(self, triangles: np.ndarray) -> None:
+        """
+        Закрашивает треугольники F×3×3 (вершины x, y, z на экране)
+        в z-буфер
+
+        Пиксель (i, j) принадлежит треугольнику, если его центр
+        (i + 0.5, j + 0.5) лежит внутри (или на границе).
+        """
+        # Координаты вершин - массивы 3×F (вершина, треугольник)
+        x, y, z = np.ascontiguousarray(
+            np.asarray(triangles, dtype=np.float64).transpose(2, 1, 0)
+        )
+
+        # Ограничивающие прямоугольники в пикселях (по центрам)
+        x0 = np.maximum(np.ceil(x.min(axis=0) - 0.5), 0)
+        x1 = np.minimum(np.floor(x.max(axis=0) - 0.5), self.width - 1)
+        y0 = np.maximum(np.ceil(y.min(axis=0) - 0.5), 0)
+        y1 = np.minimum(np.floor(y.max(axis=0) - 0.5), self.height - 1)
+
+        bw = np.maximum(x1 - x0 + 1, 0)
+        bh = np.maximum(y1 - y0 + 1, 0)
+
+        # Удвоенная ориентированная площадь; вырожденные треугольники
+        # пикселей не дают
+        area = (x[1] - x[0]) * (y[2] - y[0]) - (x[2] - x[0]) * (y[1] - y[0])
+        keep = (bw * bh > 0) & (area != 0) & np.isfinite(z).all(axis=0)
+        if not keep.any():
+            return
+
+        coefficients = self.plane_coefficients(
+            x[:, keep], y[:, keep], z[:, keep], area[keep]
+        )
+        x0 = x0[keep].astype(np.int64)
+        y0 = y0[keep].astype(np.int64)
+        bw = bw[keep].astype(np.int64)
+        bh = bh[keep].astype(np.int64)
+
+        for size, part in self.size_classes(np.maximum(bw, bh)):
+            if size:
+                self.fill_stencil(
+                    coefficients[:, part], x0[part], y0[part],
+                    bw[part], bh[part], size
+                )
+            else:
+                self.fill(
+                    coefficients[:, part], x0[part], y0[part],
+                    bw[part], bh[part]
+                )
+
+    def size_classes(self, sizes: np.ndarray, limit: int = 16):
+        """
+        Делит элементы по размеру (в пикселях) на классы 1, 2, 4, ...,
+        limit и порции не больше chunk кандидатов; возвращает пары
+        (размер класса, индексы). Элементы крупнее limit идут
+        с размером 0 - их пиксели перебираются поштучно (см. fill)
+
+        Внутри класса все элементы обрабатываются квадратом
+        size×size - массивами одной формы, без поэлементной раскладки.
+        """
+        lower = 0
+        size = 1
+        while size <= limit:
+            index = np.flatnonzero((sizes > lower) & (sizes <= size))
+            step = max(self.chunk // (size * size), 1)
+            for start in range(0, len(index), step):
+                yield size, index[start:start + step]
+            lower = size
+            size *= 2
+
+        index = np.flatnonzero(sizes > lower)
+        if len(index):
+            counts = sizes[index] ** 2
+            for part in self.chunks(counts):
+                yield 0, index[part]
+
+    @staticmethod
+    def plane_coefficients(
+            x: np.ndarray, y: np.ndarray, z: np.ndarray, area: np.ndarray
+    ) -> np.ndarray:
+        """
+        Коэффициенты линейных функций экрана для треугольников
+        (координаты вершин x, y, z - массивы 3×F): 12×F
+
+        Для каждой из трех барицентрических координат и для глубины -
+        тройка (a, b, c): f(px, py) = a * px + b * py + c. Пиксель внутри
+        треугольника, если все три барицентрические координаты >= 0.
+        """
+        coefficients = np.empty((12, len(area)))
+        depth = coefficients[9:]
+        depth.fill(0)
+
+        # Барицентрическая координата вершины k - функция ребра
+        # напротив нее, деленная на площадь
+        for k in range(3):
+            i = (k + 1) % 3
+            j = (k + 2) % 3
+            coefficients[3 * k] = (y[i] - y[j]) / area
+            coefficients[3 * k + 1] = (x[j] - x[i]) / area
+            coefficients[3 * k + 2] = (x[i] * y[j] - x[j] * y[i]) / area
+
+            depth += coefficients[3 * k:3 * k + 3] * z[k]
+        return coefficients
+
+    def chunks(self, counts: np.ndarray):
+        """ Срезы, делящие элементы на порции не больше chunk кандидатов """
+        total = np.cumsum(counts)
+        start = 0
+        while start < len(counts):
+            done = total[start - 1] if start else 0
+            stop = int(np.searchsorted(total, done + self.chunk, "right"))
+            stop = max(stop, start + 1)
+            yield slice(start, stop)
+            start = stop
+
+    def fill_stencil(
+            self,
+            coefficients: np.ndarray,
+            x0: np.ndarray,
+            y0: np.ndarray,
+            bw: np.ndarray,
+            bh: np.ndarray,
+            size: int
+    ) -> None:
+        """
+        Закрашивает треугольники не больше size×size пикселей:
+        кандидаты - массив size×size×F (строка, столбец, треугольник)
+        """
+        offsets = np.arange(size)[:, np.newaxis]
+        px = x0 + offsets
+        py = y0 + offsets
+        cx = px + 0.5
+        cy = py + 0.5
+
+        inside = (offsets < bh)[:, np.newaxis] & (offsets < bw)
+        for k in range(0, 9, 3):
+            a, b, c = coefficients[k:k + 3]
+            inside &= (a * cx) + (b * cy + c)[:, np.newaxis] >= 0
+
+        a, b, c = coefficients[9:]
+        z = (a * cx) + (b * cy + c)[:, np.newaxis]
+        index = (py * self.width)[:, np.newaxis] + px
+        np.maximum.at(self.depth, index[inside], z[inside])
+
+    def fill(
+            self,
+            coefficients: np.ndarray,
+            x0: np.ndarray,
+            y0: np.ndarray,
+            bw: np.ndarray,
+            bh: np.ndarray
+    ) -> None:
+        """ Закрашивает крупные треугольники: кандидаты перебираются списком """
+        counts = bw * bh
+        owner = np.repeat(np.arange(len(counts)), counts)
+
+        # Номер пикселя внутри прямоугольника своего треугольника
+        offsets = np.cumsum(counts) - counts
+        local = np.arange(len(owner)) - offsets[owner]
+
+        width = bw[owner]
+        px = x0[owner] + local % width
+        py = y0[owner] + local // width
+
+        cx = px + 0.5
+        cy = py + 0.5
+        c = coefficients[:, owner]
+
+        inside = (c[0] * cx + c[1] * cy + c[2]) >= 0
+        inside &= (c[3] * cx + c[4] * cy + c[5]) >= 0
+        inside &= (c[6] * cx + c[7] * cy + c[8]) >= 0
+
+        c = c[:, inside]
+        z = c[9] * cx[inside] + c[10] * cy[inside] + c[11]
+        index = py[inside] * self.width + px[inside]
+        np.maximum.at(self.depth, index, z)
+
+    def visible_edge_pixels(
+            self, lines: np.ndarray, bias: float
+    ) -> np.ndarray:
+        """
+        Номера пикселей (в z-буфере) видимых точек отрезков E×6
+        (x1, y1, z1, x2, y2, z2), уже отсеченных по границам экрана
+        """
+        start = lines[:, :3].T
+        delta = lines[:, 3:].T - start
+
+        # Точки ребра - с шагом не больше пикселя
+        counts = np.ceil(np.abs(delta[:2]).max(axis=0)).astype(np.int64) + 1
+
+        pixels = []
+        for size, part in self.size_classes(counts, limit=64):
+            if size:
+                steps = np.arange(size)[:, np.newaxis]
+                valid = steps < counts[part]
+            else:
+                steps = np.arange(counts[part].max())[:, np.newaxis]
+                valid = steps < counts[part]
+            t = steps / np.maximum(counts[part] - 1, 1)
+
+            x, y, z = start[:, part, np.newaxis] \
+                + delta[:, part, np.newaxis] * t.T[np.newaxis]
+            px = np.minimum(x.astype(np.int64), self.width - 1)
+            py = np.minimum(y.astype(np.int64), self.height - 1)
+            index = (py * self.width + px).T
+
+            valid &= z.T >= self.depth[index] - bias
+            pixels.append(index[valid])
+
+        if not pixels:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(pixels)
+
+
+def clip_lines_3d(
+        lines: np.ndarray, rect: Tuple[float, float, float, float]
+) -> np.ndarray:
+    """
+    Отсекает отрезки E×6 (x1, y1, z1, x2, y2, z2) прямоугольником
+    экрана; глубина интерполируется вместе с x, y
+    """
+    xmin, ymin, xmax, ymax = rect
+    x = lines[:, 0::3]
+    y = lines[:, 1::3]
+
+    # Все отрезки целиком на экране - отсекать нечего
+    if x.min(initial=xmin) >= xmin and x.max(initial=xmax) <= xmax \
+            and y.min(initial=ymin) >= ymin and y.max(initial=ymax) <= ymax:
+        return lines
+
+    t0, t1, visible = clip_parameters(lines[:, [0, 1, 3, 4]], rect)
+    lines = lines[visible]
+    start = lines[:, :3]
+    delta = lines[:, 3:] - start
+    return np.hstack([
+        start + t0[visible, np.newaxis] * delta,
+        start + t1[visible, np.newaxis] * delta
+    ])
+
+
+def render_hidden_lines(
+        points: np.ndarray,
+        edges: np.ndarray,
+        faces: np.ndarray,
+        width: int,
+        height: int,
+        rasterizer: Optional[Rasterizer] = None,
+        color: Tuple[int, int, int, int] = LINE_COLOR,
+        bias: Optional[float] = None,
+        out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Изображение RGBA (H×W×4, uint8) видимых ребер модели
+
+    :param points: вершины после матрицы вида с глубиной - однородные
+        координаты N×4 (до деления на w)
+    :param edges: ребра - пары индексов вершин E×2
+    :param faces: треугольники - тройки индексов вершин F×3
+    :param rasterizer: z-буфер для повторного использования
+    :param bias: допуск глубины; по умолчанию 1% от разброса глубины
+    :param out: изображение для результата (непрерывный массив
+        H×W×4 uint8, например Framebuffer.array); по умолчанию новое
+    """
+    if out is None:
+        out = np.zeros((height, width, 4), dtype=np.uint8)
+    elif out.shape != (height, width, 4) or out.dtype != np.uint8 \
+            or not out.flags.c_contiguous:
+        raise ValueError(
+            f"out must be a contiguous {height}x{width}x4 uint8 array"
+        )
+    else:
+        out.fill(0)
+
+    if rasterizer is None:
+        rasterizer = Rasterizer(width, height)
+    else:
+        rasterizer.resize(width, height)
+
+    # Грани с вершинами позади ближней плоскости пропускаются,
+    # ребра - отсекаются ею
+    w = points[:, 3]
+    in_front = w >= NEAR_W
+    with np.errstate(divide="ignore", invalid="ignore"):
+        screen = points[:, :3] / points[:, 3:]
+
+    if len(faces):
+        if in_front.all():
+            rasterizer.draw_triangles(screen[faces])
+        else:
+            visible_faces = in_front[faces].all(axis=1)
+            rasterizer.draw_triangles(screen[faces[visible_faces]])
+
+    if in_front.all():
+        lines = screen[edges].reshape(-1, 6)
+    else:
+        lines, visible = project_edges(points, edges, dims=3)
+        lines = lines[visible]
+    lines = clip_lines_3d(lines, (0, 0, width, height))
+
+    if bias is None:
+        z = screen[in_front, 2]
+        bias = 0.01 * float(np.ptp(z)) if len(z) else 0.0
+
+    # Представление той же памяти: out непрерывен
+    out.reshape(-1, 4)[rasterizer.visible_edge_pixels(lines, bias)] = color
+    return out
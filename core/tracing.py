@@ -0,0 +1,204 @@
+# coding: utf-8
+
+"""
+Трассировка этапов кадра
+
+Этапы (пересчет точек, перерисовка "полотна", копирование на экран)
+оборачиваются в интервалы::
+
+    with TRACER.span("update_pixmap"):
+        ...
+
+Пока трассировка выключена (TRACER.enabled = False), span возвращает
+общий пустой контекст: проверка флага и вызов функции, без замеров
+времени и выделения памяти.
+
+Включенная трассировка хранит последние интервалы (кольцевой буфер
+events) и суммы времени этапов по последним кадрам (кольцевой буфер
+frames). Кадр завершается вызовом mark_frame. Интервалы
+выгружаются в формате Chrome trace-event (chrome://tracing, Perfetto).
+"""
+
+import os
+import threading
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+# Размеры кольцевых буферов: кадры и интервалы
+TRACE_FRAMES = 120
+TRACE_EVENTS = 10000
+
+# Окно расчета частоты кадров (с)
+FPS_WINDOW = 1.0
+
+_NULL_SPAN = nullcontext()
+
+
+class Event(NamedTuple):
+    """ Интервал: имя, категория, начало и длительность (с) """
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread: int
+    args: Optional[Dict[str, Any]]
+
+
+class Frame(NamedTuple):
+    """ Кадр: время завершения (с) и суммарное время этапов (с) """
+
+    end: float
+    stages: Dict[str, float]
+
+
+class Span(object):
+    """ Замер одного интервала (контекстный менеджер) """
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(
+            self,
+            tracer: "Tracer",
+            name: str,
+            category: str,
+            args: Optional[Dict[str, Any]]
+    ) -> None:
+        self.tracer: Tracer = tracer
+        self.name: str = name
+        self.category: str = category
+        self.args: Optional[Dict[str, Any]] = args
+        self.start: float = 0
+
+    def __enter__(self) -> "Span":
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tracer.record(
+            self.name, self.category, self.start,
+            perf_counter() - self.start, self.args
+        )
+
+
+class Tracer(object):
+    """
+    Трассировщик: интервалы этапов и кадры
+
+    - `events` - последние интервалы (для выгрузки в trace-event JSON)
+    - `frames` - последние кадры: суммарное время каждого этапа
+    """
+
+    def __init__(
+            self, frames: int = TRACE_FRAMES, events: int = TRACE_EVENTS
+    ) -> None:
+        self.enabled: bool = False
+
+        self.events: Deque[Event] = deque(maxlen=events)
+        self.frames: Deque[Frame] = deque(maxlen=frames)
+
+        # Время этапов текущего (незавершенного) кадра
+        self._stages: Dict[str, float] = {}
+
+        # Начало отсчета времени в выгрузке
+        self._origin: float = perf_counter()
+
+    def span(
+            self,
+            name: str,
+            category: str = "stage",
+            args: Optional[Dict[str, Any]] = None
+    ):
+        """ Интервал этапа name (пустой контекст, если выключено) """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category, args)
+
+    def record(
+            self,
+            name: str,
+            category: str,
+            start: float,
+            duration: float,
+            args: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """ Добавляет замеренный интервал """
+        self.events.append(Event(
+            name, category, start, duration, threading.get_ident(), args
+        ))
+        self._stages[name] = self._stages.get(name, 0) + duration
+
+    def mark_frame(self) -> None:
+        """
+        Завершает кадр: время этапов уходит в буфер кадров.
+        Кадр без единого интервала (ничего не пересчитывалось
+        и не рисовалось) не учитывается
+        """
+        if not self.enabled or not self._stages:
+            return
+        now = perf_counter()
+        self.frames.append(Frame(now, self._stages))
+        self._stages = {}
+        self.events.append(Event(
+            "frame", "frame", now, 0, threading.get_ident(), None
+        ))
+
+    def clear(self) -> None:
+        self.events.clear()
+        self.frames.clear()
+        self._stages = {}
+
+    def fps(self) -> float:
+        """ Частота кадров за последние FPS_WINDOW секунд """
+        if not self.frames:
+            return 0
+        last = self.frames[-1].end
+        recent = [f.end for f in self.frames if last - f.end <= FPS_WINDOW]
+        if len(recent) < 2:
+            return 0
+        return (len(recent) - 1) / (recent[-1] - recent[0])
+
+    def stage_times(self) -> Dict[str, float]:
+        """ Среднее время этапов на кадр по буферу кадров (с) """
+        total: Dict[str, float] = {}
+        for frame in self.frames:
+            for name, duration in frame.stages.items():
+                total[name] = total.get(name, 0) + duration
+        count = max(len(self.frames), 1)
+        return {name: duration / count for name, duration in total.items()}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """ Интервалы в формате Chrome trace-event (время в мкс) """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        for event in self.events:
+            item = {
+                "name": event.name,
+                "cat": event.category,
+                "ts": (event.start - self._origin) * 1e6,
+                "pid": pid,
+                "tid": event.thread,
+            }
+            if event.category == "frame":
+                item.update(ph="i", s="p")
+            else:
+                item.update(ph="X", dur=event.duration * 1e6)
+            if event.args:
+                item["args"] = event.args
+            events.append(item)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome(self, path: str) -> None:
+        """ Сохраняет интервалы в JSON (chrome://tracing, Perfetto) """
+        # json нужен только при выгрузке, а модуль импортируется при
+        # запуске программы
+        import json
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
+
+
+# Трассировщик программы
+TRACER = Tracer()
@@ -0,0 +1,213 @@
+# coding: utf-8
+
+from functools import lru_cache
+from math import sqrt
+from typing import Dict, Tuple
+
+import numpy as np
+
+from core.matrix import Matrix, MatrixStack
+from core.mx_utils import *
+
+
+class ViewTransform(object):
+    """
+    Итоговая матрица вида для аксонометрического чертежа
+
+    Матрица равна произведению Rz(phi) * Rx(psi) * Mx [* P] * Pz * T,
+    но вычисляется сразу в замкнутом виде, без промежуточных матриц.
+    Результаты запоминаются (не более maxsize последних наборов
+    параметров), поэтому повторные положения ползунков берутся из кэша.
+
+    При depth=True проецирование Pz не применяется: третий столбец
+    сохраняет глубину точки z (чем больше z, тем ближе точка к камере).
+    После деления на w величина z / w линейна вдоль экрана и при
+    центральном проецировании, поэтому ее можно интерполировать
+    при растеризации (см. core.raster).
+
+    Для заранее известной траектории камеры (анимация) матрицы
+    строятся одной стопкой (preload) и дальше отдаются matrix()
+    без вычислений, пока не будут сброшены (clear_preloaded).
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._compile = lru_cache(maxsize=maxsize)(self._build)
+
+        # Заранее построенные матрицы: параметры matrix() -> матрица
+        self._preloaded: Dict[Tuple, Matrix] = {}
+
+    def matrix(
+            self,
+            camera: Tuple[float, float, float],
+            central: bool,
+            width: int,
+            height: int,
+            depth: bool = False
+    ) -> Matrix:
+        """
+        Возвращает матрицу вида
+
+        :param camera: координаты камеры (x, y, z)
+        :param central: центральное (True) или ортогональное проецирование
+        :param width: ширина области вывода
+        :param height: высота области вывода
+        :param depth: сохранять глубину в третьем столбце (без Pz)
+
+        Возвращаемая матрица общая для всех обращений с теми же
+        параметрами и доступна только для чтения.
+        """
+        x, y, z = camera
+        key = (x, y, z, central, width, height, depth)
+        matrix = self._preloaded.get(key)
+        if matrix is not None:
+            return matrix
+        return self._compile(*key)
+
+    def preload(
+            self,
+            cameras: np.ndarray,
+            central: bool,
+            width: int,
+            height: int,
+            depth: bool = False
+    ) -> MatrixStack:
+        """
+        Строит матрицы вида для K положений камеры одной стопкой
+        (stack) и запоминает их: matrix() с теми же параметрами
+        возвращает готовую матрицу из стопки
+
+        :param cameras: координаты камер (массив K×3)
+        :return: стопка матриц
+        """
+        stack = self.stack(cameras, central, width, height, depth)
+        stack.values.flags.writeable = False
+
+        for i, (x, y, z) in enumerate(np.asarray(cameras).tolist()):
+            self._preloaded[(x, y, z, central, width, height, depth)] = \
+                stack[i]
+        return stack
+
+    def clear_preloaded(self) -> None:
+        self._preloaded.clear()
+
+    def cache_info(self):
+        return self._compile.cache_info()
+
+    def cache_clear(self) -> None:
+        self._compile.cache_clear()
+
+    @staticmethod
+    def angles(x: float, y: float, z: float) -> Tuple[float, ...]:
+        """
+        Косинусы и синусы углов phi и psi для камеры (x, y, z),
+        а также расстояние от камеры до начала координат
+        """
+        sqrt_xy: float = sqrt(x * x + y * y)
+        sqrt_xyz: float = sqrt(x * x + y * y + z * z)
+
+        if sqrt_xyz == 0:
+            raise ValueError("Камера в начале координат")
+
+        if sqrt_xy == 0:
+            sin_phi = 0
+            cos_phi = 1
+        else:
+            cos_phi = y / sqrt_xy
+            sin_phi = x / sqrt_xy
+
+        cos_psi: float = z / sqrt_xyz
+        sin_psi: float = sqrt_xy / sqrt_xyz
+
+        return cos_phi, sin_phi, cos_psi, sin_psi, sqrt_xyz
+
+    @staticmethod
+    def stack(
+            cameras: np.ndarray,
+            central: bool,
+            width: int,
+            height: int,
+            depth: bool = False
+    ) -> MatrixStack:
+        """
+        Матрицы вида сразу для K положений камеры
+
+        :param cameras: координаты камер (массив K×3)
+        :param depth: сохранять глубину в третьем столбце (без Pz)
+        :return: стопка из K матриц (та же матрица, что и matrix(),
+            для каждой камеры)
+
+        Матрицы строятся теми же функциями mx_utils, что и при пошаговом
+        вычислении, но для массивов косинусов и синусов.
+        """
+        cameras = np.asarray(cameras, dtype=np.float64)
+        x, y, z = cameras[:, 0], cameras[:, 1], cameras[:, 2]
+
+        sqrt_xy: np.ndarray = np.hypot(x, y)
+        sqrt_xyz: np.ndarray = np.sqrt(x * x + y * y + z * z)
+
+        if not np.all(sqrt_xyz):
+            raise ValueError("Камера в начале координат")
+
+        # Если камера на оси Z, phi = 0
+        on_axis = sqrt_xy == 0
+        safe_xy = np.where(on_axis, 1, sqrt_xy)
+        cos_phi = np.where(on_axis, 1, y / safe_xy)
+        sin_phi = np.where(on_axis, 0, x / safe_xy)
+
+        cos_psi = z / sqrt_xyz
+        sin_psi = sqrt_xy / sqrt_xyz
+
+        product: MatrixStack = get_matrix_rz(cos_phi, sin_phi)
+        product *= get_matrix_rx(cos_psi, sin_psi)
+        product *= get_matrix_mx()
+
+        if central:
+            product *= get_matrix_p(sqrt_xyz)
+
+        if not depth:
+            product *= get_matrix_pz()
+        product *= get_matrix_t(width // 2, height // 2, 0)
+        return product
+
+    @classmethod
+    def _build(
+            cls,
+            x: float,
+            y: float,
+            z: float,
+            central: bool,
+            width: int,
+            height: int,
+            depth: bool = False
+    ) -> Matrix:
+        c1, s1, c2, s2, dist = cls.angles(x, y, z)
+
+        # Перенос в центр области вывода
+        lam: int = width // 2
+        mu: int = height // 2
+
+        # Столбец w: при центральном проецировании это третий
+        # столбец Rz * Rx * Mx, умноженный на -1/dist
+        if central:
+            w0 = -s1 * s2 / dist
+            w1 = -c1 * s2 / dist
+            w2 = -c2 / dist
+        else:
+            w0 = w1 = w2 = 0
+
+        # Первые два столбца Rz * Rx * Mx, сдвинутые на T,
+        # третий обнулен проецированием Pz
+        values = np.array([
+            [-c1 + lam * w0, s1 * c2 + mu * w0, 0, w0],
+            [s1 + lam * w1, c1 * c2 + mu * w1, 0, w1],
+            [lam * w2, -s2 + mu * w2, 0, w2],
+            [lam, mu, 0, 1]
+        ], dtype=np.float64)
+
+        # Без Pz третий столбец - третий столбец Rz * Rx * Mx
+        if depth:
+            values[:3, 2] = s1 * s2, c1 * s2, c2
+
+        matrix = Matrix(input_values=values, copy=False)
+        matrix.values.flags.writeable = False
+        return matrix
@@ -1,24 +1,70 @@
 # coding: utf-8
 
-from typing import Dict, Callable
+from time import perf_counter
+from typing import Dict, Callable, Hashable, Optional
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+import numpy as np
+
+from PyQt5 import QtCore, QtGui, QtWidgets, sip
+
+from core.tracing import TRACER
+from gui.base.framebuffer import Framebuffer
+from gui.base.label_cache import LabelCache
+from gui.base.qt_arrays import to_line_array, to_point_array
 
 
 class BasePlaneSystem:
     """
     Базовый класс для систем координат
 
+    Чертеж рисуется в два слоя:
+
+    - фон (рамка и оси) - хранится отдельно и перерисовывается, только
+      если изменился размер или ключ фона (`background_key()`),
+      например при смене положения камеры;
+    - чертеж (линии и точки) - рисуется поверх фона, только если после
+      update_plane "полотно" устарело (флаг dirty). Обычная перерисовка
+      виджета лишь копирует готовое "полотно".
+
     Необходимо переопределить следующие методы:
 
-    - `update_pixmap()`
+    - `draw_background()`
+    - `draw_foreground()`
+    - `background_key()`
+
+    Если виджет не задан (widget=None), система координат рисует
+    в QImage размера size - так чертеж можно получить без окна.
+
+    Кроме именованных точек (update_plane), чертеж может содержать
+    массивы отрезков и точек (set_line_array, set_point_array). Они
+    хранятся в sip.array и рисуются одним вызовом drawLines/drawPoints
+    (см. draw_arrays и gui.base.qt_arrays).
+
+    Система координат может владеть изображением RGBA в памяти NumPy
+    (enable_framebuffer, см. gui.base.framebuffer): draw_framebuffer
+    пишет пиксели прямо в массив, и изображение рисуется между фоном и
+    чертежом одним drawImage, без копирования пикселей в Qt.
 
+    При включенной трассировке (core.tracing) перерисовка "полотна"
+    и копирование на экран записываются как этапы
+    "<TRACE_NAME>.update_pixmap" и "<TRACE_NAME>.blit"; с show_overlay
+    поверх чертежа выводятся частота кадров и время этапов.
     """
 
-    def __init__(self, widget: QtWidgets.QWidget) -> None:
-        self.widget: QtWidgets.QWidget = widget
-        self.widget.paintEvent: Callable = self.paint_event
-        self.widget.resizeEvent: Callable = self.resize_event
+    # Префикс этапов трассировки
+    TRACE_NAME: str = "plane"
+
+    def __init__(
+            self,
+            widget: Optional[QtWidgets.QWidget] = None,
+            size: Optional[QtCore.QSize] = None
+    ) -> None:
+        self.widget: Optional[QtWidgets.QWidget] = widget
+
+        if widget is not None:
+            self.widget.paintEvent: Callable = self.paint_event
+            self.widget.resizeEvent: Callable = self.resize_event
+            size = widget.size()
 
         # Радиус точки (in px)
         self.point_radius: int = 3
@@ -38,8 +84,8 @@ class BasePlaneSystem:
         )
 
         # Коорлинаты центра виджета
-        self.xhalf: int = 0
-        self.yhalf: int = 0
+        self.xhalf: int = size.width() // 2
+        self.yhalf: int = size.height() // 2
 
         # Отступ надписи от линии (in px)
         self.label_offset_x: int = 10
@@ -48,8 +94,51 @@ class BasePlaneSystem:
         # Массив точек
         self.points: Dict[str, QtCore.QPointF] = {}
 
+        # Кэш надписей точек
+        self.label_cache: LabelCache = LabelCache()
+
+        # Массивы отрезков и точек, рисуемые одним вызовом
+        self.line_array: sip.array = to_line_array(np.empty((0, 4)))
+        self.point_array: sip.array = to_point_array(np.empty((0, 2)))
+
+        # Кисти для массивов отрезков и точек
+        self.line_array_pen: QtGui.QPen = QtGui.QPen(QtGui.QColor("gray"), 1)
+        self.point_array_pen: QtGui.QPen = QtGui.QPen(
+            QtGui.QColor("black"), 2, cap=QtCore.Qt.RoundCap
+        )
+
+        # Размер "полотна"
+        self.size: QtCore.QSize = QtCore.QSize(size)
+
         # Т.н. "полотно", на котом рисуется выходное изображение
-        self.pixmap: QtGui.QPixmap = QtGui.QPixmap(self.widget.size())
+        self.pixmap: QtGui.QPaintDevice = self.create_pixmap(self.size)
+
+        # Слой фона и ключ, для которого он нарисован
+        self.background: QtGui.QPaintDevice = self.create_pixmap(self.size)
+        self.drawn_background_key = None
+
+        # Кэшировать слой фона (False - фон рисуется заново каждый раз)
+        self.layer_cache: bool = True
+
+        # Изображение RGBA в памяти NumPy (None - не используется)
+        self.framebuffer: Optional[Framebuffer] = None
+
+        # "Полотно" устарело и должно быть перерисовано
+        self.dirty: bool = True
+
+        # Время последней перерисовки "полотна" и копирования на экран (с)
+        self.update_time: float = 0
+        self.blit_time: float = 0
+
+        # Этапы трассировки и вывод их времени поверх чертежа
+        self.update_span: str = f"{self.TRACE_NAME}.update_pixmap"
+        self.blit_span: str = f"{self.TRACE_NAME}.blit"
+        self.show_overlay: bool = False
+        self.overlay_font: QtGui.QFont = QtGui.QFont("monospace", 8)
+        self.overlay_font.setStyleHint(QtGui.QFont.TypeWriter)
+        self.overlay_brush: QtGui.QBrush = QtGui.QBrush(
+            QtGui.QColor(255, 255, 255, 200)
+        )
 
         self.error: bool = False
 
@@ -82,26 +171,87 @@ class BasePlaneSystem:
         # painter.setPen(dash_pen)
         # painter.drawLine(0, 0, int(axis.x2()), int(axis.y2()))
 
+    def create_pixmap(self, size: QtCore.QSize) -> QtGui.QPaintDevice:
+        """ Создает "полотно": QPixmap для виджета, иначе QImage """
+        if self.widget is None:
+            return QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+        return QtGui.QPixmap(size)
+
+    def resize(self, size: QtCore.QSize) -> None:
+        """ Изменяет размер "полотна" """
+        self.xhalf = size.width() // 2
+        self.yhalf = size.height() // 2
+
+        if size != self.size:
+            self.size = QtCore.QSize(size)
+            self.pixmap = self.create_pixmap(self.size)
+            self.background = self.create_pixmap(self.size)
+            self.drawn_background_key = None
+            self.dirty = True
+
+        if self.framebuffer is not None:
+            self.framebuffer.resize(size.width(), size.height())
+
+    def enable_framebuffer(self, enabled: bool = True) -> None:
+        """ Включает изображение RGBA в памяти NumPy (draw_framebuffer) """
+        if not enabled:
+            self.framebuffer = None
+        elif self.framebuffer is None:
+            self.framebuffer = Framebuffer(self.width, self.height)
+        self.dirty = True
+
+    @property
+    def width(self) -> int:
+        return self.size.width()
+
+    @property
+    def height(self) -> int:
+        return self.size.height()
+
     def update_plane(self, points: Dict[str, QtCore.QPointF]) -> None:
         self.points = points
-        self.widget.repaint()
+        self.dirty = True
+        if self.widget is not None:
+            # Отрисовка откладывается до ближайшего события paint
+            # (несколько вызовов подряд дают одну перерисовку)
+            self.widget.update()
+
+    def set_line_array(self, lines: Optional[np.ndarray]) -> None:
+        """ Задает массив отрезков E×4 (x1, y1, x2, y2) """
+        if lines is None:
+            lines = np.empty((0, 4))
+        self.line_array = to_line_array(lines, self.line_array)
+        self.dirty = True
+
+    def set_point_array(self, points: Optional[np.ndarray]) -> None:
+        """ Задает массив точек N×2 """
+        if points is None:
+            points = np.empty((0, 2))
+        self.point_array = to_point_array(points, self.point_array)
+        self.dirty = True
 
     def paint_event(self, event: QtGui.QPaintEvent) -> None:
-        if not self.error:
-            self.update_pixmap()
-
-        painter = QtGui.QPainter(self.widget)
-        painter.begin(self.widget)
-        painter.drawPixmap(0, 0, self.pixmap)
+        if not self.error and self.dirty:
+            start = perf_counter()
+            with TRACER.span(self.update_span):
+                self.update_pixmap()
+            self.update_time = perf_counter() - start
+
+        start = perf_counter()
+        with TRACER.span(self.blit_span):
+            painter = QtGui.QPainter(self.widget)
+            painter.drawPixmap(0, 0, self.pixmap)
+        self.blit_time = perf_counter() - start
+
+        # Время этапов рисуется на виджете, "полотно" не меняется
+        if self.show_overlay and TRACER.enabled:
+            self.draw_overlay(painter)
         painter.end()
 
         event.accept()
 
     def resize_event(self, event: QtGui.QResizeEvent) -> None:
-        self.xhalf = self.widget.width() // 2
-        self.yhalf = self.widget.height() // 2
-
-        self.pixmap = QtGui.QPixmap(self.widget.size())
+        self.resize(self.widget.size())
 
         event.accept()
 
@@ -112,16 +262,64 @@ class BasePlaneSystem:
         painter.setBackgroundMode(QtCore.Qt.OpaqueMode)
 
         # Рисуем точки
-        for point_name, point in self.points.items():
+        for point in self.points.values():
             painter.drawEllipse(point, self.point_radius, self.point_radius)
-            self.draw_label(painter, point, point_name)
+
+        # Рисуем надписи - все за один проход по кэшу надписей
+        self.label_cache.draw_all(painter, (
+            (
+                point.x() + self.label_offset_x,
+                point.y() + self.label_offset_y,
+                point_name
+            )
+            for point_name, point in self.points.items()
+        ))
+
+    def draw_overlay(self, painter: QtGui.QPainter) -> None:
+        """
+        Частота кадров и среднее время этапов (по буферу кадров
+        трассировки) в левом верхнем углу
+        """
+        stages = TRACER.stage_times()
+        lines = [f"FPS {TRACER.fps():6.1f}"] + [
+            f"{name:<28} {stages[name] * 1e3:7.2f} ms"
+            for name in sorted(stages)
+        ]
+
+        painter.setFont(self.overlay_font)
+        metrics = painter.fontMetrics()
+        line_height = metrics.height()
+        width = max(metrics.horizontalAdvance(line) for line in lines)
+
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(self.overlay_brush)
+        painter.drawRect(2, 2, width + 8, line_height * len(lines) + 6)
+
+        painter.setPen(self.label_pen)
+        for i, line in enumerate(lines):
+            painter.drawText(6, 5 + metrics.ascent() + i * line_height, line)
+
+    def draw_arrays(self, painter: QtGui.QPainter) -> None:
+        """ Отрисовка массивов отрезков и точек (по вызову на массив) """
+        if len(self.line_array):
+            painter.setPen(self.line_array_pen)
+            painter.drawLines(self.line_array)
+
+        self.draw_point_array(painter)
+
+    def draw_point_array(self, painter: QtGui.QPainter) -> None:
+        """ Отрисовка массива точек (set_point_array) """
+        if len(self.point_array):
+            painter.setPen(self.point_array_pen)
+            painter.drawPoints(self.point_array)
 
     def draw_label(
             self, painter: QtGui.QPainter, point: QtCore.QPointF, label: str
     ) -> None:
-        """ Отрисовка надписи """
+        """ Отрисовка надписи (из кэша надписей) """
 
-        painter.drawText(
+        self.label_cache.draw(
+            painter,
             QtCore.QPointF(
                 point.x() + self.label_offset_x,
                 point.y() + self.label_offset_y
@@ -130,5 +328,72 @@ class BasePlaneSystem:
         )
 
     def update_pixmap(self) -> None:
-        """ Метод, реализовано рисование на "полотне" (self.pixmap) """
+        """ Рисование на "полотне" (self.pixmap): фон и чертеж """
+        key = (self.width, self.height, self.background_key())
+        if not self.layer_cache or key != self.drawn_background_key:
+            self.update_background()
+            self.drawn_background_key = key
+
+        painter: QtGui.QPainter = QtGui.QPainter(self.pixmap)
+        self.draw_layer(painter, self.background)
+
+        # Включаем сглаживание
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setBrush(self.point_brush)
+        painter.setBackground(self.point_brush)
+
+        if self.points:
+            if self.framebuffer is not None and self.draw_framebuffer():
+                painter.drawImage(0, 0, self.framebuffer.image)
+            self.draw_foreground(painter)
+
+        painter.end()
+        self.dirty = False
+
+    def update_background(self) -> None:
+        """ Перерисовывает слой фона """
+        painter: QtGui.QPainter = QtGui.QPainter(self.background)
+
+        # Включаем сглаживание
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        painter.setBrush(self.point_brush)
+        painter.drawRect(0, 0, self.width, self.height)
+
+        if self.points:
+            self.draw_background(painter)
+
+        painter.end()
+
+    @staticmethod
+    def draw_layer(
+            painter: QtGui.QPainter, layer: QtGui.QPaintDevice
+    ) -> None:
+        """ Копирует слой (QPixmap или QImage) на "полотно" """
+        if isinstance(layer, QtGui.QImage):
+            painter.drawImage(0, 0, layer)
+        else:
+            painter.drawPixmap(0, 0, layer)
+
+    def background_key(self) -> Hashable:
+        """
+        Значение, от которого зависит слой фона (кроме размера):
+        пока оно не меняется, фон не перерисовывается
+        """
+        raise NotImplementedError
+
+    def draw_background(self, painter: QtGui.QPainter) -> None:
+        """ Рисование фона (осей) """
+        raise NotImplementedError
+
+    def draw_framebuffer(self) -> bool:
+        """
+        Рисование в self.framebuffer.array (под чертежом)
+
+        :return: False, если рисовать нечего (изображение не выводится)
+        """
+        return False
+
+    def draw_foreground(self, painter: QtGui.QPainter) -> None:
+        """ Рисование чертежа поверх фона (линий и точек) """
         raise NotImplementedError
@@ -0,0 +1,68 @@
+# coding: utf-8
+
+import numpy as np
+
+from PyQt5 import QtGui
+
+from gui.base.qt_arrays import rgba_image
+
+
+class Framebuffer(object):
+    """
+    Изображение RGBA в памяти NumPy, открытое для Qt как QImage
+    без копирования
+
+    Векторные растеризаторы пишут пиксели прямо в `array` (H×W×4,
+    uint8), а `image` (QImage над той же памятью) рисуется на
+    "полотне" одним drawImage.
+
+    Память выделяется блоком и при уменьшении размера используется
+    повторно; при увеличении блок растет с запасом (GROWTH), так что
+    изменение размера окна не выделяет память на каждом шаге. Массив
+    и QImage пересоздаются вместе: QImage не переживает память,
+    на которую ссылается.
+    """
+
+    # Запас при увеличении блока памяти
+    GROWTH: float = 1.5
+
+    def __init__(self, width: int = 0, height: int = 0) -> None:
+        self.memory: np.ndarray = np.zeros(0, dtype=np.uint8)
+        self.array: np.ndarray = np.zeros((0, 0, 4), dtype=np.uint8)
+        self.image: QtGui.QImage = QtGui.QImage()
+
+        # Выделений памяти (для проверки повторного использования)
+        self.allocations: int = 0
+
+        self.resize(width, height)
+
+    @property
+    def width(self) -> int:
+        return self.array.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.array.shape[0]
+
+    def resize(self, width: int, height: int) -> bool:
+        """
+        Задает размер изображения (содержимое не сохраняется)
+
+        :return: True, если размер изменился
+        """
+        if (width, height) == (self.width, self.height):
+            return False
+
+        size = width * height * 4
+        if size > len(self.memory):
+            capacity = max(size, int(len(self.memory) * self.GROWTH))
+            self.memory = np.zeros(capacity, dtype=np.uint8)
+            self.allocations += 1
+
+        self.array = self.memory[:size].reshape(height, width, 4)
+        self.image = rgba_image(self.array) if size else QtGui.QImage()
+        return True
+
+    def clear(self) -> None:
+        """ Прозрачное изображение """
+        self.array.fill(0)
@@ -0,0 +1,104 @@
+# coding: utf-8
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from PyQt5 import QtCore, QtGui
+
+
+class LabelCache:
+    """
+    Кэш надписей точек (QStaticText)
+
+    painter.drawText(QPointF, str) заново раскладывает и формирует
+    глифы текста при каждой отрисовке. QStaticText делает это один раз,
+    дальше надпись только копируется. Надписи хранятся по ключу
+    (текст, шрифт); при переполнении удаляется давно не использованная.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize: int = maxsize
+
+        # (текст, шрифт) -> (надпись, высота над базовой линией);
+        # порядок - от давно использованных к недавним
+        self._labels: OrderedDict = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def get(
+            self, text: str, font: QtGui.QFont, font_key: Optional[str] = None
+    ) -> Tuple[QtGui.QStaticText, float]:
+        """ Надпись и высота шрифта над базовой линией (ascent) """
+        key = (text, font.key() if font_key is None else font_key)
+        label = self._labels.get(key)
+        if label is not None:
+            self._labels.move_to_end(key)
+            self.hits += 1
+            return label
+
+        self.misses += 1
+        static_text = QtGui.QStaticText(text)
+        static_text.setTextFormat(QtCore.Qt.PlainText)
+        static_text.setPerformanceHint(QtGui.QStaticText.AggressiveCaching)
+        static_text.prepare(QtGui.QTransform(), font)
+
+        label = (static_text, QtGui.QFontMetricsF(font).ascent())
+        self._labels[key] = label
+        if len(self._labels) > self.maxsize:
+            self._labels.popitem(last=False)
+        return label
+
+    def draw(
+            self, painter: QtGui.QPainter, point: QtCore.QPointF, text: str
+    ) -> None:
+        """
+        Рисует надпись так же, как painter.drawText(point, text):
+        point - начало базовой линии
+        """
+        self.draw_all(painter, ((point.x(), point.y(), text),))
+
+    def draw_all(
+            self,
+            painter: QtGui.QPainter,
+            labels: Iterable[Tuple[float, float, str]]
+    ) -> None:
+        """
+        Рисует надписи (x, y, текст) текущим шрифтом painter.
+        Шрифт и режим фона painter читаются один раз на все надписи
+        """
+        font = painter.font()
+        font_key = font.key()
+
+        # В непрозрачном режиме drawStaticText сводится к drawText
+        # и теряет преобразование painter - фон надписи рисуем сами
+        background = None
+        if painter.backgroundMode() == QtCore.Qt.OpaqueMode:
+            background = painter.background()
+            painter.setBackgroundMode(QtCore.Qt.TransparentMode)
+
+        for x, y, text in labels:
+            static_text, ascent = self.get(text, font, font_key)
+            top_left = QtCore.QPointF(x, y - ascent)
+            if background is not None:
+                painter.fillRect(
+                    QtCore.QRectF(top_left, static_text.size()), background
+                )
+            painter.drawStaticText(top_left, static_text)
+
+        if background is not None:
+            painter.setBackgroundMode(QtCore.Qt.OpaqueMode)
+
+    def clear(self) -> None:
+        self._labels.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._labels),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
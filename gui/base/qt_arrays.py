@@ -0,0 +1,73 @@
+# coding: utf-8
+
+"""
+Обмен координатами между NumPy и Qt без промежуточных объектов
+
+sip.array(QLineF, n) и sip.array(QPointF, n) - непрерывные массивы
+структур Qt (4 и 2 числа double), которые поддерживают протокол
+буфера. Их память открывается как массив NumPy E×4 / N×2 float64 и
+заполняется одной операцией, а сам sip.array передается в
+QPainter.drawLines / drawPoints - весь массив рисуется одним вызовом,
+без создания QLineF/QPointF для каждого элемента.
+
+(QPolygonF тоже можно заполнить через data(), но drawLines с парами
+точек QPolygonF идет в Qt медленным путем - на порядок медленнее.)
+
+Изображения RGBA (H×W×4 uint8) так же передаются в QImage без
+копирования (rgba_image).
+
+Требуется PyQt5 >= 5.15.4 (sip.array).
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from PyQt5 import QtCore, QtGui, sip
+
+
+def array_view(buffer: sip.array, width: int) -> np.ndarray:
+    """ Массив N×width float64, разделяющий память с buffer """
+    return np.frombuffer(buffer, dtype=np.float64).reshape(-1, width)
+
+
+def to_line_array(
+        lines: np.ndarray, buffer: Optional[sip.array] = None
+) -> sip.array:
+    """
+    Копирует отрезки (массив E×4: x1, y1, x2, y2) в sip.array(QLineF).
+    Если длина buffer совпадает, используется его память
+    """
+    lines = np.asarray(lines, dtype=np.float64).reshape(-1, 4)
+    if buffer is None or len(buffer) != len(lines):
+        buffer = sip.array(QtCore.QLineF, len(lines))
+    if len(lines):
+        np.copyto(array_view(buffer, 4), lines)
+    return buffer
+
+
+def to_point_array(
+        points: np.ndarray, buffer: Optional[sip.array] = None
+) -> sip.array:
+    """
+    Копирует точки (массив N×2) в sip.array(QPointF).
+    Если длина buffer совпадает, используется его память
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if buffer is None or len(buffer) != len(points):
+        buffer = sip.array(QtCore.QPointF, len(points))
+    if len(points):
+        np.copyto(array_view(buffer, 2), points)
+    return buffer
+
+
+def rgba_image(raster: np.ndarray) -> QtGui.QImage:
+    """
+    QImage над памятью изображения H×W×4 (uint8, RGBA) без копирования.
+    Массив должен жить, пока используется QImage
+    """
+    height, width = raster.shape[:2]
+    return QtGui.QImage(
+        raster.data, width, height, raster.strides[0],
+        QtGui.QImage.Format_RGBA8888
+    )
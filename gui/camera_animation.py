@@ -0,0 +1,134 @@
+# coding: utf-8
+
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from PyQt5 import QtCore
+
+
+class CameraAnimation(QtCore.QObject):
+    """
+    Воспроизведение траектории камеры по таймеру
+
+    Номер кадра определяется временем с начала воспроизведения:
+    если кадр (callback) не уложился в интервал 1 / fps, следующие
+    кадры, срок которых уже прошел, пропускаются, и анимация
+    не отстает от времени.
+
+    Счетчики (stats):
+
+    - `frames` - показанных кадров
+    - `dropped` - пропущенных кадров
+    - `fps` - фактическая частота кадров
+    - время кадра (callback) в мс: `mean`, `p50`, `p95`, `max`
+    """
+
+    finished = QtCore.pyqtSignal()
+
+    def __init__(
+            self,
+            callback: Callable[[Tuple[float, float, float]], None],
+            fps: float = 60,
+            parent: QtCore.QObject = None
+    ) -> None:
+        super().__init__(parent)
+
+        self.callback: Callable[[Tuple[float, float, float]], None] = \
+            callback
+
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.fps: float = fps
+
+        self._timer: QtCore.QTimer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self.tick)
+
+        # Траектория (список положений камеры) и номер показанного кадра
+        self.cameras: List[Tuple[float, float, float]] = []
+        self.loop: bool = False
+        self._index: int = -1
+        self._start: float = 0
+        self._end: float = 0
+
+        self.frame_times: List[float] = []
+        self.dropped: int = 0
+
+    @property
+    def running(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self, cameras: np.ndarray, loop: bool = False) -> None:
+        """ Начинает воспроизведение траектории (массив K×3) """
+        self.cameras = [tuple(camera) for camera in np.asarray(cameras).tolist()]
+        self.loop = loop
+        self._index = -1
+        self.frame_times = []
+        self.dropped = 0
+
+        if not self.cameras:
+            return
+
+        self._start = perf_counter()
+        self._timer.start(max(int(1000 / self.fps), 1))
+        self.tick()
+
+    def stop(self) -> None:
+        """ Останавливает воспроизведение (испускает finished) """
+        if not self.running:
+            return
+        self._timer.stop()
+        self._end = perf_counter()
+        self.finished.emit()
+
+    def frame_index(self, now: float) -> Optional[int]:
+        """
+        Номер кадра, срок которого наступил к моменту now
+        (None - траектория закончилась)
+        """
+        index = int((now - self._start) * self.fps)
+        if index < len(self.cameras):
+            return index
+        if self.loop:
+            return index % len(self.cameras)
+        return None
+
+    def tick(self) -> None:
+        now = perf_counter()
+        index = self.frame_index(now)
+        if index is None:
+            # Кадры, не показанные до конца траектории, пропущены
+            self.dropped += max(len(self.cameras) - self._index - 1, 0)
+            self.stop()
+            return
+
+        # Таймер сработал раньше срока следующего кадра
+        if index == self._index:
+            return
+
+        skipped = (index - self._index - 1) % len(self.cameras)
+        self.dropped += skipped
+        self._index = index
+
+        self.callback(self.cameras[index])
+        self.frame_times.append(perf_counter() - now)
+
+    def stats(self) -> Dict[str, float]:
+        """ Статистика времени кадров (мс) и частоты кадров """
+        times = np.array(self.frame_times) * 1e3
+        end = perf_counter() if self.running else self._end
+        elapsed = end - self._start
+        if not len(times):
+            return {"frames": 0, "dropped": self.dropped}
+
+        return {
+            "frames": len(times),
+            "dropped": self.dropped,
+            "fps": len(times) / elapsed if elapsed > 0 else 0,
+            "mean": float(times.mean()),
+            "p50": float(np.percentile(times, 50)),
+            "p95": float(np.percentile(times, 95)),
+            "max": float(times.max()),
+        }
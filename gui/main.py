@@ -1,15 +1,32 @@
 # coding: utf-8
 
 import sys
+from typing import TYPE_CHECKING, List, Tuple
 
-from PyQt5 import QtWidgets
+# Только для аннотаций: при выполнении импорт отложен до create_window
+if TYPE_CHECKING:
+    from PyQt5.QtWidgets import QApplication
+    from gui.main_window import MainWindow
 
-from gui.main_window import MainWindow
+
+def create_window(argv: List[str]) -> Tuple["QApplication", "MainWindow"]:
+    """
+    Создает приложение и главное окно
+
+    PyQt5, NumPy и модули программы импортируются здесь, а не при
+    импорте gui.main: модуль можно загрузить без них.
+    """
+    from PyQt5 import QtWidgets
+
+    app = QtWidgets.QApplication(argv)
+
+    from gui.main_window import MainWindow
+
+    return app, MainWindow()
 
 
 def main():
-    app = QtWidgets.QApplication(sys.argv)
-    window = MainWindow()
+    app, window = create_window(sys.argv)
     window.show()
 
     app.exec()
@@ -1,20 +1,26 @@
 # coding: utf-8
 
 import enum
-from functools import reduce
-from operator import mul
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
 
 from PyQt5 import QtCore, QtGui, QtWidgets
-from math import sqrt
 
-from core.mx_utils import *
-from core.points import Point3D
+from core.tracing import TRACER
 from gui.plane_systems.ax_plane_system import AxonometricPlaneSystem
 from gui.plane_systems.cx_plane_system import ComplexPlaneSystem
+from gui.redraw_scheduler import RedrawScheduler
+from gui.scene import Scene, SelectProjection
 from gui.settings import *
 from gui.ui_main_window import Ui_MainWindow
 
+if TYPE_CHECKING:
+    # Модель, облако и анимация импортируются при первом использовании
+    # (загрузка файла, пункт меню), а не при запуске программы
+    from core.mesh import Mesh
+    from gui.camera_animation import CameraAnimation
+
 
 class SelectPoint(enum.Enum):
     """
@@ -28,56 +34,66 @@ class SelectPoint(enum.Enum):
     T = enum.auto()
 
 
-class SelectProjection(enum.Enum):
-    """
-    Выбираемое проецирование:
-
-    - `CEN` - центральное
-    - `ORT` - ортогональное
-    """
-
-    CEN = enum.auto()
-    ORT = enum.auto()
-
-
 class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
     def __init__(self, parent: QtWidgets.QWidget = None) -> None:
         super().__init__(parent)
 
         self.setupUi(self)
 
-        self.axis_length: int = 100
-
-        # Координаты точки T
-        self.xT: int = POINT_XT
-        self.yT: int = POINT_YT
-        self.zT: int = POINT_ZT
+        # Расчет точек чертежей
+        self.scene: Scene = Scene()
 
-        # Координаты точки C (Камеры)
-        self.xC: int = POINT_XC
-        self.yC: int = POINT_YC
-        self.zC: int = POINT_ZC
-
-        self.selected_projection: SelectProjection = SelectProjection.ORT
         self.selected_point: SelectPoint = SelectPoint.T
 
-        # Точки 3D
-        self.points_3d: Dict[str, Point3D] = {}
-
-        # Точки аксонометрического чертежа
-        self.points_2d_ax: Dict[str, QtCore.QPointF] = {}
+        # Пересчет по изменению координат (не чаще MAX_FPS раз в секунду)
+        self.redraw_scheduler: RedrawScheduler = RedrawScheduler(
+            self.on_coordinate_changed, MAX_FPS, self
+        )
 
-        # Точки комплексного чертежа
-        self.points_2d_cx: Dict[str, QtCore.QPointF] = {}
+        # Анимация камеры (создается при первом запуске, см. animation);
+        # положение камеры до анимации
+        self.camera_animation: Optional["CameraAnimation"] = None
+        self.animation_camera: Optional[Tuple[int, int, int]] = None
 
         # Координатные системы
         self.aps = AxonometricPlaneSystem(self.awidget)
         self.cps = ComplexPlaneSystem(self.cwidget)
 
+        # Видимые ребра модели рисуются прямо в память изображения
+        # аксонометрического чертежа
+        self.scene.mesh_framebuffer = self.aps.mesh_framebuffer
+
+        # Перерисовка чертежей - узлы графа зависимостей сцены
+        self.scene.graph.add_node(
+            "ax_pixmap",
+            self.draw_ax_plane,
+            (
+                "ax_points", "mesh_lines", "ax_edges", "mesh_raster",
+                "cloud_counts"
+            )
+        )
+        self.scene.graph.add_node(
+            "cx_pixmap", self.draw_cx_plane, ("cx_points",)
+        )
+
+        # Загрузка модели (gui.mesh_loader импортируется при первой
+        # загрузке) и номер последней загрузки: результаты прежних
+        # загрузок, закончившихся позже, отбрасываются
+        self.mesh_loader: Optional[QtCore.QThread] = None
+        self.mesh_generation: int = 0
+        self.setup_mesh_actions()
+
+        # Первый кадр уже нарисован (см. showEvent)
+        self.first_frame_drawn: bool = False
+
         # Задаем значения по умолчанию
         self.setup_fields()
 
     def setup_fields(self) -> None:
+        """
+        Значения полей по умолчанию (без пересчета: значения уже
+        в сцене, первый кадр рисуется в showEvent)
+        """
         self.change_slider_values(POINT_XT, POINT_YT, POINT_ZT)
 
         self.xTField.setText(f"{POINT_XT}")
@@ -91,64 +107,150 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.radioT.setChecked(True)
         self.radioOrhogonal.setChecked(True)
 
+    def setup_mesh_actions(self) -> None:
+        """ Пункты меню для загрузки модели """
+        self.actionOpenMesh = QtWidgets.QAction("Открыть модель...", self)
+        self.actionOpenMesh.setShortcut(QtGui.QKeySequence.Open)
+        self.actionOpenMesh.triggered.connect(self.on_open_mesh)
+
+        self.actionCloseMesh = QtWidgets.QAction("Закрыть модель", self)
+        self.actionCloseMesh.setEnabled(False)
+        self.actionCloseMesh.triggered.connect(self.on_close_mesh)
+
+        self.actionOpenCloud = QtWidgets.QAction(
+            "Открыть облако точек...", self
+        )
+        self.actionOpenCloud.triggered.connect(self.on_open_cloud)
+
+        self.actionCloseCloud = QtWidgets.QAction("Закрыть облако точек", self)
+        self.actionCloseCloud.setEnabled(False)
+        self.actionCloseCloud.triggered.connect(self.on_close_cloud)
+
+        self.actionHiddenLines = QtWidgets.QAction(
+            "Скрывать невидимые линии", self
+        )
+        self.actionHiddenLines.setCheckable(True)
+        self.actionHiddenLines.toggled.connect(self.on_hidden_lines_toggled)
+
+        self.actionSinglePrecision = QtWidgets.QAction(
+            "Одинарная точность (float32)", self
+        )
+        self.actionSinglePrecision.setCheckable(True)
+        self.actionSinglePrecision.setChecked(
+            self.scene.precision == np.float32
+        )
+        self.actionSinglePrecision.toggled.connect(self.on_precision_toggled)
+
+        self.actionTrace = QtWidgets.QAction("Трассировка кадров", self)
+        self.actionTrace.setCheckable(True)
+        self.actionTrace.setShortcut(QtGui.QKeySequence("F12"))
+        self.actionTrace.toggled.connect(self.on_trace_toggled)
+
+        self.actionSaveTrace = QtWidgets.QAction(
+            "Сохранить трассировку...", self
+        )
+        self.actionSaveTrace.setEnabled(False)
+        self.actionSaveTrace.triggered.connect(self.on_save_trace)
+
+        self.menu.insertAction(self.actionExit, self.actionOpenMesh)
+        self.menu.insertAction(self.actionExit, self.actionCloseMesh)
+        self.menu.insertAction(self.actionExit, self.actionOpenCloud)
+        self.menu.insertAction(self.actionExit, self.actionCloseCloud)
+        self.menu.insertAction(self.actionExit, self.actionHiddenLines)
+        self.menu.insertAction(self.actionExit, self.actionSinglePrecision)
+        self.menu.insertSeparator(self.actionExit)
+        self.setup_animation_actions()
+
+        self.menu.insertAction(self.actionExit, self.actionTrace)
+        self.menu.insertAction(self.actionExit, self.actionSaveTrace)
+        self.menu.insertSeparator(self.actionExit)
+
+    def setup_animation_actions(self) -> None:
+        """ Пункты меню анимации камеры """
+        self.actionOrbit = QtWidgets.QAction("Облет камеры", self)
+        self.actionOrbit.triggered.connect(self.on_orbit)
+
+        self.actionFlythrough = QtWidgets.QAction("Пролет камеры", self)
+        self.actionFlythrough.triggered.connect(self.on_flythrough)
+
+        self.actionStopAnimation = QtWidgets.QAction(
+            "Остановить анимацию", self
+        )
+        self.actionStopAnimation.setShortcut(QtGui.QKeySequence("Esc"))
+        self.actionStopAnimation.setEnabled(False)
+        self.actionStopAnimation.triggered.connect(self.stop_animation)
+
+        self.menu.insertAction(self.actionExit, self.actionOrbit)
+        self.menu.insertAction(self.actionExit, self.actionFlythrough)
+        self.menu.insertAction(self.actionExit, self.actionStopAnimation)
+        self.menu.insertSeparator(self.actionExit)
+
     @QtCore.pyqtSlot(int, name="on_x_changed")
     def on_x_changed(self, value):
         if self.selected_point == SelectPoint.T:
-            self.xT = value
+            self.scene.xT = value
             self.xTField.setText(f"{value}")
         elif self.selected_point == SelectPoint.C:
-            self.xC = value
+            self.scene.xC = value
             self.xCField.setText(f"{value}")
-        self.on_coordinate_changed()
+        self.redraw_scheduler.request()
 
     @QtCore.pyqtSlot(int, name="on_y_changed")
     def on_y_changed(self, value):
         if self.selected_point == SelectPoint.T:
-            self.yT = value
+            self.scene.yT = value
             self.yTField.setText(f"{value}")
         elif self.selected_point == SelectPoint.C:
-            self.yC = value
+            self.scene.yC = value
             self.yCField.setText(f"{value}")
-        self.on_coordinate_changed()
+        self.redraw_scheduler.request()
 
     @QtCore.pyqtSlot(int, name="on_z_changed")
     def on_z_changed(self, value):
         if self.selected_point == SelectPoint.T:
-            self.zT = value
+            self.scene.zT = value
             self.zTField.setText(f"{value}")
         elif self.selected_point == SelectPoint.C:
-            self.zC = value
+            self.scene.zC = value
             self.zCField.setText(f"{value}")
-        self.on_coordinate_changed()
+        self.redraw_scheduler.request()
 
     @QtCore.pyqtSlot(name="on_radio_t_clicked")
     def on_radio_t_clicked(self):
         if self.selected_point == SelectPoint.C:
             self.selected_point = SelectPoint.T
-            self.change_slider_values(self.xT, self.yT, self.zT)
+            self.change_slider_values(self.scene.xT, self.scene.yT, self.scene.zT)
             self.on_selected_point_changed()
 
     @QtCore.pyqtSlot(name="on_radio_c_clicked")
     def on_radio_c_clicked(self):
         if self.selected_point == SelectPoint.T:
             self.selected_point = SelectPoint.C
-            self.change_slider_values(self.xC, self.yC, self.zC)
+            self.change_slider_values(self.scene.xC, self.scene.yC, self.scene.zC)
             self.on_selected_point_changed()
 
     def change_slider_values(self, x, y, z):
-        self.xSlider.setValue(x)
-        self.ySlider.setValue(y)
-        self.zSlider.setValue(z)
+        """
+        Ставит ползунки в положение точки из сцены. Сигналы valueChanged
+        блокируются: координаты в сцене и полях уже такие, пересчет
+        вызывает тот, кто переключает точку
+        """
+        for slider, value in (
+                (self.xSlider, x), (self.ySlider, y), (self.zSlider, z)
+        ):
+            blocked = slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(blocked)
 
     @QtCore.pyqtSlot(name="on_selected_projection_radio_clicked")
     def on_radio_central_clicked(self):
-        if self.selected_projection == SelectProjection.ORT:
-            self.selected_projection = SelectProjection.CEN
+        if self.scene.selected_projection == SelectProjection.ORT:
+            self.scene.selected_projection = SelectProjection.CEN
             self.on_projection_changed()
 
     def on_radio_orthogonal_clicked(self):
-        if self.selected_projection == SelectProjection.CEN:
-            self.selected_projection = SelectProjection.ORT
+        if self.scene.selected_projection == SelectProjection.CEN:
+            self.scene.selected_projection = SelectProjection.ORT
             self.on_projection_changed()
 
     # ----
@@ -156,255 +258,271 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
     # ----
 
     def on_coordinate_changed(self):
+        """
+        Пересчитывает и перерисовывает только устаревшие части чертежей
+        (см. Scene.graph)
+        """
+        with TRACER.span("on_coordinate_changed", "frame"):
+            self.scene.set_size(self.awidget.width(), self.awidget.height())
+            self.scene.sync()
 
-        # Заполняем массив координат
-        self.fill_3d_coordinates()
-
-        # Пересчитываем все точки
-        self.recalculate_all()
-
-        # Отрисовываем результат
-        self.draw_result()
+            graph = self.scene.graph
+            graph.get("ax_pixmap")
+            graph.get("cx_pixmap")
 
     def on_selected_point_changed(self):
-        self.recalculate_ax_coordinates()
-        self.draw_ax_plane()
+        self.on_coordinate_changed()
 
     def on_projection_changed(self):
-        self.fill_3d_coordinates()
-        self.recalculate_ax_coordinates()
-        self.draw_ax_plane()
+        self.on_coordinate_changed()
 
-    def fill_3d_coordinates(self):
-        x, y, z = self.xT, self.yT, self.zT
+    def draw_ax_plane(
+            self,
+            points: Dict[str, QtCore.QPointF],
+            mesh_lines: Optional[np.ndarray] = None,
+            edges: Optional[Dict[str, np.ndarray]] = None,
+            mesh_raster: Optional[np.ndarray] = None,
+            cloud_counts: Optional[np.ndarray] = None
+    ) -> None:
+        if self.scene.ax_error is not None:
+            self.draw_ax_error(self.scene.ax_error)
+        else:
+            self.aps.error = False
+        self.aps.set_mesh_lines(mesh_lines)
+        self.aps.set_mesh_raster(mesh_raster)
+        self.aps.set_cloud_counts(cloud_counts)
+        self.aps.set_edges(edges or {})
+        self.aps.update_plane(points)
+
+    def draw_cx_plane(self, points: Dict[str, QtCore.QPointF]) -> None:
+        self.cps.update_plane(points)
+
+    def on_hidden_lines_toggled(self, checked: bool) -> None:
+        """ Включает удаление невидимых линий модели (z-буфер) """
+        self.scene.hidden_lines = checked
+        self.on_coordinate_changed()
 
-        self.points_3d["T"] = Point3D(x, y, z)
-        self.points_3d["0"] = Point3D(0, 0, 0)
+    def on_precision_toggled(self, checked: bool) -> None:
+        """ Тип координат модели: float32 или float64 """
+        self.scene.precision = np.dtype(np.float32 if checked else np.float64)
+        self.on_coordinate_changed()
 
-        self.points_3d["TX"] = Point3D(x, 0, 0)
-        self.points_3d["TY"] = Point3D(0, y, 0)
-        self.points_3d["TZ"] = Point3D(0, 0, z)
+    def current_camera(self) -> Tuple[int, int, int]:
+        return self.scene.xC, self.scene.yC, self.scene.zC
 
-        self.points_3d["T1"] = Point3D(x, y, 0)
-        self.points_3d["T2"] = Point3D(0, y, z)
-        self.points_3d["T3"] = Point3D(x, 0, z)
+    def animation(self) -> "CameraAnimation":
+        """ Анимация камеры; создается при первом вызове """
+        if self.camera_animation is None:
+            from gui.camera_animation import CameraAnimation
 
-        self.points_3d["TX"] = Point3D(x, 0, 0)
-        self.points_3d["TY"] = Point3D(0, y, 0)
-        self.points_3d["TZ"] = Point3D(0, 0, z)
+            self.camera_animation = CameraAnimation(
+                self.on_animation_frame, ANIMATION_FPS, self
+            )
+            self.camera_animation.finished.connect(
+                self.on_animation_finished
+            )
+        return self.camera_animation
+
+    def stop_animation(self) -> None:
+        if self.camera_animation is not None:
+            self.camera_animation.stop()
+
+    def on_orbit(self) -> None:
+        """ Облет камеры вокруг оси Z (от текущего положения) """
+        from core.camera_path import orbit
+
+        # Сначала остановка: камера возвращается из середины прежней
+        # анимации, и траектория строится от нее
+        self.stop_animation()
+        try:
+            cameras = orbit(self.current_camera(), ORBIT_FRAMES)
+        except ValueError as error:
+            self.statusbar.showMessage(f"{error}", 5000)
+            return
+        self.start_animation(cameras)
 
-        self.points_3d["+X"] = Point3D(self.axis_length, 0, 0)
-        self.points_3d["+Y"] = Point3D(0, self.axis_length, 0)
-        self.points_3d["+Z"] = Point3D(0, 0, self.axis_length)
+    def on_flythrough(self) -> None:
+        """ Пролет камеры через FLYTHROUGH_WAYPOINTS """
+        from core.camera_path import flythrough
 
-    def recalculate_all(self):
-        self.recalculate_ax_coordinates()
-        self.recalculate_ep_coordinates()
+        self.stop_animation()
+        waypoints = [self.current_camera(), *FLYTHROUGH_WAYPOINTS]
+        self.start_animation(flythrough(waypoints, FLYTHROUGH_FRAMES))
 
-    def recalculate_ax_coordinates(self):
+    def start_animation(self, cameras: np.ndarray) -> None:
         """
-        Пересчитываем из 3D в координаты экрана
-        (для аксонометрического чертежа)
+        Воспроизводит траекторию камеры (массив K×3). Матрицы вида
+        всех кадров строятся заранее одной стопкой
         """
+        from core.camera_path import passes_origin
 
-        # Выполняем проверки
-        if not self.can_be_drawn():
+        if passes_origin(cameras):
+            self.statusbar.showMessage(
+                "Траектория проходит через начало координат", 5000
+            )
             return
 
-        # координаты камеры
-        x, y, z = self.xC, self.yC, self.zC
-
-        sqrt_xy: float = sqrt(x * x + y * y)
-        sqrt_xyz: float = sqrt(x * x + y * y + z * z)
-
-        if sqrt_xyz == 0:
-            return
+        self.stop_animation()
+        self.animation_camera = self.current_camera()
 
-        if sqrt_xy == 0:
-            sin_phi = 0
-            cos_phi = 1
-        else:
-            cos_phi = y / sqrt_xy
-            sin_phi = x / sqrt_xy
+        view = self.scene.view_transform
+        view.clear_preloaded()
+        size = self.awidget.width(), self.awidget.height()
+        central = self.scene.is_central_projection()
+        view.preload(cameras, central, *size)
+        if self.scene.hidden_lines:
+            view.preload(cameras, central, *size, depth=True)
 
-        cos_psi: float = z / sqrt_xyz
-        sin_psi: float = sqrt_xy / sqrt_xyz
+        self.actionStopAnimation.setEnabled(True)
+        self.animation().start(cameras)
 
-        # Массив матриц преобразований
-        ops: List[Matrix] = []
+    def on_animation_frame(self, camera: Tuple[float, float, float]) -> None:
+        """
+        Кадр анимации: пересчет и немедленная отрисовка чертежей,
+        чтобы время кадра включало и отрисовку
+        """
+        self.scene.set_c(*camera)
+        self.on_coordinate_changed()
+        self.awidget.repaint()
+        self.cwidget.repaint()
+
+    def on_animation_finished(self) -> None:
+        """ Возвращает камеру на место и выводит статистику кадров """
+        self.actionStopAnimation.setEnabled(False)
+        self.scene.view_transform.clear_preloaded()
+
+        if self.animation_camera is not None:
+            self.scene.set_c(*self.animation_camera)
+            self.animation_camera = None
+            self.on_coordinate_changed()
+
+        stats = self.camera_animation.stats()
+        if stats["frames"]:
+            self.statusbar.showMessage(
+                f"Кадров {stats['frames']}, пропущено {stats['dropped']}, "
+                f"{stats['fps']:.1f} кадр/с; время кадра: "
+                f"среднее {stats['mean']:.1f} мс, "
+                f"p95 {stats['p95']:.1f} мс, макс. {stats['max']:.1f} мс",
+                10000
+            )
 
-        # Матрица поворота системы координат на угол phi вокруг оси Z
-        rz_matrix: Matrix = get_matrix_rz(cos_phi, sin_phi)
-        ops.append(rz_matrix)
+    def on_trace_toggled(self, checked: bool) -> None:
+        """
+        Включает трассировку этапов кадра (core.tracing) и вывод
+        частоты кадров и времени этапов поверх аксонометрического чертежа
+        """
+        TRACER.clear()
+        TRACER.enabled = checked
+        self.aps.show_overlay = checked
+        self.actionSaveTrace.setEnabled(checked)
+        self.awidget.update()
+
+    def on_save_trace(self) -> None:
+        """ Сохраняет последние интервалы в формате Chrome trace-event """
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Сохранить трассировку", "trace.json", "JSON (*.json)"
+        )
+        if path:
+            TRACER.export_chrome(path)
+            self.statusbar.showMessage(f"Трассировка сохранена: {path}", 5000)
 
-        # Матрица поворота системы координат на угол psi вокруг оси X
-        rx_matrix: Matrix = get_matrix_rx(cos_psi, sin_psi)
-        ops.append(rx_matrix)
+    def on_open_mesh(self) -> None:
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Открыть модель", "", "Модели (*.obj *.ply)"
+        )
+        if path:
+            self.load_mesh(path)
 
-        # Матрица зеркального отображения относительно yOZ
-        mx_matrix: Matrix = get_matrix_mx()
-        ops.append(mx_matrix)
+    def load_mesh(self, path: str) -> None:
+        """ Загружает модель в отдельном потоке """
+        from gui.mesh_loader import MeshLoader
 
-        # Если выбрано центральное проецирование
-        if self.is_central_projection():
-            pr_matrix: Matrix = get_matrix_p(sqrt_xyz)
-            ops.append(pr_matrix)
+        self.statusbar.showMessage(f"Загрузка {path}...")
 
-        # Матрица проецирования на плоскость xOy
-        p_matrix: Matrix = get_matrix_pz()
-        ops.append(p_matrix)
+        self.mesh_generation += 1
+        self.mesh_loader = MeshLoader(path, self.mesh_generation, self)
+        self.mesh_loader.loaded.connect(self.on_mesh_loaded)
+        self.mesh_loader.failed.connect(self.on_mesh_failed)
+        self.mesh_loader.finished.connect(self.mesh_loader.deleteLater)
+        self.mesh_loader.start()
 
-        # Матрица переноса в начало координат
-        t_matrix: Matrix = get_matrix_t(
-            self.awidget.width() // 2, self.awidget.height() // 2, 0
-        )
-        ops.append(t_matrix)
+    def on_mesh_loaded(self, mesh: "Mesh", generation: int) -> None:
+        if generation != self.mesh_generation:
+            return
 
-        product: Matrix = self.calculate_transform(ops)
+        self.statusbar.showMessage(f"{mesh}", 5000)
+        self.actionCloseMesh.setEnabled(True)
+        self.scene.set_mesh(mesh)
+        self.on_coordinate_changed()
 
-        if not self.points_inside_screen(product):
+    def on_mesh_failed(self, text: str, generation: int) -> None:
+        if generation != self.mesh_generation:
             return
 
-        self.aps.error = False
-        self.apply_matrix(product)
-
-    def points_inside_screen(self, matrix: Matrix) -> bool:
-        """ Проверка на наличие точек внутри экрана """
-        for pname, point in self.points_3d.items():
-            if not self.inside_screen(point * matrix):
-                self.draw_ax_error("Точка находится за пределами экрана")
-                return False
-        return True
-
-    def inside_screen(self, point: Point3D) -> bool:
-        """ Точка внутри экрана """
-        return 0 <= point.x <= self.aps.width \
-               and 0 <= point.y <= self.aps.height
-
-    @staticmethod
-    def calculate_transform(ops: List[Matrix]) -> Matrix:
-        return reduce(mul, ops)
-
-    def apply_matrix(self, matrix: Matrix) -> None:
-        for pname, point in self.points_3d.items():
-            self.points_2d_ax[pname] = self.from_3d_to_ax_scene(point, matrix)
-
-    def recalculate_ep_coordinates(self):
-        """ Пересчитываем из 3D в координаты чертежа """
-
-        # "служебные"
-        self.points_2d_cx["0"] = QtCore.QPointF(0, 0)
-        self.points_2d_cx["+X -Y"] = QtCore.QPointF(-self.axis_length, 0)
-        self.points_2d_cx["-X +Y"] = QtCore.QPointF(self.axis_length, 0)
-        self.points_2d_cx["+Z -Y"] = QtCore.QPointF(0, -self.axis_length)
-        self.points_2d_cx["-Z +Y"] = QtCore.QPointF(0, self.axis_length)
-
-        # для точки T
-        x_t, y_t, z_t = self.xT, self.yT, self.zT
-        self.points_2d_cx["T1"] = QtCore.QPointF(-x_t, y_t)
-        self.points_2d_cx["T2"] = QtCore.QPointF(-x_t, -z_t)
-        self.points_2d_cx["T3"] = QtCore.QPointF(y_t, -z_t)
-
-        self.points_2d_cx["TX"] = QtCore.QPointF(-x_t, 0)
-        self.points_2d_cx["TY1"] = QtCore.QPointF(0, y_t)
-        self.points_2d_cx["TY3"] = QtCore.QPointF(y_t, 0)
-        self.points_2d_cx["TZ"] = QtCore.QPointF(0, -z_t)
-
-        # для точки C
-        x_c, y_c, z_c = self.xC, self.yC, self.zC
-        self.points_2d_cx["C1"] = QtCore.QPointF(-x_c, y_c)
-        self.points_2d_cx["C2"] = QtCore.QPointF(-x_c, -z_c)
-        self.points_2d_cx["C3"] = QtCore.QPointF(y_c, -z_c)
-
-        self.points_2d_cx["CX"] = QtCore.QPointF(-x_c, 0)
-        self.points_2d_cx["CY1"] = QtCore.QPointF(0, y_c)
-        self.points_2d_cx["CY3"] = QtCore.QPointF(y_c, 0)
-        self.points_2d_cx["CZ"] = QtCore.QPointF(0, -z_c)
-
-    def draw_result(self):
-        self.draw_ax_plane()
-        self.draw_cx_plane()
-
-    def draw_ax_plane(self):
-        self.aps.update_plane(self.points_2d_ax)
-
-    def draw_cx_plane(self):
-        self.cps.update_plane(self.points_2d_cx)
-
-    # ----
-    @staticmethod
-    def from_3d_to_ax_scene(point: Point3D, product: Matrix) -> QtCore.QPointF:
-        p = point * product
-        return QtCore.QPointF(p.x, p.y)
+        self.statusbar.showMessage(f"Не удалось загрузить модель: {text}")
 
-    def showEvent(self, e: QtGui.QShowEvent) -> None:
-        super().showEvent(e)
-        # Вызываем первую отрисовку
+    def on_close_mesh(self) -> None:
+        # Незаконченная загрузка не должна вернуть модель
+        self.mesh_generation += 1
+        self.actionCloseMesh.setEnabled(False)
+        self.scene.set_mesh(None)
         self.on_coordinate_changed()
-        self.on_projection_changed()
 
-    # ПРОВЕРКИ
-
-    def can_be_drawn(self) -> bool:
-        if self.is_central_projection():
-            return self.cx_can_be_drawn()
-        else:
-            return self.ax_can_be_drawn()
-
-    def is_central_projection(self) -> bool:
-        """ Текущая проекция - центральная """
-        return self.selected_projection == SelectProjection.CEN
+    def on_open_cloud(self) -> None:
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Открыть облако точек", "",
+            "Облака точек (*.npy *.bin *.raw)"
+        )
+        if path:
+            self.load_cloud(path)
 
-    def ax_can_be_drawn(self) -> bool:
+    def load_cloud(self, path: str) -> None:
         """
-        Проверка на возможность отрисовки точки при ортогональном проецировании
+        Открывает облако точек (np.memmap: файл читается порциями при
+        проецировании, а не целиком)
         """
-        camera: Point3D = Point3D(self.xC, self.yC, self.zC)
+        from core.point_cloud import PointCloud
 
-        if camera.in_origin():
-            self.draw_ax_error(
-                "Проекции не существует: камера в начале координат"
+        try:
+            cloud = PointCloud.open(
+                path, np.dtype(CLOUD_RAW_DTYPE), chunk=CLOUD_CHUNK
             )
-            return False
-
-        return True
-
-    def cx_can_be_drawn(self) -> bool:
-        """
-        Проверка на возможность отрисовки точки при центральном проецировании
-        """
+        except (OSError, ValueError) as e:
+            self.statusbar.showMessage(
+                f"Не удалось открыть облако точек: {e}"
+            )
+            return
 
-        camera: Point3D = Point3D(self.xC, self.yC, self.zC)
+        self.statusbar.showMessage(f"{cloud}", 5000)
+        self.actionCloseCloud.setEnabled(True)
+        self.scene.set_cloud(cloud)
+        self.on_coordinate_changed()
 
-        # Если камера в начале координат
-        if camera.in_origin():
-            self.draw_ax_error(
-                "Проекции не существует: камера в начале координат"
-            )
-            return False
-
-        tpoint: Point3D = Point3D(self.xT, self.yT, self.zT)
-        # Координаты камеры равны точке T
-        if camera.equals(tpoint):
-            self.draw_ax_error(
-                "Проекции не существует: "
-                "координаты точки и камеры совпадают."
-            )
-            return False
+    def on_close_cloud(self) -> None:
+        self.actionCloseCloud.setEnabled(False)
+        self.scene.set_cloud(None)
+        self.on_coordinate_changed()
 
-        # Если камера внутри прямоугольника
-        if camera.inside(tpoint):
-            self.draw_ax_error("Камера внутри")
-            return False
+    def graph_stats(self) -> Dict[str, Dict[str, int]]:
+        """ Попадания и промахи по узлам графа пересчета """
+        return self.scene.graph.stats()
 
-        # Проекции между камерой и плоскостью не существует
-        # ct - вектор CT
-        ct: Point3D = camera - tpoint
-        if camera.cos_between(ct) <= 0:
-            self.draw_ax_error("Проекция точки не лежит в плоскости экрана")
-            return False
+    def event(self, e: QtCore.QEvent) -> bool:
+        result = super().event(e)
+        # UpdateRequest - перерисовка окна вместе с чертежами: кадр
+        # для трассировки завершен
+        if e.type() == QtCore.QEvent.UpdateRequest:
+            TRACER.mark_frame()
+        return result
 
-        return True
+    def showEvent(self, e: QtGui.QShowEvent) -> None:
+        super().showEvent(e)
+        # Первая отрисовка - один раз (окно показывается повторно,
+        # например после сворачивания, без изменения сцены)
+        if not self.first_frame_drawn:
+            self.first_frame_drawn = True
+            self.redraw_scheduler.cancel()
+            self.on_coordinate_changed()
 
     def draw_ax_error(self, text: str) -> None:
         """ Показывает ошибку на аксонометрическом чертеже """
@@ -0,0 +1,38 @@
+# coding: utf-8
+
+from PyQt5 import QtCore
+
+from core.mesh import load_mesh
+
+
+class MeshLoader(QtCore.QThread):
+    """
+    Загрузка модели (OBJ, PLY) в отдельном потоке
+
+    По окончании испускает loaded(Mesh, generation) или
+    failed(текст ошибки, generation). Номер загрузки generation задает
+    вызывающий: по нему отбрасываются результаты загрузок, начатых
+    раньше последней.
+    """
+
+    loaded = QtCore.pyqtSignal(object, int)
+    failed = QtCore.pyqtSignal(str, int)
+
+    def __init__(
+            self,
+            path: str,
+            generation: int = 0,
+            parent: QtCore.QObject = None
+    ) -> None:
+        super().__init__(parent)
+        self.path: str = path
+        self.generation: int = generation
+
+    def run(self) -> None:
+        try:
+            mesh = load_mesh(self.path)
+        except (OSError, ValueError, IndexError) as error:
+            self.failed.emit(str(error), self.generation)
+            return
+
+        self.loaded.emit(mesh, self.generation)
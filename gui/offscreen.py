@@ -0,0 +1,152 @@
+# coding: utf-8
+
+"""
+Отрисовка чертежей без окна (Qt platform "offscreen")
+
+Пример::
+
+    renderer = OffscreenRenderer()
+    png = renderer.render_png((50, 50, 50), (100, 100, 100))
+"""
+
+import os
+import sys
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from PyQt5 import QtCore, QtGui
+
+from gui.plane_systems.ax_plane_system import AxonometricPlaneSystem
+from gui.plane_systems.cx_plane_system import ComplexPlaneSystem
+from gui.scene import Scene, SelectProjection
+
+# Чертежи, которые умеет рисовать OffscreenRenderer
+PLANE_AX = "ax"
+PLANE_CX = "cx"
+
+# Размер чертежа по умолчанию (как в окне программы)
+DEFAULT_SIZE: Tuple[int, int] = (402, 251)
+
+_application: Optional[QtGui.QGuiApplication] = None
+
+
+def ensure_application() -> QtCore.QCoreApplication:
+    """
+    Возвращает приложение Qt, при необходимости создавая его
+    на платформе "offscreen" (дисплей не нужен)
+    """
+    global _application
+
+    app = QtGui.QGuiApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = _application = QtGui.QGuiApplication(sys.argv[:1])
+    return app
+
+
+class RenderConfig(NamedTuple):
+    """ Параметры одного чертежа """
+
+    t: Tuple[int, int, int]
+    c: Tuple[int, int, int]
+    projection: SelectProjection = SelectProjection.ORT
+    size: Tuple[int, int] = DEFAULT_SIZE
+
+
+class OffscreenRenderer(object):
+    """
+    Рисует аксонометрический или комплексный чертеж в QImage
+
+    Использует те же Scene и системы координат (update_pixmap), что и
+    окно программы. Изображение, в которое идет отрисовка, создается
+    один раз и пересоздается только при смене размера.
+    """
+
+    def __init__(self, size: Tuple[int, int] = DEFAULT_SIZE) -> None:
+        ensure_application()
+
+        self.scene: Scene = Scene()
+
+        qsize = QtCore.QSize(*size)
+        self.aps = AxonometricPlaneSystem(size=qsize)
+        self.cps = ComplexPlaneSystem(size=qsize)
+
+    def render(
+            self,
+            t: Tuple[int, int, int],
+            c: Tuple[int, int, int],
+            projection: SelectProjection = SelectProjection.ORT,
+            size: Tuple[int, int] = DEFAULT_SIZE,
+            plane: str = PLANE_AX
+    ) -> QtGui.QImage:
+        """ Рисует чертеж и возвращает копию изображения """
+        return self.draw(RenderConfig(t, c, projection, size), plane).copy()
+
+    def render_png(
+            self,
+            t: Tuple[int, int, int],
+            c: Tuple[int, int, int],
+            projection: SelectProjection = SelectProjection.ORT,
+            size: Tuple[int, int] = DEFAULT_SIZE,
+            plane: str = PLANE_AX
+    ) -> bytes:
+        """ Рисует чертеж и возвращает его в формате PNG """
+        return self.to_png(
+            self.draw(RenderConfig(t, c, projection, size), plane)
+        )
+
+    def render_many(
+            self, configs: Iterable[RenderConfig], plane: str = PLANE_AX
+    ) -> List[bytes]:
+        """
+        Рисует несколько чертежей подряд в одно и то же изображение
+        и возвращает их в формате PNG
+        """
+        return [self.to_png(self.draw(config, plane)) for config in configs]
+
+    def draw(self, config: RenderConfig, plane: str) -> QtGui.QImage:
+        """
+        Рисует чертеж в общее изображение системы координат
+        и возвращает его (без копирования)
+        """
+        if plane not in (PLANE_AX, PLANE_CX):
+            raise ValueError(f"Unknown plane: {plane!r}")
+
+        scene = self.scene
+        scene.set_t(*config.t)
+        scene.set_c(*config.c)
+        scene.selected_projection = config.projection
+        scene.set_size(*config.size)
+
+        size = QtCore.QSize(*config.size)
+
+        if plane == PLANE_CX:
+            scene.recalculate_ep_coordinates()
+            return self.draw_plane(self.cps, size, scene.points_2d_cx)
+
+        scene.fill_3d_coordinates()
+        scene.recalculate_ax_coordinates()
+
+        if scene.ax_error is not None:
+            self.aps.resize(size)
+            self.aps.show_error(scene.ax_error)
+            return self.aps.pixmap
+
+        self.aps.error = False
+        self.aps.set_edges(scene.ax_edges)
+        return self.draw_plane(self.aps, size, scene.points_2d_ax)
+
+    @staticmethod
+    def draw_plane(plane_system, size: QtCore.QSize, points) -> QtGui.QImage:
+        plane_system.resize(size)
+        plane_system.update_plane(points)
+        plane_system.update_pixmap()
+        return plane_system.pixmap
+
+    @staticmethod
+    def to_png(image: QtGui.QImage) -> bytes:
+        data = QtCore.QByteArray()
+        buffer = QtCore.QBuffer(data)
+        buffer.open(QtCore.QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        buffer.close()
+        return bytes(data)
@@ -1,13 +1,28 @@
 # coding: utf-8
 
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from core.clipping import clip_lines
+from core.point_cloud import bin_points, density_image
 from gui.base.base_plane_system import BasePlaneSystem
+from gui.base.framebuffer import Framebuffer
+from gui.base.qt_arrays import array_view, rgba_image, to_line_array
+from gui.settings import LOD_POINTS
 
 
 class AxonometricPlaneSystem(BasePlaneSystem):
-    def __init__(self, widget: QtWidgets.QWidget) -> None:
-        super().__init__(widget)
+    TRACE_NAME: str = "ax"
+
+    def __init__(
+            self,
+            widget: Optional[QtWidgets.QWidget] = None,
+            size: Optional[QtCore.QSize] = None
+    ) -> None:
+        super().__init__(widget, size)
 
         # Цвета осей координат
         self.x_line_color = QtGui.QColor("blue")
@@ -30,31 +45,137 @@ class AxonometricPlaneSystem(BasePlaneSystem):
             self.z_line_color, self.line_width, QtCore.Qt.DashLine
         )
 
-    def update_pixmap(self) -> None:
-        painter: QtGui.QPainter = QtGui.QPainter(self.pixmap)
-        painter.begin(self.pixmap)
-
-        # Включаем склаживание
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-
-        painter.setBrush(self.point_brush)
-        painter.drawRect(0, 0, self.widget.width(), self.widget.height())
-
-        painter.setBackground(self.point_brush)
+        # Кисть для ребер модели (ребра хранятся в массиве отрезков)
+        self.mesh_pen = self.line_array_pen
+
+        # Оси ("X", "Y", "Z") и ребра параллелепипеда ("box"):
+        # массивы отрезков K×4, уже отсеченные ближней плоскостью
+        # (см. Scene.ax_edges)
+        self.edges: Dict[str, np.ndarray] = {}
+
+        # Изображение видимых ребер модели (z-буфер, см. core.raster):
+        # QImage ссылается на память массива, поэтому храним и массив.
+        # Сцена рисует ребра прямо в mesh_framebuffer
+        # (Scene.mesh_framebuffer) - его QImage пересоздается только
+        # при смене размера
+        self.mesh_raster: Optional[np.ndarray] = None
+        self.mesh_image: Optional[QtGui.QImage] = None
+        self.mesh_framebuffer: Framebuffer = Framebuffer(
+            self.width, self.height
+        )
 
-        if not self.points:
-            return
+        # Количество точек облака в пикселях (H×W, см. core.point_cloud)
+        self.cloud_counts: Optional[np.ndarray] = None
+
+        # Уровень детализации: если в массиве точек (set_point_array)
+        # больше lod_threshold точек, вместо drawPoints рисуется
+        # плотность точек по пикселям - время отрисовки зависит от
+        # размера чертежа, а не от числа точек (None - всегда drawPoints)
+        self.lod_threshold: Optional[int] = LOD_POINTS
+
+        # Плотность облака точек и массива точек рисуется прямо в
+        # память изображения (framebuffer); накопитель количества точек
+        # (H×W) пересоздается только при смене размера
+        self.density_counts: np.ndarray = np.zeros((0, 0), dtype=np.uint32)
+        self.enable_framebuffer()
+
+    def resize(self, size: QtCore.QSize) -> None:
+        super().resize(size)
+        self.mesh_framebuffer.resize(size.width(), size.height())
+
+    def background_key(self) -> Hashable:
+        """ Оси зависят от положения камеры: ключ - их концы на экране """
+        return tuple(
+            tuple(self.edges[name].ravel()) if name in self.edges else None
+            for name in ("X", "Y", "Z")
+        )
 
+    def draw_background(self, painter: QtGui.QPainter) -> None:
         # Рисуем все оси
         self.draw_all_axis(painter)
 
+    def set_edges(self, edges: Dict[str, np.ndarray]) -> None:
+        """ Задает оси и ребра параллелепипеда (см. Scene.ax_edges) """
+        self.edges = edges
+        self.dirty = True
+
+    def set_mesh_lines(self, lines: Optional[np.ndarray]) -> None:
+        """ Задает ребра модели на экране (массив E×4) """
+        self.set_line_array(lines)
+
+    def set_mesh_raster(self, raster: Optional[np.ndarray]) -> None:
+        """ Задает изображение видимых ребер модели (H×W×4, RGBA) """
+        self.mesh_raster = raster
+        if raster is None:
+            self.mesh_image = None
+        elif raster is self.mesh_framebuffer.array:
+            self.mesh_image = self.mesh_framebuffer.image
+        else:
+            self.mesh_image = rgba_image(raster)
+        self.dirty = True
+
+    def set_cloud_counts(self, counts: Optional[np.ndarray]) -> None:
+        """ Задает количество точек облака в пикселях (H×W) """
+        self.cloud_counts = counts
+        self.dirty = True
+
+    def draw_foreground(self, painter: QtGui.QPainter) -> None:
+        # Рисуем модель (облако точек - в draw_framebuffer)
+        if self.mesh_image is not None:
+            painter.drawImage(0, 0, self.mesh_image)
+        self.draw_arrays(painter)
+
         # Рисуем линии параллелепипеда
         self.draw_lines(painter)
 
         # Рисуем точки
         self.draw_points(painter)
 
-        # painter.end()     # вызывается автоматически
+    @property
+    def uses_lod(self) -> bool:
+        """ Массив точек рисуется изображением плотности """
+        return self.lod_threshold is not None \
+            and len(self.point_array) > self.lod_threshold
+
+    def draw_point_array(self, painter: QtGui.QPainter) -> None:
+        # Много точек - плотность в draw_framebuffer
+        if not self.uses_lod:
+            super().draw_point_array(painter)
+
+    def draw_framebuffer(self) -> bool:
+        """
+        Плотность облака точек и массива точек (при uses_lod):
+        количество точек в каждом пикселе (np.bincount, см.
+        core.point_cloud.bin_points) переводится в прозрачность
+        прямо в памяти framebuffer
+        """
+        cloud = self.cloud_counts
+        shape = (self.height, self.width)
+        if cloud is not None and cloud.shape != shape:
+            # Облако спроецировано для прежнего размера чертежа
+            cloud = None
+        if cloud is None and not self.uses_lod:
+            return False
+
+        if self.density_counts.shape != shape:
+            self.density_counts = np.zeros(shape, dtype=np.uint32)
+        if cloud is not None:
+            np.copyto(self.density_counts, cloud)
+        else:
+            self.density_counts.fill(0)
+
+        if self.uses_lod:
+            # Координаты читаются прямо из памяти sip.array, без копии
+            xy = array_view(self.point_array, 2)
+            bin_points(xy[:, 0], xy[:, 1], self.density_counts)
+
+        color = self.label_color
+        density_image(
+            self.density_counts,
+            (color.red(), color.green(), color.blue()),
+            out=self.framebuffer.array
+        )
+        return True
 
     def draw_all_axis(self, painter: QtGui.QPainter) -> None:
         """ Рисует оси координат """
@@ -64,22 +185,39 @@ class AxonometricPlaneSystem(BasePlaneSystem):
         self.draw_z_axis(painter)
 
     def draw_x_axis(self, painter: QtGui.QPainter) -> None:
-        axis: QtCore.QLineF = self.get_line(
-            self.points["+X"], self.points["0"]
+        self.draw_edge_axis(
+            painter, "X", self.x_line_pen, self.dashed_x_line_pen
         )
-        self.draw_axis(painter, axis, self.x_line_pen, self.dashed_x_line_pen)
 
     def draw_y_axis(self, painter: QtGui.QPainter) -> None:
-        axis: QtCore.QLineF = self.get_line(
-            self.points["+Y"], self.points["0"]
+        self.draw_edge_axis(
+            painter, "Y", self.y_line_pen, self.dashed_y_line_pen
         )
-        self.draw_axis(painter, axis, self.y_line_pen, self.dashed_y_line_pen)
 
     def draw_z_axis(self, painter: QtGui.QPainter) -> None:
-        axis: QtCore.QLineF = self.get_line(
-            self.points["+Z"], self.points["0"]
+        self.draw_edge_axis(
+            painter, "Z", self.z_line_pen, self.dashed_z_line_pen
         )
-        self.draw_axis(painter, axis, self.z_line_pen, self.dashed_z_line_pen)
+
+    def draw_edge_axis(
+            self,
+            painter: QtGui.QPainter,
+            name: str,
+            pen: QtGui.QPen,
+            dash_pen: QtGui.QPen
+    ) -> None:
+        """ Рисует ось name, если она видна """
+        lines = self.clipped_edges(name)
+        if len(lines):
+            axis = QtCore.QLineF(*lines[0])
+            self.draw_axis(painter, axis, pen, dash_pen)
+
+    def clipped_edges(self, name: str) -> np.ndarray:
+        """ Отрезки edges[name], отсеченные по границам "полотна" """
+        lines = self.edges.get(name)
+        if lines is None:
+            return np.empty((0, 4))
+        return clip_lines(lines, (0, 0, self.width, self.height))
 
     def draw_lines(self, painter: QtGui.QPainter) -> None:
         """ Рисует линии параллелепипеда """
@@ -88,44 +226,23 @@ class AxonometricPlaneSystem(BasePlaneSystem):
         painter.setPen(self.label_pen)
         painter.setBackground(QtCore.Qt.white)
 
-        painter.drawLine(self.points["T"], self.points["T1"])
-        painter.drawLine(self.points["T"], self.points["T2"])
-        painter.drawLine(self.points["T"], self.points["T3"])
-
-        painter.drawLine(self.points["T1"], self.points["TX"])
-        painter.drawLine(self.points["T1"], self.points["TY"])
-
-        painter.drawLine(self.points["T2"], self.points["TY"])
-        painter.drawLine(self.points["T2"], self.points["TZ"])
-
-        painter.drawLine(self.points["T3"], self.points["TX"])
-        painter.drawLine(self.points["T3"], self.points["TZ"])
-
-        painter.drawLine(self.points["TX"], self.points["0"])
-        painter.drawLine(self.points["TY"], self.points["0"])
-        painter.drawLine(self.points["TZ"], self.points["0"])
+        # Все ребра - одним вызовом, отсеченные по границам "полотна"
+        painter.drawLines(to_line_array(self.clipped_edges("box")))
 
     def show_error(self, text: str) -> None:
         self.error = True
         painter: QtGui.QPainter = QtGui.QPainter(self.pixmap)
-        painter.begin(self.pixmap)
 
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
         painter.setBrush(self.point_brush)
-        painter.drawRect(0, 0, self.widget.width(), self.widget.height())
+        painter.drawRect(0, 0, self.width, self.height)
 
         painter.setBackground(self.point_brush)
 
         painter.drawText(
-            QtCore.QRect(0, 0, self.widget.width(), self.widget.height()),
+            QtCore.QRect(0, 0, self.width, self.height),
             QtCore.Qt.AlignCenter,
             text
         )
 
-    @property
-    def width(self):
-        return self.widget.width()
-
-    @property
-    def height(self):
-        return self.widget.height()
+        painter.end()
@@ -1,13 +1,25 @@
 # coding: utf-8
 
+from typing import Hashable, Optional, Tuple
+
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from gui.base.base_plane_system import BasePlaneSystem
 
 
 class ComplexPlaneSystem(BasePlaneSystem):
-    def __init__(self, widget: QtWidgets.QWidget) -> None:
-        super().__init__(widget)
+    TRACE_NAME: str = "cx"
+
+    # Ломаные линий связи: TY1 -> T1 -> TX -> T2 -> TZ -> T3 -> TY3
+    T_POLYLINE: Tuple[str, ...] = ("TY1", "T1", "TX", "T2", "TZ", "T3", "TY3")
+    C_POLYLINE: Tuple[str, ...] = ("CY1", "C1", "CX", "C2", "CZ", "C3", "CY3")
+
+    def __init__(
+            self,
+            widget: Optional[QtWidgets.QWidget] = None,
+            size: Optional[QtCore.QSize] = None
+    ) -> None:
+        super().__init__(widget, size)
 
         # Цвета оси координат XY
         self.xy_x_line_color = QtGui.QColor("blue")
@@ -29,35 +41,31 @@ class ComplexPlaneSystem(BasePlaneSystem):
             self.c_line_color, self.line_width
         )
 
-    def update_pixmap(self) -> None:
-        painter: QtGui.QPainter = QtGui.QPainter(self.pixmap)
-        painter.begin(self.pixmap)
-
-        # Включаем сглаживание
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-
-        painter.setBrush(self.point_brush)
-        painter.drawRect(0, 0, self.widget.width(), self.widget.height())
-        painter.setBackground(QtGui.QColor("white"))
-
+    def background_key(self) -> Hashable:
+        """ Оси не зависят от камеры: ключ - только их концы """
         if not self.points:
-            painter.end()
-            return
+            return None
+        return tuple(
+            (self.points[name].x(), self.points[name].y())
+            for name in ("+X -Y", "-X +Y", "+Z -Y", "-Z +Y")
+        )
 
+    def draw_background(self, painter: QtGui.QPainter) -> None:
         # Переходим в центр координат
         painter.translate(self.xhalf, self.yhalf)
 
         # рисуем оси
         self.draw_all_axis(painter)
 
+    def draw_foreground(self, painter: QtGui.QPainter) -> None:
+        painter.translate(self.xhalf, self.yhalf)
+
         # рисуем линии
         self.draw_lines(painter)
 
         # рисуем точки
         self.draw_points(painter)
 
-        painter.end()
-
     def draw_all_axis(self, painter: QtGui.QPainter) -> None:
         self.draw_xy_axis(painter)
         self.draw_zy_axis(painter)
@@ -80,23 +88,8 @@ class ComplexPlaneSystem(BasePlaneSystem):
         painter.setPen(self.label_pen)
         painter.setBackground(QtCore.Qt.white)
 
-        # из TY1 в T1
-        painter.drawLine(self.points["TY1"], self.points["T1"])
-
-        # из T1 в TX
-        painter.drawLine(self.points["T1"], self.points["TX"])
-
-        # из TX в T2
-        painter.drawLine(self.points["TX"], self.points["T2"])
-
-        # из T2 в TZ
-        painter.drawLine(self.points["T2"], self.points["TZ"])
-
-        # из TZ в T3
-        painter.drawLine(self.points["TZ"], self.points["T3"])
-
-        # Из T3 в TY3
-        painter.drawLine(self.points["T3"], self.points["TY3"])
+        # линии связи - одной ломаной
+        self.draw_polyline(painter, self.T_POLYLINE)
 
         # рисуем сектор
         self.draw_arc(painter, self.points["TY3"].x(), self.points["TY1"].y())
@@ -105,35 +98,30 @@ class ComplexPlaneSystem(BasePlaneSystem):
         painter.setPen(self.c_label_pen)
         painter.setBackground(QtCore.Qt.white)
 
-        # из TY1 в C1
-        painter.drawLine(self.points["CY1"], self.points["C1"])
-
-        # из C1 в CX
-        painter.drawLine(self.points["C1"], self.points["CX"])
-
-        # из CX в C2
-        painter.drawLine(self.points["CX"], self.points["C2"])
-
-        # из C2 в CZ
-        painter.drawLine(self.points["C2"], self.points["CZ"])
-
-        # из CZ в C3
-        painter.drawLine(self.points["CZ"], self.points["C3"])
-
-        # Из C3 в CY3
-        painter.drawLine(self.points["C3"], self.points["CY3"])
+        # линии связи - одной ломаной
+        self.draw_polyline(painter, self.C_POLYLINE)
 
         # рисуем сектор
         self.draw_arc(painter, self.points["CY3"].x(), self.points["CY1"].y())
 
+    def draw_polyline(
+            self, painter: QtGui.QPainter, names: Tuple[str, ...]
+    ) -> None:
+        """ Рисует ломаную через точки с именами names """
+        painter.drawPolyline(
+            QtGui.QPolygonF([self.points[name] for name in names])
+        )
+
     @staticmethod
-    def draw_arc(painter: QtGui.QPainter, x: int, y: int) -> None:
+    def draw_arc(painter: QtGui.QPainter, x: float, y: float) -> None:
+        x, y = int(x), int(y)
+
         angle: int = 90 * 16
         if y > 0:
             angle = 270 * 16
 
-        width: float = -2 * x
-        height: float = -2 * y
+        width: int = -2 * x
+        height: int = -2 * y
 
         span_angle: int = 90 * 16
         painter.drawArc(x, y, width, height, angle, span_angle)
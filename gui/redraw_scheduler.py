@@ -0,0 +1,102 @@
+# coding: utf-8
+
+from time import perf_counter
+from typing import Callable, Dict
+
+from PyQt5 import QtCore
+
+
+class RedrawScheduler(QtCore.QObject):
+    """
+    Планировщик перерисовки
+
+    Запросы (request), пришедшие до начала очередного кадра,
+    объединяются: callback вызывается не чаще max_fps раз в секунду.
+
+    Счетчики:
+
+    - `requests` - всего запросов
+    - `coalesced` - запросов, объединенных с уже запланированным кадром
+    - `frames` - выполненных пересчетов
+    - `dropped` - пропущенных кадров (кадр начался позже срока
+      на целое число интервалов)
+    """
+
+    def __init__(
+            self,
+            callback: Callable[[], None],
+            max_fps: float = 60,
+            parent: QtCore.QObject = None
+    ) -> None:
+        super().__init__(parent)
+
+        self.callback: Callable[[], None] = callback
+
+        self._interval: float = 0
+        self.max_fps = max_fps
+
+        self._timer: QtCore.QTimer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+
+        # Время последнего кадра и срок следующего
+        self._last_frame: float = float("-inf")
+        self._deadline: float = 0
+
+        self.requests: int = 0
+        self.coalesced: int = 0
+        self.frames: int = 0
+        self.dropped: int = 0
+
+    @property
+    def max_fps(self) -> float:
+        return 1 / self._interval
+
+    @max_fps.setter
+    def max_fps(self, value: float) -> None:
+        if value <= 0:
+            raise ValueError("max_fps must be positive")
+        self._interval = 1 / value
+
+    @property
+    def pending(self) -> bool:
+        """ Кадр запланирован, но еще не выполнен """
+        return self._timer.isActive()
+
+    def request(self) -> None:
+        """ Запрашивает перерисовку """
+        self.requests += 1
+
+        if self.pending:
+            self.coalesced += 1
+            return
+
+        now = perf_counter()
+        self._deadline = max(now, self._last_frame + self._interval)
+        self._timer.start(int((self._deadline - now) * 1000))
+
+    def flush(self) -> None:
+        """ Выполняет запланированный кадр немедленно """
+        self._timer.stop()
+
+        now = perf_counter()
+        late = now - self._deadline
+        if late > self._interval:
+            self.dropped += int(late / self._interval)
+
+        self._last_frame = now
+        self.frames += 1
+        self.callback()
+
+    def cancel(self) -> None:
+        """ Отменяет запланированный кадр """
+        self._timer.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "frames": self.frames,
+            "dropped": self.dropped,
+        }
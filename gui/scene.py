@@ -0,0 +1,614 @@
+# coding: utf-8
+
+import enum
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+from PyQt5 import QtCore
+
+from core.clipping import NEAR_W, clip_lines, project_edges
+from core.dependency_graph import DependencyGraph
+from core.matrix import Matrix
+from core.points import Point3D, PointArray
+from core.view_transform import ViewTransform
+from gui.settings import *
+
+if TYPE_CHECKING:
+    # Модель, облако и z-буфер импортируются при первой загрузке
+    from core.mesh import Mesh
+    from core.point_cloud import PointCloud
+    from core.raster import Rasterizer
+    from gui.base.framebuffer import Framebuffer
+
+
+class SelectProjection(enum.Enum):
+    """
+    Выбираемое проецирование:
+
+    - `CEN` - центральное
+    - `ORT` - ортогональное
+    """
+
+    CEN = enum.auto()
+    ORT = enum.auto()
+
+
+class Scene(object):
+    """
+    Расчет точек аксонометрического и комплексного чертежей
+
+    Не зависит от виджетов: по координатам точек T, C, виду
+    проецирования и размеру аксонометрического чертежа вычисляет
+    points_2d_ax и points_2d_cx. Если аксонометрический чертеж
+    построить нельзя, текст ошибки записывается в ax_error.
+
+    Линии аксонометрического чертежа (оси и ребра параллелепипеда)
+    отсекаются ближней плоскостью до деления на w и записываются
+    в ax_edges; точки позади камеры в points_2d_ax не попадают.
+    """
+
+    # Оси аксонометрического чертежа (пары имен точек)
+    AX_AXES: Dict[str, Tuple[str, str]] = {
+        "X": ("+X", "0"),
+        "Y": ("+Y", "0"),
+        "Z": ("+Z", "0"),
+    }
+
+    # Ребра параллелепипеда (пары имен точек)
+    AX_BOX_EDGES: Tuple[Tuple[str, str], ...] = (
+        ("T", "T1"), ("T", "T2"), ("T", "T3"),
+        ("T1", "TX"), ("T1", "TY"),
+        ("T2", "TY"), ("T2", "TZ"),
+        ("T3", "TX"), ("T3", "TZ"),
+        ("TX", "0"), ("TY", "0"), ("TZ", "0"),
+    )
+
+    def __init__(self) -> None:
+        self.axis_length: int = 100
+
+        # Координаты точки T
+        self.xT: int = POINT_XT
+        self.yT: int = POINT_YT
+        self.zT: int = POINT_ZT
+
+        # Координаты точки C (Камеры)
+        self.xC: int = POINT_XC
+        self.yC: int = POINT_YC
+        self.zC: int = POINT_ZC
+
+        self.selected_projection: SelectProjection = SelectProjection.ORT
+
+        # Размер аксонометрического чертежа
+        self.width: int = 0
+        self.height: int = 0
+
+        # Точки 3D
+        self.points_3d: PointArray = PointArray()
+
+        # Точки аксонометрического чертежа
+        self.points_2d_ax: Dict[str, QtCore.QPointF] = {}
+
+        # Линии аксонометрического чертежа: оси "X", "Y", "Z" и ребра
+        # параллелепипеда "box" - массивы отрезков K×4 (x1, y1, x2, y2)
+        self.ax_edges: Dict[str, np.ndarray] = {}
+
+        # Точки комплексного чертежа
+        self.points_2d_cx: Dict[str, QtCore.QPointF] = {}
+        self.fill_cx_service_points()
+
+        # Построитель матрицы вида (с кэшем)
+        self.view_transform: ViewTransform = ViewTransform()
+
+        # Загруженная модель (вписана в оси) и ее ребра на экране (E×4)
+        self.mesh: Optional["Mesh"] = None
+        self.mesh_lines: Optional[np.ndarray] = None
+
+        # Удаление невидимых линий модели: вместо ребер рисуется
+        # изображение видимых ребер mesh_raster (H×W×4, RGBA)
+        self.hidden_lines: bool = False
+        self.mesh_raster: Optional[np.ndarray] = None
+        self.rasterizer: Optional["Rasterizer"] = None
+
+        # Изображение, в память которого рисуется mesh_raster (задает
+        # окно - Framebuffer аксонометрического чертежа): кадр не
+        # выделяет память под изображение. None - новое на каждый кадр
+        self.mesh_framebuffer: Optional["Framebuffer"] = None
+
+        # Тип координат вершин модели (float64 или float32)
+        self.precision: np.dtype = np.dtype(PRECISION)
+
+        # Облако точек (файл открыт через np.memmap) и количество его
+        # точек в пикселях аксонометрического чертежа (H×W)
+        self.cloud: Optional["PointCloud"] = None
+        self.cloud_counts: Optional[np.ndarray] = None
+
+        # Ошибка построения аксонометрического чертежа
+        self.ax_error: Optional[str] = None
+
+        # Граф зависимостей: пересчитываются только те точки,
+        # входы которых изменились
+        self.graph: DependencyGraph = DependencyGraph()
+        self.build_graph()
+
+    def build_graph(self) -> None:
+        graph = self.graph
+
+        # Входы
+        graph.add_input("t")
+        graph.add_input("c")
+        graph.add_input("projection")
+        graph.add_input("viewport")
+        graph.add_input("mesh")
+        graph.add_input("hidden_lines")
+        graph.add_input("precision")
+        graph.add_input("cloud")
+
+        # Этапы для трассировки (span) - по методам пересчета
+        ax_span = "recalculate_ax_coordinates"
+        ep_span = "recalculate_ep_coordinates"
+
+        # Аксонометрический чертеж
+        graph.add_node(
+            "world_points",
+            self.compute_world_points,
+            ("t",),
+            span="fill_3d_coordinates"
+        )
+        graph.add_node(
+            "view_matrix",
+            self.compute_view_matrix,
+            ("c", "projection", "viewport"),
+            span=ax_span
+        )
+        graph.add_node(
+            "ax_homogeneous",
+            self.compute_ax_homogeneous,
+            ("world_points", "view_matrix"),
+            span=ax_span
+        )
+        graph.add_node(
+            "ax_points",
+            self.compute_ax_points,
+            ("ax_homogeneous",),
+            span=ax_span
+        )
+        graph.add_node(
+            "ax_edges",
+            self.compute_ax_edges,
+            ("ax_homogeneous", "ax_points"),
+            span=ax_span
+        )
+
+        # Модель
+        graph.add_node(
+            "mesh_world",
+            self.compute_mesh_world,
+            ("mesh", "precision"),
+            span="mesh"
+        )
+        graph.add_node(
+            "mesh_lines",
+            self.compute_mesh_lines,
+            ("mesh", "mesh_world", "view_matrix", "hidden_lines"),
+            span="mesh"
+        )
+        graph.add_node(
+            "depth_matrix",
+            self.compute_depth_matrix,
+            ("c", "projection", "viewport", "mesh", "hidden_lines"),
+            span="mesh"
+        )
+        graph.add_node(
+            "mesh_raster",
+            self.compute_mesh_raster,
+            ("mesh", "mesh_world", "depth_matrix", "hidden_lines"),
+            span="mesh"
+        )
+
+        # Облако точек: вписывание в оси (проход по файлу при открытии)
+        # и проецирование порциями
+        graph.add_node(
+            "cloud_fit", self.compute_cloud_fit, ("cloud",), span="cloud"
+        )
+        graph.add_node(
+            "cloud_counts",
+            self.compute_cloud_counts,
+            ("cloud", "cloud_fit", "view_matrix", "precision"),
+            span="cloud"
+        )
+
+        # Комплексный чертеж: половины для точек T и C
+        graph.add_node("cx_t", self.compute_cx_t, ("t",), span=ep_span)
+        graph.add_node("cx_c", self.compute_cx_c, ("c",), span=ep_span)
+        graph.add_node(
+            "cx_points",
+            self.compute_cx_points,
+            ("cx_t", "cx_c"),
+            span=ep_span
+        )
+
+    def sync(self) -> None:
+        """ Передает текущие параметры сцены во входы графа """
+        graph = self.graph
+        graph.set_input("t", (self.xT, self.yT, self.zT))
+        graph.set_input("c", (self.xC, self.yC, self.zC))
+        graph.set_input("projection", self.selected_projection)
+        graph.set_input("viewport", (self.width, self.height))
+        graph.set_input("mesh", self.mesh)
+        graph.set_input("hidden_lines", self.hidden_lines)
+        graph.set_input("precision", self.precision)
+        graph.set_input("cloud", self.cloud)
+
+    def set_t(self, x: int, y: int, z: int) -> None:
+        self.xT, self.yT, self.zT = x, y, z
+
+    def set_c(self, x: int, y: int, z: int) -> None:
+        self.xC, self.yC, self.zC = x, y, z
+
+    def set_mesh(self, mesh: Optional["Mesh"]) -> None:
+        """ Задает модель (вписывается в оси) или убирает ее (None) """
+        self.mesh = mesh.fitted(self.axis_length) if mesh is not None \
+            else None
+
+    def set_cloud(self, cloud: Optional["PointCloud"]) -> None:
+        """
+        Задает облако точек или убирает его (None)
+
+        Данные облака не изменяются: вписывание в оси применяется
+        матрицей (PointCloud.fit_matrix) при проецировании
+        """
+        self.cloud = cloud
+
+    def set_size(self, width: int, height: int) -> None:
+        """ Размер аксонометрического чертежа """
+        self.width, self.height = width, height
+
+    def fill_3d_coordinates(self):
+        self.sync()
+        self.graph.get("world_points")
+
+    def compute_world_points(self, t: Tuple[int, int, int]) -> PointArray:
+        x, y, z = t
+
+        self.points_3d["T"] = Point3D(x, y, z)
+        self.points_3d["0"] = Point3D(0, 0, 0)
+
+        self.points_3d["TX"] = Point3D(x, 0, 0)
+        self.points_3d["TY"] = Point3D(0, y, 0)
+        self.points_3d["TZ"] = Point3D(0, 0, z)
+
+        self.points_3d["T1"] = Point3D(x, y, 0)
+        self.points_3d["T2"] = Point3D(0, y, z)
+        self.points_3d["T3"] = Point3D(x, 0, z)
+
+        self.points_3d["+X"] = Point3D(self.axis_length, 0, 0)
+        self.points_3d["+Y"] = Point3D(0, self.axis_length, 0)
+        self.points_3d["+Z"] = Point3D(0, 0, self.axis_length)
+        return self.points_3d
+
+    def recalculate_ax_coordinates(self):
+        """
+        Пересчитываем из 3D в координаты экрана
+        (для аксонометрического чертежа)
+        """
+        self.sync()
+        self.graph.get("ax_points")
+        self.graph.get("ax_edges")
+
+    def compute_view_matrix(
+            self,
+            camera: Tuple[int, int, int],
+            projection: SelectProjection,
+            viewport: Tuple[int, int]
+    ) -> Optional[Matrix]:
+        """
+        Итоговая матрица преобразования (берется из кэша, если камера
+        и размер чертежа уже встречались)
+        """
+        if not any(camera):
+            return None
+
+        width, height = viewport
+        return self.view_transform.matrix(
+            camera, projection == SelectProjection.CEN, width, height
+        )
+
+    def compute_depth_matrix(
+            self,
+            camera: Tuple[int, int, int],
+            projection: SelectProjection,
+            viewport: Tuple[int, int],
+            mesh: Optional["Mesh"] = None,
+            hidden_lines: bool = True
+    ) -> Optional[Matrix]:
+        """
+        Матрица вида с глубиной в третьем столбце (для z-буфера);
+        None, если z-буфер не используется
+        """
+        if not any(camera) or not self.uses_raster(mesh, hidden_lines):
+            return None
+
+        width, height = viewport
+        return self.view_transform.matrix(
+            camera, projection == SelectProjection.CEN, width, height,
+            depth=True
+        )
+
+    @staticmethod
+    def compute_ax_homogeneous(
+            points_3d: PointArray, product: Optional[Matrix]
+    ) -> Optional[PointArray]:
+        """
+        Точки чертежа после матрицы вида, до деления на w - одно
+        умножение на кадр: из него получаются и точки (ax_points),
+        и отсеченные линии (ax_edges)
+        """
+        if product is None:
+            return None
+        return points_3d.transform(product, divide=False)
+
+    def compute_ax_points(
+            self, homogeneous: Optional[PointArray]
+    ) -> Dict[str, QtCore.QPointF]:
+        self.ax_error = None
+
+        # Выполняем проверки
+        if not self.can_be_drawn():
+            return self.points_2d_ax
+
+        # Точки за пределами экрана не мешают чертежу - отрезки
+        # отсекаются при отрисовке, точки позади камеры (w < NEAR_W)
+        # не рисуются
+        in_front = homogeneous.values[:, 3] >= NEAR_W
+
+        self.apply_points(homogeneous.divided(), in_front)
+        return self.points_2d_ax
+
+    def compute_ax_edges(
+            self,
+            homogeneous: Optional[PointArray],
+            *_
+    ) -> Dict[str, np.ndarray]:
+        """
+        Оси и ребра параллелепипеда на экране, отсеченные ближней
+        плоскостью (см. ax_edges)
+        """
+        if self.ax_error is not None:
+            self.ax_edges = {}
+            return self.ax_edges
+
+        index = homogeneous.index
+        names = list(self.AX_AXES.values()) + list(self.AX_BOX_EDGES)
+        edges = np.array([(index[a], index[b]) for a, b in names])
+
+        lines, visible = project_edges(homogeneous.values, edges)
+
+        axes = len(self.AX_AXES)
+        self.ax_edges = {
+            name: lines[i:i + 1][visible[i:i + 1]]
+            for i, name in enumerate(self.AX_AXES)
+        }
+        self.ax_edges["box"] = lines[axes:][visible[axes:]]
+        return self.ax_edges
+
+    @staticmethod
+    def compute_mesh_world(
+            mesh: Optional["Mesh"], precision: np.dtype = np.float64
+    ) -> Optional[PointArray]:
+        """ Вершины модели в однородных координатах типа precision """
+        if mesh is None:
+            return None
+        return PointArray.from_array(mesh.vertices, dtype=precision)
+
+    def compute_mesh_lines(
+            self,
+            mesh: Optional["Mesh"],
+            world: Optional[PointArray],
+            product: Optional[Matrix],
+            hidden_lines: bool = False
+    ) -> Optional[np.ndarray]:
+        """
+        Ребра модели на экране: массив E×4 (x1, y1, x2, y2),
+        отсеченный по границам экрана
+        """
+        if mesh is None or product is None \
+                or self.uses_raster(mesh, hidden_lines):
+            self.mesh_lines = None
+        else:
+            homogeneous = world.transform(product, divide=False)
+            lines, visible = project_edges(homogeneous.values, mesh.edges)
+            if not visible.all():
+                lines = lines[visible]
+            self.mesh_lines = clip_lines(lines, self.screen_rect())
+        return self.mesh_lines
+
+    @staticmethod
+    def uses_raster(mesh: Optional["Mesh"], hidden_lines: bool) -> bool:
+        """
+        Модель рисуется через z-буфер: включено удаление невидимых
+        линий и у модели есть грани
+        """
+        return hidden_lines and mesh is not None and len(mesh.faces) > 0
+
+    def compute_mesh_raster(
+            self,
+            mesh: Optional["Mesh"],
+            world: Optional[PointArray],
+            product: Optional[Matrix],
+            hidden_lines: bool
+    ) -> Optional[np.ndarray]:
+        """ Изображение видимых ребер модели (см. core.raster) """
+        if product is None or not self.uses_raster(mesh, hidden_lines):
+            self.mesh_raster = None
+        else:
+            from core.raster import Rasterizer, render_hidden_lines
+
+            if self.rasterizer is None:
+                self.rasterizer = Rasterizer(0, 0)
+            out = None
+            if self.mesh_framebuffer is not None:
+                self.mesh_framebuffer.resize(self.width, self.height)
+                out = self.mesh_framebuffer.array
+            homogeneous = world.transform(product, divide=False)
+            self.mesh_raster = render_hidden_lines(
+                homogeneous.values, mesh.edges, mesh.faces,
+                self.width, self.height, self.rasterizer, out=out
+            )
+        return self.mesh_raster
+
+    def compute_cloud_fit(
+            self, cloud: Optional["PointCloud"]
+    ) -> Optional[Matrix]:
+        """ Матрица, вписывающая облако точек в оси (как set_mesh) """
+        if cloud is None:
+            return None
+        return cloud.fit_matrix(self.axis_length)
+
+    def compute_cloud_counts(
+            self,
+            cloud: Optional["PointCloud"],
+            fit: Optional[Matrix],
+            product: Optional[Matrix],
+            precision: Optional[np.dtype] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Количество точек облака в пикселях: файл проецируется порциями
+        по cloud.chunk точек, память не зависит от размера облака.
+        Накопитель используется повторно, пока не изменится размер.
+        Порции вычисляются в типе precision (по умолчанию - точность
+        сцены self.precision, как у вершин модели)
+        """
+        if cloud is None or product is None:
+            self.cloud_counts = None
+            return None
+
+        if precision is None:
+            precision = self.precision
+
+        shape = (self.height, self.width)
+        if self.cloud_counts is None or self.cloud_counts.shape != shape:
+            self.cloud_counts = np.zeros(shape, dtype=np.uint32)
+        else:
+            self.cloud_counts.fill(0)
+
+        return cloud.project(
+            fit * product, self.width, self.height, self.cloud_counts,
+            dtype=precision
+        )
+
+    def screen_rect(self) -> Tuple[float, float, float, float]:
+        """ Границы экрана (xmin, ymin, xmax, ymax) """
+        return 0, 0, self.width, self.height
+
+    def apply_points(
+            self, points: PointArray, visible: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Переносит преобразованные точки на аксонометрический чертеж
+        (точки с visible[i] = False убираются с чертежа)
+        """
+        xy = points.xy().tolist()
+        for pname, i in points.index.items():
+            if visible is None or visible[i]:
+                self.points_2d_ax[pname] = QtCore.QPointF(*xy[i])
+            else:
+                self.points_2d_ax.pop(pname, None)
+
+    def recalculate_ep_coordinates(self):
+        """ Пересчитываем из 3D в координаты чертежа """
+        self.sync()
+        self.graph.get("cx_points")
+
+    def compute_cx_t(self, t: Tuple[int, int, int]) -> None:
+        """ Точки комплексного чертежа для точки T """
+        x_t, y_t, z_t = t
+        self.points_2d_cx["T1"] = QtCore.QPointF(-x_t, y_t)
+        self.points_2d_cx["T2"] = QtCore.QPointF(-x_t, -z_t)
+        self.points_2d_cx["T3"] = QtCore.QPointF(y_t, -z_t)
+
+        self.points_2d_cx["TX"] = QtCore.QPointF(-x_t, 0)
+        self.points_2d_cx["TY1"] = QtCore.QPointF(0, y_t)
+        self.points_2d_cx["TY3"] = QtCore.QPointF(y_t, 0)
+        self.points_2d_cx["TZ"] = QtCore.QPointF(0, -z_t)
+
+    def compute_cx_c(self, c: Tuple[int, int, int]) -> None:
+        """ Точки комплексного чертежа для точки C """
+        x_c, y_c, z_c = c
+        self.points_2d_cx["C1"] = QtCore.QPointF(-x_c, y_c)
+        self.points_2d_cx["C2"] = QtCore.QPointF(-x_c, -z_c)
+        self.points_2d_cx["C3"] = QtCore.QPointF(y_c, -z_c)
+
+        self.points_2d_cx["CX"] = QtCore.QPointF(-x_c, 0)
+        self.points_2d_cx["CY1"] = QtCore.QPointF(0, y_c)
+        self.points_2d_cx["CY3"] = QtCore.QPointF(y_c, 0)
+        self.points_2d_cx["CZ"] = QtCore.QPointF(0, -z_c)
+
+    def compute_cx_points(self, *_) -> Dict[str, QtCore.QPointF]:
+        self.fill_cx_service_points()
+        return self.points_2d_cx
+
+    def fill_cx_service_points(self) -> None:
+        """ "Служебные" точки комплексного чертежа (оси) """
+        self.points_2d_cx["0"] = QtCore.QPointF(0, 0)
+        self.points_2d_cx["+X -Y"] = QtCore.QPointF(-self.axis_length, 0)
+        self.points_2d_cx["-X +Y"] = QtCore.QPointF(self.axis_length, 0)
+        self.points_2d_cx["+Z -Y"] = QtCore.QPointF(0, -self.axis_length)
+        self.points_2d_cx["-Z +Y"] = QtCore.QPointF(0, self.axis_length)
+
+    # ПРОВЕРКИ
+
+    def can_be_drawn(self) -> bool:
+        if self.is_central_projection():
+            return self.cx_can_be_drawn()
+        else:
+            return self.ax_can_be_drawn()
+
+    def is_central_projection(self) -> bool:
+        """ Текущая проекция - центральная """
+        return self.selected_projection == SelectProjection.CEN
+
+    def ax_can_be_drawn(self) -> bool:
+        """
+        Проверка на возможность отрисовки точки при ортогональном проецировании
+        """
+        camera: Point3D = Point3D(self.xC, self.yC, self.zC)
+
+        if camera.in_origin():
+            self.draw_ax_error(
+                "Проекции не существует: камера в начале координат"
+            )
+            return False
+
+        return True
+
+    def cx_can_be_drawn(self) -> bool:
+        """
+        Проверка на возможность отрисовки точки при центральном проецировании
+        """
+
+        camera: Point3D = Point3D(self.xC, self.yC, self.zC)
+
+        # Если камера в начале координат
+        if camera.in_origin():
+            self.draw_ax_error(
+                "Проекции не существует: камера в начале координат"
+            )
+            return False
+
+        tpoint: Point3D = Point3D(self.xT, self.yT, self.zT)
+        # Координаты камеры равны точке T
+        if camera.equals(tpoint):
+            self.draw_ax_error(
+                "Проекции не существует: "
+                "координаты точки и камеры совпадают."
+            )
+            return False
+
+        # Камера внутри параллелепипеда или точка позади камеры
+        # чертежу не мешают: ребра отсекаются ближней плоскостью
+        # (см. compute_ax_edges)
+        return True
+
+    def draw_ax_error(self, text: str) -> None:
+        """ Запоминает ошибку аксонометрического чертежа """
+        self.ax_error = text
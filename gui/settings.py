@@ -9,3 +9,32 @@ POINT_ZT = 50
 POINT_XC = 100
 POINT_YC = 100
 POINT_ZC = 100
+
+# Точность координат модели в конвейере проецирования:
+# "float64" или "float32" (вдвое меньше памяти)
+PRECISION = "float64"
+
+# Облако точек (core.point_cloud): точек в порции при проецировании
+# и тип координат "сырых" файлов (.bin, .raw - x, y, z подряд)
+CLOUD_CHUNK = 1 << 18
+CLOUD_RAW_DTYPE = "float32"
+
+# Точек на аксонометрическом чертеже, начиная с которого вместо
+# кружков с надписями рисуется плотность точек по пикселям
+LOD_POINTS = 2000
+
+# Максимальная частота пересчета чертежей при движении ползунков (кадров/с)
+MAX_FPS = 60
+
+# Анимация камеры: частота кадров и длина траекторий (кадров)
+ANIMATION_FPS = 60
+ORBIT_FRAMES = 240
+FLYTHROUGH_FRAMES = 300
+
+# Точки пролета камеры (после текущего положения камеры)
+FLYTHROUGH_WAYPOINTS = (
+    (150, -50, 60),
+    (-50, -150, 120),
+    (-120, 80, 40),
+    (100, 100, 100),
+)
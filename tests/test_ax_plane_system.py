@@ -0,0 +1,125 @@
+# coding: utf-8
+
+"""
+Аксонометрический чертеж: уровень детализации массива точек,
+видимые ребра модели в памяти изображения чертежа
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+from PyQt5 import QtCore
+
+from core.mesh import Mesh
+from gui.base.base_plane_system import BasePlaneSystem
+from gui.plane_systems.ax_plane_system import AxonometricPlaneSystem
+from gui.scene import Scene, SelectProjection
+
+SIZE = QtCore.QSize(120, 80)
+
+
+@pytest.fixture
+def plane(qapp):
+    plane = AxonometricPlaneSystem(size=SIZE)
+    plane.lod_threshold = 100
+    # Чертеж рисуется, только если есть именованные точки
+    plane.update_plane({"0": QtCore.QPointF(60, 40)})
+    return plane
+
+
+@pytest.fixture
+def drawn(monkeypatch):
+    """ Вызовы drawPoints для массива точек """
+    calls = []
+    draw = BasePlaneSystem.draw_point_array
+
+    def draw_point_array(self, painter):
+        calls.append(len(self.point_array))
+        draw(self, painter)
+
+    monkeypatch.setattr(BasePlaneSystem, "draw_point_array", draw_point_array)
+    return calls
+
+
+def random_points(count: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.random((count, 2)) * (SIZE.width(), SIZE.height())
+
+
+def test_lod_keyed_on_point_array(plane):
+    # Именованных точек много, массив точек мал - уровень не включается
+    plane.update_plane({
+        f"P{i}": QtCore.QPointF(i % 100, i % 70) for i in range(500)
+    })
+    plane.set_point_array(random_points(10))
+    assert not plane.uses_lod
+
+    plane.set_point_array(random_points(101))
+    assert plane.uses_lod
+
+    plane.lod_threshold = None
+    assert not plane.uses_lod
+
+
+def test_sparse_array_drawn_as_points(plane, drawn):
+    plane.set_point_array(random_points(50))
+    plane.update_pixmap()
+
+    assert drawn == [50]
+    assert not plane.draw_framebuffer()
+
+
+def test_dense_array_drawn_as_density(plane, drawn):
+    points = random_points(5000)
+    # Точка за пределами чертежа в плотность не попадает
+    points[0] = (-10, 10)
+    plane.set_point_array(points)
+    plane.update_pixmap()
+
+    # drawPoints для массива не вызывается: все точки - в плотности
+    assert drawn == []
+    assert plane.density_counts.sum() == len(points) - 1
+    alpha = plane.framebuffer.array[..., 3]
+    assert np.count_nonzero(alpha) == np.count_nonzero(plane.density_counts)
+
+
+def test_mesh_raster_drawn_in_framebuffer(plane):
+    scene = Scene()
+    scene.set_size(SIZE.width(), SIZE.height())
+    scene.selected_projection = SelectProjection.CEN
+    scene.hidden_lines = True
+    scene.mesh_framebuffer = plane.mesh_framebuffer
+    # Мелкая модель: временные массивы растеризатора (по пикселям
+    # граней) меньше изображения, и пик памяти кадра показывает,
+    # выделялось ли изображение
+    scene.axis_length = 5
+    scene.set_mesh(Mesh.from_polygons(
+        [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 1]],
+        [[0, 1, 2, 3], [0, 1, 4], [1, 2, 4]]
+    ))
+
+    def frame() -> np.ndarray:
+        scene.sync()
+        raster = scene.graph.get("mesh_raster")
+        plane.set_mesh_raster(raster)
+        plane.update_pixmap()
+        return raster
+
+    frame()
+    framebuffer = plane.mesh_framebuffer
+    allocations = framebuffer.allocations
+
+    for camera in [(120, 90, 80), (90, 120, 70), (100, 100, 110)]:
+        scene.set_c(*camera)
+        tracemalloc.start()
+        raster = frame()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # Кадр рисуется в ту же память: изображение не выделяется
+        assert raster is framebuffer.array
+        assert plane.mesh_image is framebuffer.image
+        assert framebuffer.allocations == allocations
+        assert peak < raster.nbytes
+        assert (raster[..., 3] > 0).any()
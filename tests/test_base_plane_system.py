@@ -0,0 +1,86 @@
+# coding: utf-8
+
+""" Слои чертежа: кэш фона и перерисовка только устаревшего "полотна" """
+
+import pytest
+from PyQt5 import QtCore, QtGui
+
+from gui.base.base_plane_system import BasePlaneSystem
+
+SIZE = QtCore.QSize(120, 80)
+
+
+class CountingPlane(BasePlaneSystem):
+    """ Система координат, считающая перерисовки слоев """
+
+    def __init__(self, size: QtCore.QSize = SIZE) -> None:
+        super().__init__(size=size)
+        self.key = 0
+        self.backgrounds = 0
+        self.foregrounds = 0
+
+    def background_key(self):
+        return self.key
+
+    def draw_background(self, painter: QtGui.QPainter) -> None:
+        self.backgrounds += 1
+        painter.drawLine(0, self.key, self.width, self.key)
+
+    def draw_foreground(self, painter: QtGui.QPainter) -> None:
+        self.foregrounds += 1
+        self.draw_points(painter)
+
+
+@pytest.fixture
+def plane(qapp):
+    plane = CountingPlane()
+    plane.update_plane({"A": QtCore.QPointF(30, 40)})
+    plane.update_pixmap()
+    return plane
+
+
+def test_background_cached_while_key_unchanged(plane):
+    for x in (50, 60, 70):
+        plane.update_plane({"A": QtCore.QPointF(x, 40)})
+        assert plane.dirty
+        plane.update_pixmap()
+        assert not plane.dirty
+
+    assert plane.backgrounds == 1
+    assert plane.foregrounds == 4
+
+
+def test_background_redrawn_on_key_change(plane):
+    plane.key = 10
+    plane.update_pixmap()
+    assert plane.backgrounds == 2
+
+    plane.update_pixmap()
+    assert plane.backgrounds == 2
+
+
+def test_background_redrawn_on_resize(plane):
+    plane.resize(QtCore.QSize(SIZE))
+    assert not plane.dirty
+
+    plane.resize(QtCore.QSize(100, 100))
+    assert plane.dirty
+    plane.update_pixmap()
+    assert plane.backgrounds == 2
+    assert plane.pixmap.size() == QtCore.QSize(100, 100)
+
+
+def test_cached_layers_match_full_redraw(plane):
+    plane.key = 20
+    plane.update_plane({"B": QtCore.QPointF(70, 30)})
+    plane.update_pixmap()
+
+    full = CountingPlane()
+    full.layer_cache = False
+    full.key = 20
+    full.update_plane({"B": QtCore.QPointF(70, 30)})
+    full.update_pixmap()
+    full.update_pixmap()
+
+    assert full.backgrounds == 2
+    assert plane.pixmap == full.pixmap
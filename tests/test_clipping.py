@@ -0,0 +1,91 @@
+# coding: utf-8
+
+""" Отсечение отрезков: прямоугольник экрана и ближняя плоскость """
+
+import numpy as np
+
+from core.clipping import NEAR_W, clip_lines, inside_rect, project_edges
+
+RECT = (0, 0, 100, 100)
+
+
+def test_inside_unchanged():
+    lines = np.array([[10, 10, 20, 20], [0, 0, 100, 100]], dtype=float)
+
+    np.testing.assert_array_equal(clip_lines(lines, RECT), lines)
+
+
+def test_outside_dropped():
+    lines = np.array([
+        [-10, -10, -5, 200],    # левее прямоугольника
+        [150, 50, 120, 60],     # правее
+        [10, 110, 90, 130],     # ниже (y > ymax)
+    ], dtype=float)
+
+    assert clip_lines(lines, RECT).shape == (0, 4)
+
+
+def test_crossing_clipped():
+    lines = np.array([
+        [-10, 50, 110, 50],     # через обе вертикальные границы
+        [50, -50, 50, 50],      # начинается над прямоугольником
+        [50, 50, 150, 150],     # выходит через угол
+    ], dtype=float)
+
+    np.testing.assert_allclose(clip_lines(lines, RECT), [
+        [0, 50, 100, 50],
+        [50, 0, 50, 50],
+        [50, 50, 100, 100],
+    ])
+
+
+
+def test_inside_rect():
+    xy = np.array([[0, 0], [100, 50], [-1, 50], [50, 101]], dtype=float)
+
+    assert inside_rect(xy, RECT).tolist() == [True, True, False, False]
+
+
+def test_near_plane_cuts_edge_behind_camera():
+    # Второй конец позади камеры (w < 0): обрезается по w = NEAR_W
+    points = np.array([[10, 10, 0, 1], [-10, 30, 0, -1]], dtype=float)
+
+    lines, visible = project_edges(points.copy(), np.array([[0, 1]]))
+
+    t = (1 - NEAR_W) / 2
+    crossing = points[0] + t * (points[1] - points[0])
+    assert visible.tolist() == [True]
+    np.testing.assert_allclose(lines[0, :2], (10, 10))
+    np.testing.assert_allclose(lines[0, 2:], crossing[:2] / NEAR_W)
+
+
+def test_near_plane_drops_edge_behind_camera():
+    points = np.array([
+        [10, 10, 0, 1], [20, 10, 0, 0.5],     # перед камерой
+        [0, 0, 0, -1], [5, 5, 0, 0],          # позади и на уровне камеры
+    ], dtype=float)
+
+    lines, visible = project_edges(points, np.array([[0, 1], [2, 3]]))
+
+    assert visible.tolist() == [True, False]
+    np.testing.assert_allclose(lines[0], (10, 10, 40, 20))
+
+
+def test_scene_hides_points_behind_camera():
+    from gui.scene import Scene, SelectProjection
+
+    scene = Scene()
+    scene.set_size(402, 251)
+    scene.selected_projection = SelectProjection.CEN
+    # Камера между началом координат и точкой T
+    scene.set_c(20, 20, 20)
+    scene.set_t(80, 80, 80)
+    scene.fill_3d_coordinates()
+    scene.recalculate_ax_coordinates()
+
+    assert "T" not in scene.points_2d_ax
+    assert "0" in scene.points_2d_ax
+    lines = np.concatenate([
+        edges.reshape(-1, 4) for edges in scene.ax_edges.values()
+    ])
+    assert np.isfinite(lines).all()
@@ -0,0 +1,101 @@
+# coding: utf-8
+
+""" Граф зависимостей: порядок пересчета и пометка устаревших узлов """
+
+import pytest
+
+from core.dependency_graph import DependencyGraph
+
+
+@pytest.fixture
+def graph():
+    """ a -> b -> d, c -> d (a, c - входы); calls - порядок пересчета """
+    graph = DependencyGraph()
+    graph.calls = []
+
+    def node(name, compute):
+        def wrapped(*args):
+            graph.calls.append(name)
+            return compute(*args)
+        return wrapped
+
+    graph.add_input("a", 1)
+    graph.add_input("c", 10)
+    graph.add_node("b", node("b", lambda a: a * 2), ("a",))
+    graph.add_node("d", node("d", lambda b, c: b + c), ("b", "c"))
+    return graph
+
+
+def test_dependencies_computed_first(graph):
+    assert graph.get("d") == 12
+    assert graph.calls == ["b", "d"]
+
+
+def test_input_change_invalidates_dependents(graph):
+    graph.get("d")
+    graph.calls.clear()
+
+    assert graph.set_input("a", 2)
+    assert graph.is_stale("b") and graph.is_stale("d")
+
+    assert graph.get("d") == 14
+    assert graph.calls == ["b", "d"]
+
+
+def test_only_affected_nodes_recomputed(graph):
+    graph.get("d")
+    graph.calls.clear()
+
+    graph.set_input("c", 20)
+    assert not graph.is_stale("b") and graph.is_stale("d")
+
+    assert graph.get("d") == 22
+    assert graph.calls == ["d"]
+    assert graph.stats()["b"] == {"hits": 1, "misses": 1}
+
+
+def test_equal_input_keeps_values(graph):
+    graph.get("d")
+    graph.calls.clear()
+
+    assert not graph.set_input("a", 1)
+    assert graph.get("d") == 12
+    assert graph.calls == []
+
+
+def test_invalidate_marks_node_and_dependents(graph):
+    graph.get("d")
+    graph.calls.clear()
+
+    graph.invalidate("b")
+    assert graph.is_stale("b") and graph.is_stale("d")
+
+    graph.get("d")
+    assert graph.calls == ["b", "d"]
+
+
+def test_scene_recomputes_only_stale_stages():
+    from gui.scene import Scene
+
+    scene = Scene()
+    scene.set_size(402, 251)
+    scene.set_t(50, 50, 50)
+    scene.set_c(100, 100, 100)
+    scene.recalculate_ax_coordinates()
+    scene.recalculate_ep_coordinates()
+    before = scene.graph.stats()
+
+    # Камера изменилась: точка T и ее комплексный чертеж - нет
+    scene.set_c(100, 120, 100)
+    scene.recalculate_ax_coordinates()
+    scene.recalculate_ep_coordinates()
+    after = scene.graph.stats()
+
+    def recomputed(name):
+        return after[name]["misses"] - before[name]["misses"]
+
+    assert recomputed("view_matrix") == 1
+    assert recomputed("ax_points") == 1
+    assert recomputed("world_points") == 0
+    assert recomputed("cx_t") == 0
+    assert recomputed("cx_c") == 1
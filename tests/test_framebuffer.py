@@ -0,0 +1,48 @@
+# coding: utf-8
+
+""" Изображение в памяти NumPy: повторное использование памяти """
+
+import numpy as np
+from PyQt5 import QtGui
+
+from gui.base.framebuffer import Framebuffer
+
+
+def test_same_size_keeps_memory(qapp):
+    framebuffer = Framebuffer(40, 30)
+    array, image = framebuffer.array, framebuffer.image
+
+    assert not framebuffer.resize(40, 30)
+    assert framebuffer.array is array and framebuffer.image is image
+    assert framebuffer.allocations == 1
+
+
+def test_shrink_and_grow(qapp):
+    framebuffer = Framebuffer(40, 30)
+    memory = framebuffer.memory
+
+    # Меньший размер - та же память
+    assert framebuffer.resize(20, 10)
+    assert framebuffer.array.shape == (10, 20, 4)
+    assert framebuffer.memory is memory
+    assert np.shares_memory(framebuffer.array, memory)
+
+    # Обратно до прежнего размера - без выделения
+    framebuffer.resize(40, 30)
+    assert framebuffer.allocations == 1
+
+    # Больший размер - блок с запасом
+    framebuffer.resize(41, 30)
+    assert framebuffer.allocations == 2
+    assert len(framebuffer.memory) >= 40 * 30 * 4 * Framebuffer.GROWTH
+    framebuffer.resize(42, 31)
+    assert framebuffer.allocations == 2
+
+
+def test_image_shares_array_memory(qapp):
+    framebuffer = Framebuffer(8, 4)
+    framebuffer.clear()
+    framebuffer.array[2, 3] = (255, 0, 0, 255)
+
+    assert framebuffer.image.pixelColor(3, 2) == QtGui.QColor(255, 0, 0)
+    assert framebuffer.image.pixelColor(0, 0).alpha() == 0
@@ -0,0 +1,69 @@
+# coding: utf-8
+
+""" Кэш надписей QStaticText (gui.base.label_cache) """
+
+import pytest
+from PyQt5 import QtCore, QtGui
+
+from gui.base.label_cache import LabelCache
+
+
+@pytest.fixture
+def font(qapp):
+    return QtGui.QFont("monospace", 10)
+
+
+def test_hits_and_misses(font):
+    cache = LabelCache()
+
+    first = cache.get("T1", font)
+    assert cache.get("T1", font) is first
+    cache.get("T2", font)
+    cache.get("T1", QtGui.QFont("monospace", 14))
+
+    assert cache.stats() == {"size": 3, "maxsize": 256, "hits": 1, "misses": 3}
+
+
+def test_least_recently_used_evicted(font):
+    cache = LabelCache(maxsize=2)
+
+    a = cache.get("A", font)
+    cache.get("B", font)
+    cache.get("A", font)        # A использована позже B
+    cache.get("C", font)        # вытесняет B
+
+    assert len(cache) == 2
+    assert cache.get("A", font) is a
+    misses = cache.misses
+    cache.get("B", font)
+    assert cache.misses == misses + 1
+
+
+def render(draw) -> QtGui.QImage:
+    image = QtGui.QImage(80, 40, QtGui.QImage.Format_ARGB32)
+    image.fill(QtCore.Qt.white)
+    painter = QtGui.QPainter(image)
+    painter.setFont(QtGui.QFont("monospace", 10))
+    draw(painter)
+    painter.end()
+    return image
+
+
+def test_draws_text_at_baseline(qapp):
+    cache = LabelCache()
+    point = QtCore.QPointF(10, 25)
+
+    cached = render(lambda painter: cache.draw(painter, point, "T1"))
+    direct = render(lambda painter: painter.drawText(point, "T1"))
+
+    # Надпись из кэша занимает те же строки пикселей, что и drawText
+    def rows(image):
+        return [
+            y for y in range(image.height())
+            if any(
+                image.pixel(x, y) != QtGui.QColor(QtCore.Qt.white).rgb()
+                for x in range(image.width())
+            )
+        ]
+
+    assert rows(cached) and rows(cached) == rows(direct)
@@ -0,0 +1,135 @@
+# coding: utf-8
+
+""" Главное окно: загрузка модели в отдельном потоке, анимация камеры """
+
+import time
+
+import numpy as np
+import pytest
+from PyQt5 import QtTest
+
+from core.mesh import load_mesh
+
+TRIANGLE = "v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n"
+SQUARE = "v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n"
+
+
+@pytest.fixture
+def window(qapp):
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    yield window
+    window.close()
+    window.deleteLater()
+
+
+@pytest.fixture
+def models(tmp_path):
+    paths = []
+    for name, text in (("triangle.obj", TRIANGLE), ("square.obj", SQUARE)):
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        QtTest.QTest.qWait(5)
+    assert condition()
+
+
+def test_load_mesh(window, models):
+    window.load_mesh(models[0])
+    wait_for(lambda: window.scene.mesh is not None)
+
+    assert len(window.scene.mesh.faces) == 1
+    assert window.actionCloseMesh.isEnabled()
+
+
+def finish_loads(loaders) -> None:
+    """ Ждет окончания потоков и доставки их сигналов """
+    for loader in loaders:
+        loader.wait(5000)
+    QtTest.QTest.qWait(20)
+
+
+def test_newer_load_wins(window, models):
+    loaders = []
+    for path in (models[1], models[0]):
+        window.load_mesh(path)
+        loaders.append(window.mesh_loader)
+    finish_loads(loaders)
+
+    assert len(window.scene.mesh.faces) == 1
+
+
+def test_stale_results_ignored(window, models):
+    window.load_mesh(models[0])
+    stale = window.mesh_generation
+    wait_for(lambda: window.scene.mesh is not None)
+    current = window.scene.mesh
+
+    # Загрузка, начатая раньше последней, закончилась позже нее
+    window.mesh_generation += 1
+    window.on_mesh_loaded(load_mesh(models[1]), stale)
+    window.on_mesh_failed("error", stale)
+
+    assert window.scene.mesh is current
+    assert "error" not in window.statusbar.currentMessage()
+
+
+def test_close_during_load(window, models):
+    window.load_mesh(models[0])
+    window.on_close_mesh()
+    finish_loads([window.mesh_loader])
+
+    assert window.scene.mesh is None
+    assert not window.actionCloseMesh.isEnabled()
+
+
+def test_orbit_stops_flythrough(window):
+    camera = window.current_camera()
+    window.on_flythrough()
+    animation = window.camera_animation
+    assert animation.running
+    wait_for(lambda: window.current_camera() != camera)
+
+    # Облет строится от положения камеры до пролета, а не из его середины
+    window.on_orbit()
+    assert window.camera_animation is animation and animation.running
+    assert window.animation_camera == camera
+    np.testing.assert_allclose(animation.cameras[0], camera)
+
+
+def test_flythrough_stops_orbit(window):
+    camera = window.current_camera()
+    window.on_orbit()
+    wait_for(lambda: window.current_camera() != camera)
+
+    window.on_flythrough()
+    animation = window.camera_animation
+    assert window.animation_camera == camera
+    np.testing.assert_allclose(animation.cameras[0], camera)
+
+    window.actionStopAnimation.trigger()
+    assert not animation.running
+    assert not window.actionStopAnimation.isEnabled()
+    assert window.current_camera() == camera
+
+    # Стопка матриц пролета сброшена: кадр пролета снова вычисляется
+    view = window.scene.view_transform
+    misses = view.cache_info().misses
+    view.matrix(
+        animation.cameras[len(animation.cameras) // 2],
+        window.scene.is_central_projection(),
+        window.awidget.width(), window.awidget.height()
+    )
+    assert view.cache_info().misses == misses + 1
+
+
+def test_stop_without_animation(window):
+    window.stop_animation()
+    assert window.camera_animation is None
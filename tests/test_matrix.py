@@ -0,0 +1,103 @@
+# coding: utf-8
+
+""" Матрицы: операторы на месте, буферы out, обращение Transform4 """
+
+import numpy as np
+import pytest
+
+from core.matrix import Matrix, Transform4, TransformKind
+
+A = np.arange(16.0).reshape(4, 4) + 5 * np.eye(4)
+B = np.arange(16.0).reshape(4, 4)[::-1] - 3 * np.eye(4)
+
+
+def test_in_place_operators_keep_buffer():
+    matrix = Matrix(input_values=A)
+    values = matrix.values
+
+    matrix += Matrix(input_values=B)
+    matrix -= Matrix(input_values=B)
+    matrix *= Matrix(input_values=B)
+
+    assert matrix.values is values
+    np.testing.assert_allclose(matrix.values, A @ B)
+
+
+def test_zero_copy_construction():
+    values = np.eye(4, dtype=np.float32)
+
+    assert Matrix(input_values=values, copy=False).values is values
+    assert Matrix(input_values=values).values is not values
+    assert Matrix(input_values=values, copy=False, dtype=np.float64).dtype \
+        == np.float64
+
+
+@pytest.mark.parametrize("left, right", [
+    (np.float32, np.float64),
+    (np.float64, np.float32),
+])
+def test_mixed_dtype_in_place(left, right):
+    matrix = Matrix(input_values=A, dtype=left)
+    other = Matrix(input_values=B, dtype=right)
+
+    matrix *= other
+    assert matrix.dtype == left
+    np.testing.assert_allclose(matrix.values, A @ B, rtol=1e-6)
+
+    out = Matrix(input_values=np.zeros((4, 4)), dtype=left)
+    assert Matrix(input_values=A, dtype=right).multiply(other, out=out) \
+        is out
+    np.testing.assert_allclose(out.values, A @ B, rtol=1e-6)
+
+    # += и -= принимают те же сомножители
+    matrix += other
+    matrix -= other
+    np.testing.assert_allclose(matrix.values, A @ B, rtol=1e-6)
+
+
+def rigid() -> np.ndarray:
+    c, s = np.cos(0.7), np.sin(0.7)
+    values = np.eye(4)
+    values[:2, :2] = ((c, s), (-s, c))
+    values[3, :3] = (3, -4, 5)
+    return values
+
+
+def affine() -> np.ndarray:
+    values = rigid()
+    values[:3, :3] = values[:3, :3] @ ((2, 0.5, 0), (0, 3, 0), (0, 0, 0.25))
+    return values
+
+
+def projective() -> np.ndarray:
+    values = affine()
+    values[:, 3] = (0.01, -0.02, -0.005, 1)
+    return values
+
+
+@pytest.mark.parametrize("values, kind", [
+    (rigid(), TransformKind.RIGID),
+    (affine(), TransformKind.AFFINE),
+    (projective(), TransformKind.PROJECTIVE),
+])
+def test_inverse_matches_linalg(values, kind):
+    transform = Transform4(values)
+    assert transform.kind == kind
+
+    inverse = transform.inverted()
+    assert inverse.kind == kind
+    np.testing.assert_allclose(
+        inverse.values, np.linalg.inv(values), rtol=1e-12, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        (transform * inverse).values, np.eye(4), atol=1e-12
+    )
+
+
+def test_inverse_into_out():
+    transform = Transform4(affine())
+    out = Transform4()
+
+    assert transform.inverted(out=out) is out
+    assert out.kind == TransformKind.AFFINE
+    np.testing.assert_allclose(out.values, np.linalg.inv(affine()), atol=1e-12)
@@ -0,0 +1,77 @@
+# coding: utf-8
+
+""" Стопки матриц для многих положений камеры (MatrixStack) """
+
+import numpy as np
+import pytest
+
+from core.matrix import MatrixStack, transform_points
+from core.mx_utils import get_matrix_d, get_matrix_rz, get_matrix_t
+from core.points import PointArray
+from core.view_transform import ViewTransform
+
+CAMERAS = np.array([
+    [100, 100, 100], [-30, 70, -20], [0, 0, 50], [5, -80, 10]
+], dtype=float)
+
+
+@pytest.mark.parametrize("central", [False, True])
+def test_stack_matches_matrix(central):
+    view = ViewTransform()
+    stack = view.stack(CAMERAS, central, 402, 251)
+
+    assert len(stack) == len(CAMERAS)
+    for camera, values in zip(CAMERAS, stack.values):
+        np.testing.assert_allclose(
+            values, view.matrix(tuple(camera), central, 402, 251).values,
+            rtol=1e-12, atol=1e-12
+        )
+
+
+def test_builders_broadcast_parameters():
+    angles = np.linspace(0, np.pi, 5)
+
+    stack = get_matrix_rz(np.cos(angles), np.sin(angles))
+    assert isinstance(stack, MatrixStack) and len(stack) == 5
+    for angle, values in zip(angles, stack.values):
+        np.testing.assert_array_equal(
+            values, get_matrix_rz(np.cos(angle), np.sin(angle)).values
+        )
+
+    # Скаляры повторяются для всех матриц стопки
+    stack = get_matrix_t(np.arange(3.0), 7, 8)
+    np.testing.assert_array_equal(stack.values[:, 3, :3], [
+        [0, 7, 8], [1, 7, 8], [2, 7, 8]
+    ])
+    assert len(get_matrix_d(2, np.ones(4), 3)) == 4
+
+    with pytest.raises(ValueError):
+        get_matrix_t(np.zeros((2, 2)), 0, 0)
+
+
+def test_multiply_and_invert():
+    stack = ViewTransform().stack(CAMERAS, False, 402, 251, depth=True)
+    shift = get_matrix_t(1, 2, 3)
+
+    np.testing.assert_allclose(
+        (stack * shift).values, stack.values @ shift.values
+    )
+    np.testing.assert_allclose(
+        np.matmul(stack.values, stack.inverted().values),
+        np.broadcast_to(np.eye(4), stack.values.shape), atol=1e-12
+    )
+
+
+def test_transform_points_matches_point_array():
+    xyz = np.random.default_rng(0).uniform(-100, 100, (20, 3))
+    view = ViewTransform()
+    stack = view.stack(CAMERAS, True, 402, 251)
+
+    result = transform_points(stack, xyz)
+    assert result.shape == (len(CAMERAS), len(xyz), 2)
+    for camera, xy in zip(CAMERAS, result):
+        matrix = view.matrix(tuple(camera), True, 402, 251)
+        np.testing.assert_allclose(
+            xy, PointArray.from_array(xyz).transform(matrix).xy(),
+            rtol=1e-9
+        )
@@ -0,0 +1,134 @@
+# coding: utf-8
+
+""" Загрузка моделей из OBJ и PLY """
+
+import struct
+
+import pytest
+
+from core.mesh import load_mesh
+
+# Квадрат из двух треугольников и отдельный отрезок
+SQUARE = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 2)]
+TRIANGLES = [(0, 1, 2), (0, 2, 3)]
+SEGMENT = (0, 4)
+
+PLY_HEADER = """ply
+format {fmt} 1.0
+element vertex 5
+property float x
+property float y
+property float z
+element face 2
+property list uchar int vertex_indices
+element edge 1
+property int vertex1
+property int vertex2
+end_header
+"""
+
+
+def edge_set(mesh):
+    """ Ребра как пары координат (порядок вершин в модели не важен) """
+    vertices = [tuple(v) for v in mesh.vertices.tolist()]
+    return {frozenset((vertices[a], vertices[b])) for a, b in mesh.edges}
+
+
+def face_set(mesh):
+    vertices = [tuple(v) for v in mesh.vertices.tolist()]
+    return {frozenset(vertices[i] for i in face) for face in mesh.faces}
+
+
+def expected_edges():
+    pairs = [(0, 1), (1, 2), (2, 0), (2, 3), (3, 0), SEGMENT]
+    return {frozenset((SQUARE[a], SQUARE[b])) for a, b in pairs}
+
+
+def expected_faces():
+    return {frozenset(SQUARE[i] for i in face) for face in TRIANGLES}
+
+
+def check_square(mesh):
+    assert mesh.vertices.shape == (5, 3)
+    assert edge_set(mesh) == expected_edges()
+    assert face_set(mesh) == expected_faces()
+
+
+def test_obj(tmp_path):
+    path = tmp_path / "square.obj"
+    path.write_text(
+        "# квадрат\n"
+        + "".join(f"v {x} {y} {z}\n" for x, y, z in SQUARE)
+        + "f 1/1/1 2/2/1 3/3/1\n"
+        + "f -5 -3 -2\n"
+        + "l 1 5\n",
+        encoding="utf-8"
+    )
+
+    check_square(load_mesh(str(path)))
+
+
+def test_ply_ascii(tmp_path):
+    path = tmp_path / "square.ply"
+    path.write_text(
+        PLY_HEADER.format(fmt="ascii")
+        + "".join(f"{x} {y} {z}\n" for x, y, z in SQUARE)
+        + "".join(f"3 {a} {b} {c}\n" for a, b, c in TRIANGLES)
+        + "%d %d\n" % SEGMENT,
+        encoding="ascii"
+    )
+
+    check_square(load_mesh(str(path)))
+
+
+@pytest.mark.parametrize("fmt, order", [
+    ("binary_little_endian", "<"),
+    ("binary_big_endian", ">"),
+])
+def test_ply_binary(tmp_path, fmt, order):
+    path = tmp_path / "square.ply"
+    path.write_bytes(
+        PLY_HEADER.format(fmt=fmt).encode("ascii")
+        + b"".join(struct.pack(order + "3f", *v) for v in SQUARE)
+        + b"".join(struct.pack(order + "B3i", 3, *f) for f in TRIANGLES)
+        + struct.pack(order + "2i", *SEGMENT)
+    )
+
+    check_square(load_mesh(str(path)))
+
+
+def test_ply_mixed_polygons(tmp_path):
+    # Четырехугольник и треугольник: списки разной длины
+    path = tmp_path / "mixed.ply"
+    header = PLY_HEADER.replace(
+        "element edge 1\nproperty int vertex1\nproperty int vertex2\n", ""
+    )
+    path.write_bytes(
+        header.format(fmt="binary_little_endian").encode("ascii")
+        + b"".join(struct.pack("<3f", *v) for v in SQUARE)
+        + struct.pack("<B4i", 4, 0, 1, 2, 3)
+        + struct.pack("<B3i", 3, 0, 1, 4)
+    )
+
+    mesh = load_mesh(str(path))
+    # Стороны многоугольников без диагоналей, общая сторона 0-1 - одна
+    assert len(mesh.faces) == 3
+    assert len(mesh.edges) == 6
+
+
+@pytest.mark.parametrize("header, body", [
+    (PLY_HEADER.replace("float z", "quad z"), ""),
+    (PLY_HEADER.replace("property float z\n", ""), "0 0\n" * 5),
+    (PLY_HEADER, "0 0 0\n"),
+])
+def test_ply_malformed(tmp_path, header, body):
+    path = tmp_path / "bad.ply"
+    path.write_text(header.format(fmt="ascii") + body, encoding="ascii")
+
+    with pytest.raises(ValueError):
+        load_mesh(str(path))
+
+
+def test_unsupported_extension(tmp_path):
+    with pytest.raises(ValueError):
+        load_mesh(str(tmp_path / "model.stl"))
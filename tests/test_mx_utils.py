@@ -0,0 +1,56 @@
+# coding: utf-8
+
+""" Постоянные матрицы и построители с буфером out (core.mx_utils) """
+
+import numpy as np
+import pytest
+
+from core import mx_utils
+from core.matrix import Matrix
+
+
+@pytest.mark.parametrize("getter, constant", [
+    (mx_utils.get_eye, mx_utils.EYE),
+    (mx_utils.get_matrix_mx, mx_utils.MATRIX_MX),
+    (mx_utils.get_matrix_my, mx_utils.MATRIX_MY),
+    (mx_utils.get_matrix_mz, mx_utils.MATRIX_MZ),
+    (mx_utils.get_matrix_pz, mx_utils.MATRIX_PZ),
+])
+def test_constants_shared_and_read_only(getter, constant):
+    assert getter() is constant
+
+    with pytest.raises(ValueError):
+        constant.values[0, 0] = 5
+    with pytest.raises(ValueError):
+        constant.values = np.zeros((4, 4))
+    with pytest.raises(ValueError):
+        constant += mx_utils.EYE
+
+
+def test_rotation_values():
+    c, s = np.cos(0.3), np.sin(0.3)
+
+    np.testing.assert_array_equal(mx_utils.get_matrix_rz(c, s).values, [
+        [c, s, 0, 0], [-s, c, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]
+    ])
+    np.testing.assert_array_equal(mx_utils.get_matrix_rx(c, s).values, [
+        [1, 0, 0, 0], [0, c, s, 0], [0, -s, c, 0], [0, 0, 0, 1]
+    ])
+
+
+@pytest.mark.parametrize("build, args", [
+    (mx_utils.get_matrix_rx, (0.6, 0.8)),
+    (mx_utils.get_matrix_ry, (0.6, 0.8)),
+    (mx_utils.get_matrix_rz, (0.6, 0.8)),
+    (mx_utils.get_matrix_d, (2, 3, 4)),
+    (mx_utils.get_matrix_t, (5, -6, 7)),
+    (mx_utils.get_matrix_p, (250,)),
+])
+def test_out_buffer_reused(build, args):
+    # Буфер с чужим содержимым: построитель записывает всю матрицу
+    out = Matrix(input_values=np.full((4, 4), 9.0))
+    values = out.values
+
+    assert build(*args, out=out) is out
+    assert out.values is values
+    np.testing.assert_array_equal(out.values, build(*args).values)
@@ -0,0 +1,62 @@
+# coding: utf-8
+
+""" Отрисовка чертежей без окна (gui.offscreen) """
+
+import pytest
+
+from gui.offscreen import PLANE_CX, OffscreenRenderer, RenderConfig
+from gui.scene import SelectProjection
+
+T = (50, 50, 50)
+C = (100, 100, 100)
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture
+def renderer(qapp):
+    return OffscreenRenderer()
+
+
+def colors(image):
+    return {
+        image.pixel(x, y)
+        for x in range(0, image.width(), 7)
+        for y in range(0, image.height(), 7)
+    }
+
+
+def test_render_ax(renderer):
+    image = renderer.render(T, C, size=(300, 200))
+
+    assert (image.width(), image.height()) == (300, 200)
+    assert len(colors(image)) > 1
+
+
+def test_render_png(renderer):
+    ortho = renderer.render_png(T, C)
+    central = renderer.render_png(T, C, SelectProjection.CEN)
+
+    assert ortho.startswith(PNG_SIGNATURE)
+    assert central.startswith(PNG_SIGNATURE)
+    assert ortho != central
+
+
+def test_render_is_a_copy(renderer):
+    first = renderer.render(T, C)
+    png = renderer.to_png(first)
+    renderer.render((10, 80, 20), C)
+
+    assert renderer.to_png(first) == png
+
+
+def test_render_cx_and_many(renderer):
+    image = renderer.render(T, C, plane=PLANE_CX)
+    assert len(colors(image)) > 1
+
+    pngs = renderer.render_many([RenderConfig(T, C), RenderConfig(C, T)])
+    assert len(pngs) == 2 and pngs[0] != pngs[1]
+
+
+def test_unknown_plane(renderer):
+    with pytest.raises(ValueError):
+        renderer.render(T, C, plane="xyz")
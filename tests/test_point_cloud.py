@@ -0,0 +1,64 @@
+# coding: utf-8
+
+"""
+Облако точек: проецирование порциями из файла (np.memmap) совпадает
+с проецированием массива в памяти
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+from core.point_cloud import PointCloud, bin_points
+from core.points import PointArray
+from gui.scene import Scene, SelectProjection
+
+COUNT = 5000
+SIZE = (402, 251)
+
+
+@pytest.fixture
+def xyz() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.uniform(-50, 50, (COUNT, 3)).astype(np.float32)
+
+
+def cloud_counts(cloud: PointCloud, precision) -> Tuple[np.ndarray, Scene]:
+    """ Количество точек в пикселях, посчитанное сценой (тип precision) """
+    scene = Scene()
+    scene.set_size(*SIZE)
+    scene.selected_projection = SelectProjection.CEN
+    scene.precision = np.dtype(precision)
+    scene.set_cloud(cloud)
+    scene.sync()
+    return scene.graph.get("cloud_counts").copy(), scene
+
+
+@pytest.mark.parametrize("precision", [np.float64, np.float32])
+def test_memmap_chunks_match_memory(tmp_path, xyz, precision):
+    path = tmp_path / "cloud.npy"
+    np.save(path, xyz)
+
+    cloud = PointCloud.open(str(path), chunk=700)
+    assert isinstance(cloud.points, np.memmap)
+    assert len(list(cloud.chunks())) == -(-COUNT // 700)
+
+    mapped, _ = cloud_counts(cloud, precision)
+    memory, _ = cloud_counts(PointCloud(np.array(xyz), chunk=COUNT), precision)
+
+    np.testing.assert_array_equal(mapped, memory)
+    assert mapped.sum() > COUNT // 2
+
+
+def test_counts_match_point_array(xyz):
+    counts, scene = cloud_counts(PointCloud(xyz, chunk=700), np.float64)
+
+    # Те же точки через PointArray.transform, все точки перед камерой
+    product = scene.graph.get("cloud_fit") * scene.graph.get("view_matrix")
+    points = PointArray.from_array(xyz.astype(np.float64)).transform(product)
+    assert np.all(points.values[:, 3] > 0)
+
+    expected = np.zeros(counts.shape, dtype=np.uint32)
+    bin_points(points.values[:, 0], points.values[:, 1], expected)
+    np.testing.assert_array_equal(counts, expected)
@@ -0,0 +1,87 @@
+# coding: utf-8
+
+""" PointArray: векторное преобразование против поточечного Point3D """
+
+import numpy as np
+
+from core.matrix import Matrix
+from core.points import Point3D, PointArray
+from core.view_transform import ViewTransform
+
+
+def pointwise(points, matrix):
+    """ Экранные x, y через Point3D.__mul__ (по одной точке) """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.array([
+            [(point * matrix).x, (point * matrix).y]
+            for point in points.values()
+        ], dtype=np.float64)
+
+
+def named_points(xyz):
+    return {f"P{i}": Point3D(*map(float, p)) for i, p in enumerate(xyz)}
+
+
+def test_transform_matches_point3d():
+    xyz = np.random.default_rng(0).uniform(-100, 100, (50, 3))
+    points = named_points(xyz)
+    matrix = ViewTransform().matrix((100, 100, 100), True, 402, 251)
+
+    result = PointArray.from_points(points).transform(matrix)
+
+    assert result.names() == list(points)
+    np.testing.assert_allclose(
+        result.xy(), pointwise(points, matrix), rtol=1e-12
+    )
+    assert result["P7"].x == result.xy()[7, 0]
+
+
+def test_transform_near_zero_w():
+    # w = x: точки на плоскости x = 0 уходят в бесконечность
+    values = np.eye(4)
+    values[:, 3] = (1, 0, 0, 0)
+    matrix = Matrix(input_values=values)
+    xyz = np.array([
+        [1e-12, 2, 3], [-1e-300, 2, 3], [0, 2, 3], [0, 0, 0], [5, 1, 1]
+    ])
+    points = named_points(xyz)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = PointArray.from_points(points).transform(matrix).xy()
+    expected = pointwise(points, matrix)
+
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+    assert np.isinf(result[2, 1]) and np.isnan(result[3]).all()
+
+
+def test_transform_without_divide_keeps_w():
+    points = named_points([[1, 2, 3], [4, 5, 6]])
+    matrix = ViewTransform().matrix((100, 100, 100), True, 402, 251)
+
+    array = PointArray.from_points(points)
+    homogeneous = array.transform(matrix, divide=False)
+
+    np.testing.assert_allclose(
+        homogeneous.values, array.values @ matrix.values
+    )
+    np.testing.assert_allclose(
+        homogeneous.divided().xy(), array.transform(matrix).xy()
+    )
+
+
+def test_point3d_at_infinity():
+    values = np.eye(4)
+    values[:, 3] = (1, 0, 0, 0)
+    matrix = Matrix(input_values=values)
+
+    point = Point3D(0, 2, 0) * matrix
+    assert np.isnan(point.x) and np.isinf(point.y) and point.z == 1
+
+
+def test_from_points_dtype():
+    points = named_points([[1, 2, 3]])
+
+    assert PointArray.from_points(points).dtype == np.float64
+    array = PointArray.from_points(points, dtype=np.float32)
+    assert array.dtype == np.float32
+    assert array["P0"] == Point3D(1, 2, 3)
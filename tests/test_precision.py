@@ -0,0 +1,90 @@
+# coding: utf-8
+
+"""
+Одинарная точность (float32): оценка погрешности экранных координат
+(core.points.float32_error_bound) и сохранение типа матриц
+"""
+
+import numpy as np
+import pytest
+
+from core.camera_path import orbit
+from core.clipping import inside_rect
+from core.matrix import Matrix, Transform4, transform_points
+from core.mx_utils import MATRIX_MX
+from core.points import PointArray, float32_error_bound
+from core.view_transform import ViewTransform
+
+COUNT = 5000
+SIZE = (402, 251)
+
+
+@pytest.fixture
+def xyz() -> np.ndarray:
+    return np.random.default_rng(0).uniform(-100, 100, (COUNT, 3))
+
+
+@pytest.mark.parametrize("central", [False, True])
+def test_point_array_float32_within_bound(xyz, central):
+    matrix = ViewTransform().matrix((100, 100, 100), central, *SIZE)
+
+    exact = PointArray.from_array(xyz).transform(matrix)
+    single = PointArray.from_array(xyz, dtype=np.float32).transform(matrix)
+    error = np.abs(single.xy().astype(np.float64) - exact.xy())
+
+    bound = float32_error_bound(
+        PointArray.from_array(xyz).values, matrix.values, exact.values
+    )
+    assert np.all(error <= bound)
+
+    visible = inside_rect(exact.xy(), (0, 0) + SIZE)
+    assert visible.any() and error[visible].max() > 0
+
+
+def test_transform_points_float32_within_bound(xyz):
+    stack = ViewTransform().stack(orbit((100, 100, 100), 8), True, *SIZE)
+
+    exact = transform_points(stack, xyz)
+    single = transform_points(stack, xyz.astype(np.float32))
+    assert single.dtype == np.float32
+
+    points = PointArray.from_array(xyz).values
+    for values, exact_xy, single_xy in zip(stack.values, exact, single):
+        error = np.abs(single_xy.astype(np.float64) - exact_xy)
+        assert np.all(
+            error <= float32_error_bound(points, values, exact_xy)
+        )
+
+
+def test_matrix_keeps_float32():
+    values = np.arange(16.0).reshape(4, 4) + 5 * np.eye(4)
+    matrix = Matrix(input_values=values, dtype=np.float32)
+
+    assert matrix.transposed().dtype == np.float32
+    assert matrix.inverted().dtype == np.float32
+    assert Matrix(input_values=[[1, 2], [3, 4]], copy=False).dtype \
+        == np.float64
+
+
+def test_transform4_keeps_float32():
+    values = np.eye(4)
+    values[3, :3] = (1, 2, 3)
+
+    transform = Transform4(values, dtype=np.float32)
+    assert transform.dtype == np.float32
+    assert transform.inverted().dtype == np.float32
+    assert (transform * transform).dtype == np.float32
+    assert Transform4(dtype=np.float32).dtype == np.float32
+
+
+def test_transform4_float32_in_place():
+    transform = Transform4(np.eye(4), dtype=np.float32)
+    buffer = transform.values
+
+    # Произведение с матрицей float64 записывается в float32 на месте
+    transform *= Transform4(MATRIX_MX.values)
+    assert transform.values is buffer
+    assert transform.dtype == np.float32
+    np.testing.assert_allclose(
+        transform.values, MATRIX_MX.values, rtol=1e-6
+    )
@@ -0,0 +1,56 @@
+# coding: utf-8
+
+""" Массивы отрезков и точек для рисования одним вызовом QPainter """
+
+import numpy as np
+from PyQt5 import QtCore, QtGui
+
+from gui.base.qt_arrays import array_view, to_line_array, to_point_array
+
+LINES = np.array([[0, 0, 10, 10], [5.5, 1, 2, 8.25]])
+POINTS = np.array([[1, 2], [3.5, 4], [5, 6]])
+
+
+def test_line_array_contents(qapp):
+    buffer = to_line_array(LINES)
+
+    assert len(buffer) == 2
+    assert buffer[1] == QtCore.QLineF(5.5, 1, 2, 8.25)
+    np.testing.assert_array_equal(array_view(buffer, 4), LINES)
+
+
+def test_point_array_contents(qapp):
+    buffer = to_point_array(POINTS)
+
+    assert [buffer[i] for i in range(3)] == [
+        QtCore.QPointF(1, 2), QtCore.QPointF(3.5, 4), QtCore.QPointF(5, 6)
+    ]
+
+
+def test_buffer_reused_for_same_length(qapp):
+    buffer = to_point_array(POINTS)
+
+    assert to_point_array(POINTS[::-1], buffer) is buffer
+    assert buffer[0] == QtCore.QPointF(5, 6)
+
+    assert to_point_array(POINTS[:2], buffer) is not buffer
+    assert len(to_line_array(np.empty((0, 4)))) == 0
+
+
+def test_draw_lines_in_one_call(qapp):
+    """ drawLines(sip.array) рисует то же, что отрезки по одному """
+    lines = np.random.default_rng(0).uniform(0, 64, (50, 4))
+
+    def render(draw) -> QtGui.QImage:
+        image = QtGui.QImage(64, 64, QtGui.QImage.Format_ARGB32)
+        image.fill(QtCore.Qt.white)
+        painter = QtGui.QPainter(image)
+        draw(painter)
+        painter.end()
+        return image
+
+    bulk = render(lambda painter: painter.drawLines(to_line_array(lines)))
+    single = render(lambda painter: [
+        painter.drawLine(QtCore.QLineF(*line)) for line in lines.tolist()
+    ])
+    assert bulk == single
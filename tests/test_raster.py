@@ -0,0 +1,113 @@
+# coding: utf-8
+
+""" Z-буфер и удаление невидимых линий (core.raster) """
+
+import numpy as np
+import pytest
+
+from core.raster import LINE_COLOR, Rasterizer, render_hidden_lines
+
+WIDTH, HEIGHT = 64, 48
+
+
+def naive_depth(triangles, width, height):
+    """ Z-буфер перебором пикселей (центры пикселей, как в Rasterizer) """
+    depth = np.full((height, width), -np.inf)
+    for (x0, y0, z0), (x1, y1, z1), (x2, y2, z2) in triangles.tolist():
+        area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        if area == 0:
+            continue
+        for j in range(height):
+            for i in range(width):
+                px, py = i + 0.5, j + 0.5
+                b0 = ((x1 - px) * (y2 - py) - (x2 - px) * (y1 - py)) / area
+                b1 = ((x2 - px) * (y0 - py) - (x0 - px) * (y2 - py)) / area
+                b2 = 1 - b0 - b1
+                if min(b0, b1, b2) >= -1e-12:
+                    z = b0 * z0 + b1 * z1 + b2 * z2
+                    depth[j, i] = max(depth[j, i], z)
+    return depth
+
+
+@pytest.mark.parametrize("chunk", [1 << 21, 50])
+def test_depth_matches_naive(chunk):
+    rng = np.random.default_rng(0)
+    # Мелкие (трафареты) и крупные (поштучный перебор) треугольники
+    small = rng.uniform(0, 8, (20, 3, 3)) + rng.uniform(0, 40, (20, 1, 3))
+    large = rng.uniform(-10, 70, (4, 3, 3))
+    triangles = np.concatenate([small, large])
+
+    rasterizer = Rasterizer(WIDTH, HEIGHT, chunk=chunk)
+    rasterizer.draw_triangles(triangles)
+
+    np.testing.assert_allclose(
+        rasterizer.depth_image(), naive_depth(triangles, WIDTH, HEIGHT),
+        atol=1e-9
+    )
+
+
+def square_scene():
+    """ Квадрат 10..50 на глубине 1, ребра за ним (0) и перед ним (2) """
+    points = np.array([
+        [10, 10, 1, 1], [50, 10, 1, 1], [50, 50, 1, 1], [10, 50, 1, 1],
+        [0, 30, 0, 1], [60, 30, 0, 1],
+        [0, 20, 2, 1], [60, 20, 2, 1],
+    ], dtype=float)
+    faces = np.array([[0, 1, 2], [0, 2, 3]])
+    edges = np.array([[4, 5], [6, 7]])
+    return points, edges, faces
+
+
+def test_hidden_edge_removed():
+    points, edges, faces = square_scene()
+    image = render_hidden_lines(points, edges, faces, WIDTH, HEIGHT)
+
+    assert image.shape == (HEIGHT, WIDTH, 4)
+    behind = image[30, :, 3] > 0
+    in_front = image[20, :, 3] > 0
+
+    # Ребро за квадратом видно только по сторонам от него
+    assert behind[:10].all() and behind[51:60].all()
+    assert not behind[11:50].any()
+    assert in_front[:60].all()
+    assert tuple(image[20, 30]) == LINE_COLOR
+
+
+def test_without_faces_all_edges_visible():
+    points, edges, _ = square_scene()
+    image = render_hidden_lines(
+        points, edges, np.empty((0, 3), dtype=np.int64), WIDTH, HEIGHT
+    )
+
+    assert (image[30, :60, 3] > 0).all()
+
+
+def test_rasterizer_reused():
+    points, edges, faces = square_scene()
+    rasterizer = Rasterizer(0, 0)
+    first = render_hidden_lines(
+        points, edges, faces, WIDTH, HEIGHT, rasterizer
+    )
+    depth = rasterizer.depth
+
+    second = render_hidden_lines(
+        points, edges, faces, WIDTH, HEIGHT, rasterizer
+    )
+    assert rasterizer.depth is depth
+    np.testing.assert_array_equal(first, second)
+
+
+def test_render_into_out():
+    points, edges, faces = square_scene()
+    expected = render_hidden_lines(points, edges, faces, WIDTH, HEIGHT)
+
+    # Прежнее содержимое out стирается
+    out = np.full((HEIGHT, WIDTH, 4), 7, dtype=np.uint8)
+    image = render_hidden_lines(points, edges, faces, WIDTH, HEIGHT, out=out)
+    assert image is out
+    np.testing.assert_array_equal(out, expected)
+
+    with pytest.raises(ValueError):
+        render_hidden_lines(
+            points, edges, faces, WIDTH, HEIGHT, out=out[:, ::2]
+        )
@@ -0,0 +1,84 @@
+# coding: utf-8
+
+""" Объединение запросов перерисовки (gui.redraw_scheduler) """
+
+import time
+
+import pytest
+from PyQt5 import QtTest
+
+from gui.redraw_scheduler import RedrawScheduler
+from gui.settings import MAX_FPS
+
+# Допуск таймера: срок округляется вниз до миллисекунды
+TIMER_SLACK = 0.002
+
+
+@pytest.fixture
+def frames(qapp):
+    """ Моменты вызова callback """
+    return []
+
+
+@pytest.fixture
+def scheduler(frames):
+    return RedrawScheduler(lambda: frames.append(time.perf_counter()), MAX_FPS)
+
+
+def wait_idle(scheduler, timeout: float = 1.0):
+    """ Обрабатывает события, пока запланированный кадр не выполнится """
+    deadline = time.perf_counter() + timeout
+    while scheduler.pending and time.perf_counter() < deadline:
+        QtTest.QTest.qWait(1)
+    assert not scheduler.pending
+
+
+def test_requests_in_one_interval_give_one_frame(scheduler, frames):
+    for _ in range(5):
+        scheduler.request()
+    wait_idle(scheduler)
+
+    assert len(frames) == 1
+    assert scheduler.stats() == {
+        "requests": 5, "coalesced": 4, "frames": 1, "dropped": 0
+    }
+
+
+def test_max_fps_interval(scheduler, frames):
+    scheduler.request()
+    wait_idle(scheduler)
+
+    # Следующий кадр - не раньше чем через 1 / MAX_FPS после первого
+    for _ in range(3):
+        scheduler.request()
+        wait_idle(scheduler)
+
+    gaps = [b - a for a, b in zip(frames, frames[1:])]
+    assert len(frames) == 4
+    assert min(gaps) >= 1 / MAX_FPS - TIMER_SLACK
+
+
+def test_late_frame_counted_as_dropped(scheduler, frames):
+    scheduler.request()
+    scheduler.request()
+
+    # Цикл событий занят: кадр начнется на несколько интервалов позже
+    time.sleep(4 / MAX_FPS)
+    wait_idle(scheduler)
+
+    assert len(frames) == 1
+    assert scheduler.coalesced == 1
+    assert scheduler.dropped >= 2
+
+
+def test_cancel(scheduler, frames):
+    scheduler.request()
+    scheduler.cancel()
+    QtTest.QTest.qWait(int(2000 / MAX_FPS))
+
+    assert not frames and not scheduler.pending
+
+
+def test_max_fps_positive(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.max_fps = 0
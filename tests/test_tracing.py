@@ -0,0 +1,94 @@
+# coding: utf-8
+
+""" Трассировка этапов кадра (core.tracing) """
+
+import json
+import time
+
+import pytest
+
+from core.dependency_graph import DependencyGraph
+from core.tracing import TRACER, Tracer
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer(frames=3, events=100)
+    tracer.enabled = True
+    return tracer
+
+
+def test_disabled_records_nothing():
+    tracer = Tracer()
+
+    first = tracer.span("stage")
+    with first:
+        pass
+    assert tracer.span("other") is first
+    tracer.mark_frame()
+
+    assert not tracer.events and not tracer.frames
+
+
+def test_stage_times_per_frame(tracer):
+    for _ in range(2):
+        with tracer.span("update"):
+            time.sleep(0.002)
+        with tracer.span("update"):
+            pass
+        with tracer.span("blit"):
+            pass
+        tracer.mark_frame()
+
+    # Кадр без интервалов не учитывается
+    tracer.mark_frame()
+
+    assert len(tracer.frames) == 2
+    stages = tracer.stage_times()
+    assert set(stages) == {"update", "blit"}
+    assert stages["update"] >= 0.002 > stages["blit"]
+    assert tracer.fps() > 0
+
+
+def test_frame_buffer_is_bounded(tracer):
+    for _ in range(5):
+        with tracer.span("stage"):
+            pass
+        tracer.mark_frame()
+
+    assert len(tracer.frames) == 3
+
+
+def test_chrome_export(tracer, tmp_path):
+    with tracer.span("recalculate", "graph", {"node": "ax_points"}):
+        pass
+    tracer.mark_frame()
+
+    path = tmp_path / "trace.json"
+    tracer.export_chrome(str(path))
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+
+    span, frame = events
+    assert span["name"] == "recalculate" and span["ph"] == "X"
+    assert span["cat"] == "graph" and span["args"] == {"node": "ax_points"}
+    assert span["dur"] >= 0 and span["ts"] >= 0
+    assert frame["ph"] == "i" and frame["ts"] >= span["ts"]
+
+
+def test_graph_recompute_traced():
+    graph = DependencyGraph()
+    graph.add_input("a", 1)
+    graph.add_node("b", lambda a: a + 1, ("a",), span="stage_b")
+
+    TRACER.enabled = True
+    TRACER.clear()
+    try:
+        graph.get("b")
+        graph.get("b")
+        names = [event.name for event in TRACER.events]
+    finally:
+        TRACER.enabled = False
+        TRACER.clear()
+
+    # Пересчитан один раз, повторный get берет готовое значение
+    assert names == ["stage_b"]
@@ -0,0 +1,96 @@
+# coding: utf-8
+
+""" Матрица вида в замкнутом виде и ее кэш (core.view_transform) """
+
+import numpy as np
+import pytest
+
+from core.mx_utils import (
+    get_matrix_mx, get_matrix_p, get_matrix_pz, get_matrix_rx,
+    get_matrix_rz, get_matrix_t
+)
+from core.view_transform import ViewTransform
+
+CAMERAS = [(100, 100, 100), (-30, 70, -20), (0, 0, 50), (0, 0, -50)]
+
+
+def product(camera, central, width, height, depth=False):
+    """ Rz * Rx * Mx [* P] [* Pz] * T, перемножением матриц """
+    c1, s1, c2, s2, dist = ViewTransform.angles(*camera)
+
+    result = get_matrix_rz(c1, s1) * get_matrix_rx(c2, s2) * get_matrix_mx()
+    if central:
+        result = result * get_matrix_p(dist)
+    if not depth:
+        result = result * get_matrix_pz()
+    return result * get_matrix_t(width // 2, height // 2, 0)
+
+
+@pytest.mark.parametrize("camera", CAMERAS)
+@pytest.mark.parametrize("central", [False, True])
+@pytest.mark.parametrize("depth", [False, True])
+def test_build_matches_product(camera, central, depth):
+    matrix = ViewTransform().matrix(camera, central, 402, 251, depth)
+
+    np.testing.assert_allclose(
+        matrix.values,
+        product(camera, central, 402, 251, depth).values,
+        rtol=1e-12, atol=1e-12
+    )
+    assert not matrix.values.flags.writeable
+
+
+def test_camera_at_origin():
+    with pytest.raises(ValueError):
+        ViewTransform().matrix((0, 0, 0), True, 402, 251)
+
+
+def test_cache_hits_and_misses():
+    view = ViewTransform()
+
+    first = view.matrix((100, 100, 100), True, 402, 251)
+    assert view.matrix((100, 100, 100), True, 402, 251) is first
+    assert view.cache_info().hits == 1
+
+    # Любой другой параметр - другая матрица
+    for args in [
+        ((100, 100, 101), True, 402, 251),
+        ((100, 100, 100), False, 402, 251),
+        ((100, 100, 100), True, 400, 251),
+    ]:
+        assert view.matrix(*args) is not first
+    assert view.cache_info().misses == 4
+
+    view.cache_clear()
+    again = view.matrix((100, 100, 100), True, 402, 251)
+    assert again is not first
+    np.testing.assert_array_equal(again.values, first.values)
+
+
+def test_cache_bounded():
+    view = ViewTransform(maxsize=2)
+
+    first = view.matrix((1, 2, 3), True, 402, 251)
+    view.matrix((4, 5, 6), True, 402, 251)
+    view.matrix((7, 8, 9), True, 402, 251)
+
+    assert view.cache_info().currsize == 2
+    assert view.matrix((1, 2, 3), True, 402, 251) is not first
+
+
+
+
+def test_preloaded_until_cleared():
+    view = ViewTransform()
+    cameras = np.array([[100, 100, 100], [50, -20, 10]], dtype=float)
+
+    stack = view.preload(cameras, True, 402, 251)
+    np.testing.assert_array_equal(
+        view.matrix((50.0, -20.0, 10.0), True, 402, 251).values,
+        stack.values[1]
+    )
+    assert view.cache_info().misses == 0
+
+    view.clear_preloaded()
+    view.matrix((50.0, -20.0, 10.0), True, 402, 251)
+    assert view.cache_info().misses == 1